@@ -0,0 +1,365 @@
+import argparse
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_loader import BASE_PATH, DATA_FILE, dataset_version, load_orders
+from filter_engine import OrderFilter
+from order_store import PartitionedOrders, open_store
+from seller_profile import build_seller_profile, region_share_of
+from significance import N_RESAMPLES, two_sample_test
+
+# --- 가설 검증 / A/B 테스트 집계 엔진 ---
+# 대시보드 탭의 집계 로직을 Streamlit 없이 쓸 수 있게 모아 둔 모듈.
+# 검증 함수는 주문 테이블(이미 기간/세그먼트로 걸러진 것)을 받아 {표 이름: DataFrame} 을 돌려주고,
+# 그래프는 대시보드가 이 표로 그린다.
+# CLI 로 (기간 × 세그먼트 × 검증) 조합을 프로세스 풀에서 한꺼번에 계산해 결과 저장소에 쓸 수 있다.
+TARGET_SELLER = "킹댕즈"  # 가설 1 보고서 핵심 셀러
+SEGMENT_ALL = "전체"
+RESULTS_DIR = os.path.join(BASE_PATH, "results")
+
+
+# [가설 1] 지역별 셀러 점유율 (특정 셀러의 지역 편중)
+def seller_region_share(df, sellers=None, seller=TARGET_SELLER):
+    sellers = build_seller_profile(df) if sellers is None else sellers
+    share = region_share_of(sellers, seller)
+    if share is None:
+        return {'share': pd.DataFrame(columns=['지역', '점유율(%)'])}
+    ts_data = share.sort_values(ascending=False).reset_index()
+    ts_data.columns = ['지역', '점유율(%)']
+    return {'share': ts_data}
+
+
+# [가설 2] 이벤트 여부별 평균 주문수량
+def event_order_quantity(df):
+    return {'stats': df.groupby('is_event_item')['주문수량'].mean().reset_index()}
+
+
+# [가설 3] 이벤트 여부별 순이익률
+def event_margin(df):
+    ev_profit = df.groupby('is_event_item')['순이익률'].mean().reset_index()
+    ev_profit['순이익률(%)'] = ev_profit['순이익률'] * 100
+    return {'stats': ev_profit}
+
+
+# [가설 4] 선물 여부별 평균 판매단가
+def gift_price(df):
+    return {'stats': df.groupby('is_gift_item')['판매단가'].mean().reset_index()}
+
+
+# [가설 5] 셀러별 재구매율 상위 5 (주문 50건 이상)
+def seller_reorder(df, sellers=None):
+    profile = (build_seller_profile(df) if sellers is None else sellers)['profile']
+    reorder_s = profile[['고객행수', '재구매수']].reset_index()
+    reorder_s.columns = ['셀러명', 'UID', 'is_reorder']
+    reorder_s['재구매율(%)'] = (reorder_s['is_reorder'] / reorder_s['UID']) * 100
+    return {'top': reorder_s[reorder_s['UID'] >= 50].sort_values('재구매율(%)', ascending=False).head(5)}
+
+
+# [가설 6] 셀러별 이벤트/선물 비중과 주문 수
+def seller_positioning(df, sellers=None):
+    profile = (build_seller_profile(df) if sellers is None else sellers)['profile']
+    seller_map = profile[['이벤트비중', '선물비중', '평균판매단가', '주문건수']].reset_index()
+    seller_map.columns = ['셀러명', 'is_event_item', 'is_gift_item', '판매단가', '주문번호']
+    return {'map': seller_map}
+
+
+# [가설 7/8] 월별 활동 셀러 수
+def monthly_active_sellers(df):
+    month = df['주문일'].dt.to_period('M').astype(str).rename('월')
+    return {'monthly': df.groupby(month)['셀러명'].nunique().reset_index()}
+
+
+# [가설 9] 시간대별 주문/매출과 이벤트 상품 반응
+def time_of_day(df):
+    time_stats = df.groupby(['시간대_구간'], observed=True).agg({
+        '주문번호': 'nunique',
+        '실결제 금액': 'sum',
+        '판매단가': 'mean'
+    }).reset_index()
+    time_stats.columns = ['시간대', '주문수', '총매출', '평균단가']
+    time_ev = df.groupby(['시간대_구간', 'is_event_item'], observed=True)['주문번호'].nunique().reset_index()
+    return {'orders': time_stats, 'events': time_ev}
+
+
+# [가설 10] 첫 구매 vs 재구매 비중과 이벤트 선택률
+def first_purchase(df):
+    first_vs_re = df['is_first_purchase'].value_counts(normalize=True).reset_index()
+    first_vs_re.columns = ['유형', '비중']
+    first_vs_re['유형'] = first_vs_re['유형'].map({True: '첫 구매', False: '재구매'})
+    compare_stats = df.groupby('is_first_purchase').agg({
+        '실결제 금액': 'mean',
+        'is_event_item': 'mean'
+    }).reset_index()
+    compare_stats['is_first_purchase'] = compare_stats['is_first_purchase'].map({True: '첫 구매', False: '재구매'})
+    return {'share': first_vs_re, 'compare': compare_stats}
+
+
+# [A/B A] 가격대별 취소율
+def cancel_by_price(df):
+    high_price_df = df.groupby('단가_그룹', observed=True)['is_cancelled'].mean().reset_index()
+    high_price_df['취소율(%)'] = high_price_df['is_cancelled'] * 100
+    return {'stats': high_price_df}
+
+
+# [A/B B] 이벤트 키워드 유무별 취소율
+def cancel_by_event(df):
+    ev_cancel = df.groupby('is_event_item')['is_cancelled'].mean().reset_index()
+    ev_cancel['취소율(%)'] = ev_cancel['is_cancelled'] * 100
+    return {'stats': ev_cancel}
+
+
+# [A/B C] 규격별 복수 구매 비중
+def bulk_by_weight(df):
+    is_bulk = (df['주문수량'] >= 2).rename('is_bulk')
+    bulk_stats = is_bulk.groupby(df['무게 구분'], observed=True).mean().reset_index()
+    bulk_stats['복수구매비중(%)'] = bulk_stats['is_bulk'] * 100
+    return {'stats': bulk_stats}
+
+
+# A/B 케이스별 유의성 검정 정의: 검정 대상 행, 실험군 여부, 지표 값, 그룹/지표 이름
+AB_TESTS = {
+    'ab_a': {
+        'rows': lambda df: df['단가_그룹'].notna(),
+        'treat': lambda df: df['단가_그룹'].isin(['5-10만원대', '10만원 이상']),
+        'value': lambda df: df['is_cancelled'],
+        'labels': ('5만원 이상', '5만원 미만'), 'metric': '취소율',
+    },
+    'ab_b': {
+        'rows': lambda df: df['is_event_item'].notna(),
+        'treat': lambda df: df['is_event_item'].astype(bool),
+        'value': lambda df: df['is_cancelled'],
+        'labels': ('이벤트 상품', '일반 상품'), 'metric': '취소율',
+    },
+    'ab_c': {
+        'rows': lambda df: df['무게 구분'].notna(),
+        'treat': lambda df: df['무게 구분'] == '3-5kg',
+        'value': lambda df: df['주문수량'] >= 2,
+        'labels': ('3-5kg', '기타 규격'), 'metric': '복수구매비중',
+    },
+}
+
+
+# 실험군 vs 대조군 평균 차이의 부트스트랩 신뢰구간과 순열 검정 p-value (stratify=True 면 셀러별 층화)
+def ab_test(check, df, stratify=False, n_resamples=N_RESAMPLES):
+    spec = AB_TESTS[check]
+    # 전체 표를 복사하지 않도록 필요한 세 컬럼만 배열로 꺼내서 거른다
+    rows = spec['rows'](df).to_numpy()
+    strata = df['셀러명'][rows] if stratify else None
+    result = two_sample_test(spec['value'](df).to_numpy(dtype=float)[rows], spec['treat'](df).to_numpy(dtype=bool)[rows],
+                             strata=strata, n_resamples=n_resamples)
+    treat_label, control_label = spec['labels']
+    return {'실험군': treat_label, '대조군': control_label, '지표': spec['metric'], **result}
+
+
+CHECKS = {
+    'h1': seller_region_share,
+    'h2': event_order_quantity,
+    'h3': event_margin,
+    'h4': gift_price,
+    'h5': seller_reorder,
+    'h6': seller_positioning,
+    'h7_8': monthly_active_sellers,
+    'h9': time_of_day,
+    'h10': first_purchase,
+    'ab_a': cancel_by_price,
+    'ab_b': cancel_by_event,
+    'ab_c': bulk_by_weight,
+}
+
+
+# 셀러 프로필로 계산하는 검증 (대시보드는 필터 상태당 한 번 만든 프로필을 넘겨준다)
+SELLER_CHECKS = ('h1', 'h5', 'h6')
+
+
+def run_check(check, df, sellers=None):
+    if check in SELLER_CHECKS:
+        return CHECKS[check](df, sellers)
+    return CHECKS[check](df)
+
+
+# --- 결과 저장소 ---
+#   <결과>/manifest.json            : 데이터 버전, 생성 시각, 기간/세그먼트/검증 목록
+#   <결과>/<검증>/<표 이름>.parquet  : 모든 (기간, 세그먼트) 결과를 키 컬럼과 함께 이어 붙인 표
+KEY_COLS = ['window_start', 'window_end', 'segment']
+
+
+def _window_key(window):
+    return str(pd.Timestamp(window[0]).date()), str(pd.Timestamp(window[1]).date())
+
+
+class ResultStore:
+    def __init__(self, root=RESULTS_DIR):
+        self.root = root
+        with open(os.path.join(root, "manifest.json"), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.version = self.manifest.get('version')
+        self._tables = {}
+
+    def _table(self, check, name):
+        if (check, name) not in self._tables:
+            self._tables[check, name] = pq.read_table(os.path.join(self.root, check, f"{name}.parquet")).to_pandas()
+        return self._tables[check, name]
+
+    # (기간, 세그먼트) 하나에 대한 검증 결과 {표 이름: DataFrame}, 계산한 적 없는 조합이면 None
+    # version 을 주면 다른 데이터 버전으로 만든 결과도 None (호출하는 쪽이 바로 계산한다)
+    def get(self, check, window, segment=SEGMENT_ALL, version=None):
+        if version is not None and version != self.version:
+            return None
+        start, end = _window_key(window)
+        if (check not in self.manifest['checks'] or segment not in self.manifest['segments']
+                or [start, end] not in self.manifest['windows']):
+            return None
+        result = {}
+        for name in self.manifest['tables'].get(check, []):
+            table = self._table(check, name)
+            rows = table[(table['window_start'] == start) & (table['window_end'] == end) & (table['segment'] == segment)]
+            result[name] = rows.drop(columns=KEY_COLS).reset_index(drop=True)
+        return result
+
+
+def open_results(root=RESULTS_DIR):
+    try:
+        return ResultStore(root)
+    except (OSError, ValueError):
+        return None
+
+
+def write_results(root, results, meta):
+    build_dir = root + ".tmp"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+    tables = {}
+    for (check, name), frames in sorted(results.items()):
+        os.makedirs(os.path.join(build_dir, check), exist_ok=True)
+        table = pd.concat([frame for frame in frames if len(frame)] or frames[:1], ignore_index=True)
+        # 범주형 결과 컬럼은 조합마다 카테고리가 달라 문자열로 저장한다
+        for col in table.columns:
+            if isinstance(table[col].dtype, pd.CategoricalDtype):
+                table[col] = table[col].astype(object)
+        pq.write_table(pa.Table.from_pandas(table, preserve_index=False), os.path.join(build_dir, check, f"{name}.parquet"))
+        tables.setdefault(check, []).append(name)
+    with open(os.path.join(build_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump({**meta, 'tables': tables}, f, ensure_ascii=False, indent=1)
+
+    old_dir = root + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(root):
+        os.replace(root, old_dir)
+    os.replace(build_dir, root)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return root
+
+
+# --- 배치 실행 (프로세스 풀) ---
+# 워커마다 주문 데이터를 한 번만 연다 (fork 로 뜬 워커는 부모가 열어 둔 것을 그대로 쓴다)
+_source = None
+
+
+def _open_source(file_path, store_root):
+    if store_root:
+        return open_store(file_path, store_root)
+    return OrderFilter(load_orders(file_path))
+
+
+def _init_worker(file_path, store_root):
+    global _source
+    if _source is None:
+        _source = _open_source(file_path, store_root)
+
+
+@lru_cache(maxsize=2)
+def _read_window(window):
+    return _source.read(window)
+
+
+def _select(window, segment):
+    if isinstance(_source, PartitionedOrders):
+        df = _read_window(window)
+        return df if segment == SEGMENT_ALL else df[df['셀러명'] == segment]
+    filters = None if segment == SEGMENT_ALL else {'셀러명': [segment]}
+    return _source.select(window, filters=filters)
+
+
+def _run_task(task):
+    window, segment, check = task
+    return task, run_check(check, _select(window, segment))
+
+
+def month_windows(start, end):
+    windows = []
+    for month_start in pd.date_range(pd.Timestamp(start).replace(day=1), end, freq='MS'):
+        month_end = month_start + pd.offsets.MonthEnd(0)
+        windows.append((max(month_start, pd.Timestamp(start)).date(), min(month_end, pd.Timestamp(end)).date()))
+    return windows
+
+
+def run_batch(windows, segments=(SEGMENT_ALL,), checks=tuple(CHECKS), file_path=DATA_FILE, store_root=None,
+              out=RESULTS_DIR, workers=None):
+    global _source
+    if _source is None:
+        _source = _open_source(file_path, store_root)
+    version = _source.version if isinstance(_source, PartitionedOrders) else dataset_version(file_path)
+    tasks = [(_window_key(window), segment, check) for window in windows for segment in segments for check in checks]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(file_path, store_root)) as pool:
+        for (window, segment, check), tables in pool.map(_run_task, tasks, chunksize=max(1, len(tasks) // 64)):
+            for name, table in tables.items():
+                keys = pd.DataFrame({'window_start': [window[0]] * len(table), 'window_end': [window[1]] * len(table),
+                                     'segment': [segment] * len(table)})
+                results.setdefault((check, name), []).append(pd.concat([keys, table.reset_index(drop=True)], axis=1))
+
+    return write_results(out, results, {
+        'version': version,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'source': store_root or file_path,
+        'windows': [list(_window_key(window)) for window in windows],
+        'segments': list(segments),
+        'checks': list(checks),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가설 검증 / A/B 테스트 결과 일괄 계산")
+    parser.add_argument('--csv', default=DATA_FILE, help="원본 주문 CSV")
+    parser.add_argument('--store', help="월 파티션 저장소 경로 (지정하면 저장소에서 기간별로 읽는다)")
+    parser.add_argument('--out', default=RESULTS_DIR, help="결과 저장소 경로")
+    parser.add_argument('--window', action='append', default=[], help="계산할 기간 YYYY-MM-DD:YYYY-MM-DD (여러 번 지정 가능)")
+    parser.add_argument('--monthly', action='store_true', help="데이터 기간의 달마다 기간 하나씩 추가")
+    parser.add_argument('--seller', action='append', default=[], help="셀러 세그먼트 (여러 번 지정 가능)")
+    parser.add_argument('--top-sellers', type=int, default=0, help="매출 상위 N개 셀러를 세그먼트로 추가")
+    parser.add_argument('--check', action='append', choices=list(CHECKS), help="계산할 검증 (기본: 전체)")
+    parser.add_argument('--workers', type=int, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args(argv)
+
+    global _source
+    source = _source = _open_source(args.csv, args.store)
+    if isinstance(source, PartitionedOrders):
+        first, last = source.date_bounds()
+        revenue = source.aggregate(['셀러명'], {'매출': ('실결제 금액', 'sum')}).set_index('셀러명')['매출']
+    else:
+        first, last = source.df['주문일자'].min(), source.df['주문일자'].max()
+        revenue = source.df.groupby('셀러명', observed=True)['실결제 금액'].sum()
+
+    windows = [tuple(window.split(':')) for window in args.window]
+    if args.monthly:
+        windows += month_windows(first, last)
+    if not windows:
+        windows = [(first, last)]
+    segments = [SEGMENT_ALL] + args.seller
+    segments += [seller for seller in revenue.sort_values(ascending=False).index[:args.top_sellers] if seller not in segments]
+
+    root = run_batch(windows, segments, args.check or tuple(CHECKS), args.csv, args.store, args.out, args.workers)
+    print(root, len(windows), "windows x", len(segments), "segments x", len(args.check or CHECKS), "checks")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from analysis_engine import CHECKS, SELLER_CHECKS, ab_test, run_check
+from chart_data import box_figure, scatter_figure
+from data_loader import BASE_PATH, preprocess_orders, read_snapshot, value_counts, write_snapshot
+from data_view import export_file, page_rows, sort_positions
+from filter_engine import OrderFilter, parse_keywords
+from order_generator import GENERATOR_VERSION, SIZES, parse_rows, write_orders
+from order_store import PartitionedOrders, write_partitioned_store
+from rollup import build_daily_rollup, build_product_rollup, rollup_kpis, slice_rollup
+from seller_profile import build_seller_profile, crosstab_rows, seller_lookup, top_sellers
+
+# --- 성능 측정 ---
+# 합성 주문 데이터(order_generator)를 크기별로 만들어 두고, 파이프라인 단계마다 시간과 최대 메모리를 잰다.
+#   load.*    : CSV 읽기, 전처리, 스냅샷 쓰기/읽기
+#   filter.*  : 필터 색인, 기간(최근 30일/전체) 선택, 상품명 키워드 검색
+#   rollup.*  : 트렌드 탭 롤업 큐브 생성
+#   tab.*     : 탭별 집계 (대시보드 build 함수가 하는 일을 같은 라이브러리 함수로 재현)
+#   export.*  : 데이터 탭 내려받기 파일 생성
+#   store.*   : 월 파티션 저장소 생성 / 기간 읽기 / 스트리밍 집계
+# 시간은 repeat 회 중 가장 짧은 값, 메모리는 tracemalloc 을 켠 별도 1회 실행의 최대 할당량
+# (pandas/numpy 할당 기준이고 pyarrow 메모리 풀은 포함되지 않는다).
+# 결과는 benchmarks/results/<시각>-<커밋>.json 으로 남겨 --compare 로 커밋 간 비교한다.
+BENCH_DIR = os.path.join(BASE_PATH, "benchmarks")
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+KEYWORDS = "감귤, 한라봉 & 선물"
+REGRESSION_RATIO = 1.2
+
+
+def dataset_file(n_rows, seed=0, data_dir=DATA_DIR):
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"orders_{n_rows}_s{seed}_v{GENERATOR_VERSION}.csv")
+    if not os.path.exists(path):
+        write_orders(path, n_rows, seed)
+    return path
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=BASE_PATH, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Bench:
+    def __init__(self, n_rows, stages=None, repeat=1, memory=True):
+        self.n_rows = n_rows
+        self.stages = stages
+        self.repeat = repeat
+        self.memory = memory
+        self.records = []
+
+    def selected(self, stage):
+        return not self.stages or any(stage.startswith(prefix) for prefix in self.stages)
+
+    # 선택되지 않은 단계도 다음 단계 입력이 필요하면 실행만 하고 기록하지 않는다
+    def run(self, stage, fn, setup=None, needed=True):
+        if not self.selected(stage):
+            if not needed:
+                return None
+            return fn(setup()) if setup else fn()
+        seconds = []
+        for _ in range(self.repeat):
+            arg = setup() if setup else None
+            gc.collect()
+            start = time.perf_counter()
+            result = fn(arg) if setup else fn()
+            seconds.append(time.perf_counter() - start)
+        record = {'stage': stage, 'rows': self.n_rows, 'seconds': min(seconds)}
+        if self.memory:
+            arg = setup() if setup else None
+            del result
+            gc.collect()
+            tracemalloc.start()
+            result = fn(arg) if setup else fn()
+            record['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        self.records.append(record)
+        print(f"{self.n_rows:>11,} {stage:<22} {record['seconds']:9.3f}s"
+              + (f" {record['peak_mb']:10.1f}MB" if self.memory else ""), flush=True)
+        return result
+
+
+def trend_tab(df, cubes, date_range):
+    daily, product = (slice_rollup(cube, date_range) for cube in cubes)
+    rollup_kpis(daily)
+    for keys in (['주문일자', '감귤 세부'], ['요일', '시간대'], ['주문일자', '품종'], ['주문일자', 'is_event_item']):
+        daily.groupby(keys, observed=True)['실결제 금액'].sum()
+    product.groupby('상품명', observed=True)['주문수'].sum().nlargest(5)
+    profile = build_seller_profile(df)['profile']
+    main_price = pd.DataFrame({'주력_가격대': seller_lookup(df, profile, '주력_가격대'), '실결제 금액': df['실결제 금액']})
+    box_figure(main_price.dropna(subset=['주력_가격대']), '주력_가격대', '실결제 금액', points='outliers')
+
+
+def eda_tab(df):
+    for col in ('단가_그룹', '주문경로', '과수 크기', '결제방법'):
+        value_counts(df[col])
+    df.groupby('단가_그룹', observed=True)['is_cancelled'].mean()
+    sellers = build_seller_profile(df)
+    crosstab_rows(sellers['variety'], top_sellers(sellers['profile'], 10), '주문건수')
+    crosstab_rows(sellers['cancel'], top_sellers(sellers['profile'], 15), '건수')
+    box_figure(df, '주문경로', '실결제 금액')
+    scatter_figure(df, '판매단가', '주문수량', size='실결제 금액', color='감귤 세부', hover_data=['상품명', '셀러명'])
+
+
+def hypothesis_tab(df):
+    sellers = build_seller_profile(df)
+    for check in CHECKS:
+        if check.startswith('h'):
+            run_check(check, df, sellers if check in SELLER_CHECKS else None)
+
+
+def ab_tab(df):
+    for check in CHECKS:
+        if check.startswith('ab_'):
+            run_check(check, df)
+            ab_test(check, df)
+            ab_test(check, df, stratify=True)
+
+
+def data_tab(df):
+    positions = sort_positions(df, '실결제 금액', ascending=False)
+    page_rows(df, positions, 0, 100)
+
+
+def run_size(n_rows, seed=0, stages=None, repeat=1, memory=True, data_dir=DATA_DIR):
+    csv_path = dataset_file(n_rows, seed, data_dir)
+    bench = Bench(n_rows, stages, repeat, memory)
+
+    raw = bench.run('load.read_csv', lambda: pd.read_csv(csv_path))
+    df = bench.run('load.preprocess', preprocess_orders, setup=raw.copy)
+    del raw
+    bench.run('load.snapshot_write', lambda: write_snapshot(df, csv_path))
+    bench.run('load.snapshot_read', lambda: read_snapshot(csv_path), needed=False)
+
+    last = df['주문일자'].max()
+    full_range = (df['주문일자'].min(), last)
+    recent = (last - timedelta(days=29), last)
+    order_filter = bench.run('filter.index', lambda: OrderFilter(df))
+    bench.run('filter.date_30d', lambda: order_filter.select(recent), needed=False)
+    bench.run('filter.date_all', lambda: order_filter.select(full_range), needed=False)
+    bench.run('filter.keyword', lambda f: f.select(full_range, keywords=parse_keywords(KEYWORDS)),
+              setup=lambda: OrderFilter(df), needed=False)
+
+    if any(bench.selected(stage) for stage in ('rollup.build', 'tab.trend')):
+        cubes = bench.run('rollup.build', lambda: (build_daily_rollup(df), build_product_rollup(df)))
+        bench.run('tab.trend', lambda: trend_tab(df, cubes, full_range), needed=False)
+    bench.run('tab.eda', lambda: eda_tab(df), needed=False)
+    bench.run('tab.hypothesis', lambda: hypothesis_tab(df), needed=False)
+    bench.run('tab.ab', lambda: ab_tab(df), needed=False)
+    bench.run('tab.data', lambda: data_tab(df), needed=False)
+    bench.run('export.csv_gz', lambda: export_file(df, 'csv.gz'), needed=False)
+    bench.run('export.parquet', lambda: export_file(df, 'parquet'), needed=False)
+
+    if any(bench.selected(stage) for stage in ('store.build', 'store.read_30d', 'store.aggregate')):
+        root = os.path.splitext(csv_path)[0] + "_store"
+        bench.run('store.build', lambda: write_partitioned_store(csv_path, root))
+        store = PartitionedOrders(root)
+        bench.run('store.read_30d', lambda: store.read(recent), needed=False)
+        bench.run('store.aggregate', lambda: store.aggregate(['셀러명', '단가_그룹'], {
+            '매출': ('실결제 금액', 'sum'), '주문수': ('주문번호', 'nunique')}), needed=False)
+        shutil.rmtree(root, ignore_errors=True)
+    return bench.records
+
+
+def run_benchmark(sizes, seed=0, stages=None, repeat=1, memory=True, out=RESULTS_DIR, data_dir=DATA_DIR):
+    started = datetime.now()
+    records = []
+    for n_rows in sizes:
+        records += run_size(n_rows, seed, stages, repeat, memory, data_dir)
+        gc.collect()
+
+    commit = _git('rev-parse', '--short', 'HEAD')
+    result = {
+        'created': started.isoformat(timespec='seconds'),
+        'commit': commit,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'packages': {'pandas': pd.__version__, 'numpy': np.__version__, 'pyarrow': pa.__version__},
+        'machine': {'platform': platform.platform(), 'processor': platform.processor(), 'cpus': os.cpu_count()},
+        'results': records,
+    }
+    os.makedirs(out, exist_ok=True)
+    path = os.path.join(out, f"{started:%Y%m%d-%H%M%S}-{commit or 'nogit'}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=1)
+    return path
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        result = json.load(f)
+    return result, pd.DataFrame(result['results']).set_index(['stage', 'rows'])
+
+
+# 두 결과 파일의 같은 (단계, 행 수) 비교: 비율이 threshold 이상이면 회귀로 표시
+def compare_results(old_path, new_path, threshold=REGRESSION_RATIO):
+    (old_meta, old), (new_meta, new) = load_results(old_path), load_results(new_path)
+    table = old.add_suffix('_old').join(new.add_suffix('_new'), how='inner')
+    table['시간 비율'] = table['seconds_new'] / table['seconds_old']
+    if 'peak_mb_old' in table and 'peak_mb_new' in table:
+        table['메모리 비율'] = table['peak_mb_new'] / table['peak_mb_old']
+    ratios = table.filter(like='비율')
+    table['회귀'] = (ratios >= threshold).any(axis=1)
+    print(f"{old_meta['commit']} ({old_meta['created']}) -> {new_meta['commit']} ({new_meta['created']})")
+    with pd.option_context('display.max_rows', None, 'display.width', 200, 'display.float_format', '{:,.3f}'.format):
+        print(table)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터 기반 파이프라인 성능 측정")
+    parser.add_argument('--rows', action='append', help=f"데이터 크기 ({' | '.join(SIZES)} | 숫자, 여러 번 지정 가능, 기본: 100k)")
+    parser.add_argument('--stage', action='append', help="측정할 단계 접두어 (예: load, tab.trend, 여러 번 지정 가능)")
+    parser.add_argument('--repeat', type=int, default=1, help="단계별 반복 횟수 (가장 짧은 시간을 기록)")
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc 메모리 측정 생략")
+    parser.add_argument('--seed', type=int, default=0, help="합성 데이터 시드")
+    parser.add_argument('--out', default=RESULTS_DIR, help="결과 JSON 저장 경로")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="합성 CSV 저장 경로")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="두 결과 파일 비교")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO, help="회귀로 볼 비율")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare_results(*args.compare, threshold=args.threshold)
+        return
+    sizes = [parse_rows(rows) for rows in (args.rows or ['100k'])]
+    print(run_benchmark(sizes, args.seed, args.stage, args.repeat, not args.no_memory, args.out, args.data_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# --- 행 단위 그래프용 데이터 계층 ---
+# box/scatter 는 그대로 그리면 걸러진 행 전체가 브라우저로 넘어가므로,
+# 행 수가 기준(row_limit)을 넘으면 서버에서 요약한 데이터로 같은 모양의 그래프를 만든다.
+#   box     : 그룹별 사분위수/수염은 서버에서 계산, 이상치는 그룹당 max_outliers 개까지만 보낸다
+#   scatter : 'sample' 은 고정 시드 표본 + WebGL, 'density' 는 2차원 히스토그램 열지도
+# 기준 이하에서는 기존 px 그래프를 그대로 돌려준다.
+ROW_LIMIT = 5000
+MAX_OUTLIERS = 200
+DENSITY_BINS = 60
+
+
+# 그룹별 상자그림 통계 (사분위수는 선형 보간, 수염은 1.5 IQR 안의 최소/최대 값)
+def box_stats(df, x, y, max_outliers=MAX_OUTLIERS):
+    data = df[[x, y]].dropna()
+    keys, values = data[x], data[y].astype(float)
+    grouped = values.groupby(keys, observed=True, sort=False)
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    iqr = stats['q3'] - stats['q1']
+    low = (stats['q1'] - 1.5 * iqr).reindex(keys).to_numpy()
+    high = (stats['q3'] + 1.5 * iqr).reindex(keys).to_numpy()
+    inside = (values >= low) & (values <= high)
+    stats['lowerfence'] = values[inside].groupby(keys[inside], observed=True).min()
+    stats['upperfence'] = values[inside].groupby(keys[inside], observed=True).max()
+
+    # 이상치는 정렬한 뒤 고르게 골라서 양끝 값과 분포 모양을 유지한다
+    outliers = {}
+    for key, group in values[~inside].groupby(keys[~inside], observed=True):
+        group = np.sort(group.to_numpy())
+        if len(group) > max_outliers:
+            group = group[np.linspace(0, len(group) - 1, max_outliers).round().astype(int)]
+        outliers[key] = group
+    stats['outliers'] = [outliers.get(key, np.empty(0)) for key in stats.index]
+
+    order = pd.unique(keys)
+    return stats.reindex(order).rename_axis(x).reset_index()
+
+
+def box_figure(df, x, y, title=None, points=None, row_limit=ROW_LIMIT, max_outliers=MAX_OUTLIERS):
+    if len(df) <= row_limit:
+        return px.box(df, x=x, y=y, color=x, title=title, points=points)
+
+    stats = box_stats(df, x, y, max_outliers)
+    # px 로 같은 배치/색/범례를 만든 뒤 각 상자에 미리 계산한 통계를 넣는다
+    fig = px.box(stats, x=x, y='median', color=x, title=title, points=False, labels={'median': y})
+    by_key = stats.set_index(x)
+    for trace in list(fig.data):
+        row = by_key.loc[trace.x[0]]
+        trace.update(x=[trace.x[0]], y=None, q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+                     lowerfence=[row['lowerfence']], upperfence=[row['upperfence']])
+        if points is not False and len(row['outliers']):
+            fig.add_trace(go.Scatter(x=[trace.x[0]] * len(row['outliers']), y=row['outliers'], mode='markers',
+                                     name=trace.name, legendgroup=trace.legendgroup, showlegend=False,
+                                     marker=dict(color=trace.marker.color, size=4),
+                                     hovertemplate=f"{x}=%{{x}}<br>{y}=%{{y}}<extra></extra>"))
+    return fig
+
+
+def scatter_figure(df, x, y, title=None, row_limit=ROW_LIMIT, mode='sample', **kwargs):
+    if len(df) <= row_limit:
+        return px.scatter(df, x=x, y=y, title=title, **kwargs)
+
+    if mode == 'density':
+        data = df[[x, y]].dropna()
+        counts, x_edges, y_edges = np.histogram2d(data[x], data[y], bins=DENSITY_BINS)
+        x_mid, y_mid = (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+        fig = go.Figure(go.Heatmap(x=x_mid, y=y_mid, z=np.where(counts.T > 0, counts.T, np.nan),
+                                   colorscale='Viridis', colorbar=dict(title='주문 수'),
+                                   hovertemplate=f"{x}=%{{x:,.0f}}<br>{y}=%{{y:,.1f}}<br>주문 수=%{{z}}<extra></extra>"))
+        return fig.update_layout(title=f"{title} (밀도, {len(data):,}건)", xaxis_title=x, yaxis_title=y)
+
+    # 재실행해도 같은 그림이 나오도록 고정 시드 표본, 원래 행 순서 유지
+    sample = df.sample(n=row_limit, random_state=0).sort_index()
+    return px.scatter(sample, x=x, y=y, title=f"{title} (표본 {row_limit:,}/{len(df):,}건)",
+                      render_mode='webgl', **kwargs)
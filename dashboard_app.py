@@ -3,103 +3,189 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import numpy as np
 import os
+from functools import partial
+
+from analysis_engine import CHECKS, RESULTS_DIR, SELLER_CHECKS, TARGET_SELLER, ab_test, monthly_active_sellers, open_results, run_check
+from chart_data import ROW_LIMIT, box_figure, scatter_figure
+from data_view import EXPORT_FORMATS, PAGE_SIZES, export_file, page_rows, sort_positions
+from data_loader import DATA_FILE, value_counts
+from figure_cache import MAX_BYTES, FigureCache, filter_state, section_key
+from filter_engine import parse_keywords
+from hot_reload import POLL_SECONDS, HotReloader, MemoryGeneration, StoreGeneration, watched_paths
+from order_store import PARTITION_COL
+from profiler import RunProfile, profiling_default
+from rollup import build_daily_rollup, build_product_rollup, rollup_kpis, slice_rollup
+from seller_profile import build_seller_profile, crosstab_rows, seller_lookup, top_sellers
 
 # 페이지 설정
 st.set_page_config(page_title="농산물 이커머스 전략 대시보드", layout="wide")
 
-# 데이터 로드 및 전처리 (캐싱)
-@st.cache_data
-def load_data():
-    # 상대 경로 설정 (스크립트 파일 위치 기준)
-    base_path = os.path.dirname(__file__)
-    file_path = os.path.join(base_path, "preprocessed_data_20260131.csv")
-    df = pd.read_csv(file_path)
-    
-    # 날짜 처리
-    df['주문일'] = pd.to_datetime(df['주문일'])
-    df['주문일자'] = df['주문일'].dt.date
-    df['요일'] = df['주문일'].dt.day_name()
-    df['시간대'] = df['주문일'].dt.hour
-    
-    # 숫자 변환
-    num_cols = ['결제금액', '주문취소 금액', '실결제 금액', '판매단가', '공급단가', '주문수량', '취소수량', '주문-취소 수량']
-    for col in num_cols:
-        if col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = df[col].str.replace(',', '').astype(float)
-            else:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    # --- 보고서 기반 파생 변수 및 그룹화 ---
-    # 1. 이벤트/선물 키워드 (보고서 기준 정교화)
-    event_keywords = '1\+1|증정|추가발송|이벤트|특가|한정|폭탄'
-    gift_keywords = '선물|포장|선물세트|선물용'
-    df['is_event_item'] = df['상품명'].str.contains(event_keywords).fillna(False) | (df['이벤트 여부'] == 'Y')
-    df['is_gift_item'] = df['상품명'].str.contains(gift_keywords).fillna(False) | (df['선물세트_여부'].str.contains('선물|세트').fillna(False))
-    
-    # 2. 가격대 그룹 (보고서 기준: 1-3만원, 3-5만원, 5-10만원 등)
-    def categorize_price(price):
-        if price < 10000: return '1만원 미만'
-        elif price < 30000: return '1-3만원대'
-        elif price < 50000: return '3-5만원대'
-        elif price < 100000: return '5-10만원대'
-        else: return '10만원 이상'
-    df['단가_그룹'] = df['판매단가'].apply(categorize_price)
-    
-    # 3. 순이익 계산 (수수료 10% 가정)
-    fee_rate = 0.1
-    df['순이익'] = df['실결제 금액'] - df['공급단가'].fillna(0) - (df['실결제 금액'] * fee_rate)
-    df['순이익률'] = (df['순이익'] / df['실결제 금액']).replace([np.inf, -np.inf], 0).fillna(0)
-    
-    # 4. 재구매 및 취소 정보
-    if 'UID' in df.columns:
-        # 셀러별 재구매 여부 (가설 5용)
-        df['is_reorder'] = df.groupby(['셀러명', 'UID'])['주문번호'].transform('nunique') > 1
-        # 고객사 전체 기준 첫 구매 여부 (가설 10용)
-        # 각 UID별 가장 빠른 주문일을 찾음
-        df['first_order_date'] = df.groupby('UID')['주문일자'].transform('min')
-        df['is_first_purchase'] = df['주문일자'] == df['first_order_date']
+# 데이터 백엔드 (DASHBOARD_BACKEND)
+#   memory      : 전체 주문 테이블을 메모리에 올려 세션 간 공유 (기본)
+#   partitioned : 월 단위 Parquet 파티션 저장소에서 선택한 기간만 읽는다
+#                 (저장소 경로는 DASHBOARD_STORE, 기본 조회 기간은 최근 DASHBOARD_DEFAULT_DAYS 일)
+PARTITIONED = os.environ.get("DASHBOARD_BACKEND", "memory") == "partitioned"
+DEFAULT_DAYS = int(os.environ.get("DASHBOARD_DEFAULT_DAYS", "90"))
+
+# 행 단위 box/scatter 그래프는 이 행 수를 넘으면 서버에서 요약한 데이터로 그린다
+# (DASHBOARD_SCATTER_MODE: sample = WebGL 표본, density = 2차원 히스토그램)
+CHART_ROWS = int(os.environ.get("DASHBOARD_CHART_ROWS", ROW_LIMIT))
+SCATTER_MODE = os.environ.get("DASHBOARD_SCATTER_MODE", "sample")
+
+# 계측 모드 (DASHBOARD_PROFILE=1 또는 사이드바 스위치): 구간별 시간/행 수/그래프 JSON 크기를 기록해
+# 화면 아래 프로파일러 패널과 실행마다 JSON 로그로 남긴다. 스위치 값은 위젯보다 먼저 읽어 데이터 로드부터 잰다.
+prof = RunProfile(st.session_state.get("profiling", profiling_default()))
+
+# 섹션별 집계/그래프 공유 캐시 (크기 상한은 DASHBOARD_FIGURE_CACHE_MB, 기본 256MB)
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache(int(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", MAX_BYTES >> 20)) << 20)
+
+figure_cache = load_figure_cache()
+
+# 새 세대를 바꿔 끼우기 전에 기본 기간(키워드 없음)의 셀러 프로필과 검증 표를 그래프 캐시에 채워 둔다
+# (백그라운드 스레드에서 불리므로 세대 인자와 공유 캐시만 쓴다)
+def warm_sections(data):
+    key = filter_state(data.default_range, [], (data.min_date, data.max_date))
+    if PARTITIONED:
+        rows = data.period_filter(data.default_range).select()
     else:
-        df['is_reorder'] = False
-        df['is_first_purchase'] = True
-        
-    # 5. 시간대 구간화 (가설 9용)
-    def categorize_time(hour):
-        if 0 <= hour < 6: return '새벽 (00-06)'
-        elif 6 <= hour < 12: return '오전 (06-12)'
-        elif 12 <= hour < 18: return '오후 (12-18)'
-        elif 18 <= hour < 21: return '저녁 (18-21)'
-        else: return '야간 (21-24)'
-    df['시간대_구간'] = df['시간대'].apply(categorize_time)
-    
-    df['is_cancelled'] = df['취소여부'] == 'Y'
-    
-    return df
-
-df = load_data()
+        rows = data.order_filter.select(data.default_range)
+    sellers = build_seller_profile(rows)
+    figure_cache.put(section_key('sellers', key, data.version), sellers)
+    for check in CHECKS:
+        # 가설 7/8 은 전체 이력 기준 그래프로 따로 만든다
+        if check != 'h7_8':
+            tables = run_check(check, rows, sellers if check in SELLER_CHECKS else None)
+            figure_cache.put(section_key(('check', check), key, data.version), tables)
+
+# 데이터 로드 및 전처리 (세션 간 공유)
+# 전처리 결과는 data_loader 가 Parquet 스냅샷으로 보관하므로 CSV가 바뀐 경우에만 다시 파싱한다.
+# 데이터셋, 롤업 큐브, 필터 엔진은 한 세대로 묶어 읽기 전용으로 공유한다 (df, filtered_df 에는 컬럼을 추가하거나 값을 바꾸지 않는다).
+# 원본 CSV(파티션 모드는 저장소 메타 포함)가 바뀌면 hot_reload 가 백그라운드에서 새 세대와 기본 기간 집계를
+# 다 만든 뒤 바꿔 끼우므로 서버를 다시 띄울 필요가 없다 (확인 주기는 DASHBOARD_RELOAD_SECONDS, 0 이면 끔).
+# 실행마다 세대(data)를 한 번만 읽어 이 실행 안에서는 같은 세대만 쓴다.
+#   memory      : 전체 주문 테이블 + 주문일 정렬/키워드 색인 필터 엔진 + 트렌드 탭 롤업 큐브
+#   partitioned : 저장소 + 저장소에 함께 보관된 롤업 큐브 + 기본 기간 필터 엔진
+@st.cache_resource
+def load_data_watcher():
+    if PARTITIONED:
+        store_root = os.environ.get("DASHBOARD_STORE") or None
+        build = partial(StoreGeneration, DATA_FILE, store_root, DEFAULT_DAYS)
+    else:
+        store_root = None
+        build = partial(MemoryGeneration, DATA_FILE)
+    poll_seconds = float(os.environ.get("DASHBOARD_RELOAD_SECONDS", POLL_SECONDS))
+    return HotReloader(watched_paths(DATA_FILE, store_root, PARTITIONED), build, warm_sections, poll_seconds)
+
+# 파티션 모드에서 기본 기간이 아닌 기간은 그 기간만 읽어 필터 엔진을 만든다 (세대별로 최근 몇 개 기간만 보관)
+@st.cache_resource(max_entries=4)
+def load_period_filter(version, start, end, _data):
+    return _data.read_period((start, end))
+
+with prof.section("데이터 로드", 'load'):
+    watcher = load_data_watcher()
+    data = watcher.current
+    data_version = data.version
+    daily_cube, product_cube = data.daily_cube, data.product_cube
+    min_date, max_date = data.min_date, data.max_date
+    default_range = list(data.default_range)
+    if PARTITIONED:
+        store = data.store
+    else:
+        df = data.dataset.df
+        order_filter = data.order_filter
 
 # 사이드바
 st.sidebar.header("🔍 분석 필터")
-keyword_input = st.sidebar.text_input("상품명 키워드 검색 (비워두면 전체)", "")
-keywords = [k.strip() for k in keyword_input.split(",") if k.strip()]
+keyword_input = st.sidebar.text_input("상품명 키워드 검색 (비워두면 전체)", "", help="쉼표(,)는 OR, &는 AND 조건입니다. 예: 한라봉, 감귤 & 선물")
+keywords = parse_keywords(keyword_input)
+
+date_range = st.sidebar.date_input("주문 기간", default_range, min_value=min_date, max_value=max_date)
+st.sidebar.toggle("🔬 성능 계측 (프로파일러)", value=profiling_default(), key="profiling",
+                  help="구간별 실행 시간, 행 수, 그래프 JSON 크기를 화면 아래 패널과 JSON 로그로 기록합니다.")
+st.sidebar.caption(f"데이터 버전 {data_version} · {data.loaded_at:%Y-%m-%d %H:%M:%S} 로드")
+if watcher.last_error:
+    st.sidebar.warning(f"데이터 갱신 중 오류 (현재 표시 중인 데이터는 그대로 유지): {watcher.last_error}")
+
+# 필터링 (정렬된 주문일에 대한 이진 탐색 구간 슬라이스 + 상품명 키워드 역색인)
+with prof.section("필터", 'filter') as filter_record:
+    if PARTITIONED:
+        period_filter = data.period_filter(date_range) or load_period_filter(data_version, date_range[0], date_range[1], data)
+        filtered_df = period_filter.select(keywords=keywords)
+    else:
+        filtered_df = order_filter.select(date_range, keywords=keywords)
+if filter_record is not None:
+    filter_record['rows'] = len(filtered_df)
+
+# 섹션별 집계/그래프는 (섹션, 정규화된 필터 상태, 데이터 버전) 단위로 공유 캐시에 보관해서
+# 탭을 다시 열거나 다른 세션이 같은 기간을 볼 때 바로 보여준다
+filter_key = filter_state(date_range, keywords, (min_date, max_date))
+
+def trend_cubes():
+    # 롤업 큐브에는 상품명 차원이 없으므로, 키워드 검색 중에는 걸러진 행으로 다시 집계한다
+    if keywords:
+        return build_daily_rollup(filtered_df), build_product_rollup(filtered_df)
+    return slice_rollup(daily_cube, date_range), slice_rollup(product_cube, date_range)
+
+def memoize_section(section, filter_key, build):
+    label = " / ".join(map(str, section)) if isinstance(section, tuple) else section
+    with prof.section(label, 'section', rows=len(filtered_df)) as record:
+        result, cached = figure_cache.get_or_build(section_key(section, filter_key, data_version), build)
+    if record is not None:
+        record['cached'] = cached
+    return result
+
+def show_chart(fig, name=None):
+    with prof.section(name or fig.layout.title.text or "그래프", 'render', figure=fig):
+        st.plotly_chart(fig, use_container_width=True)
+
+# 가설/A-B 결과 표: analysis_engine CLI 로 미리 계산한 결과 저장소(DASHBOARD_RESULTS)에
+# 같은 데이터 버전·같은 기간의 결과가 있으면 그것을 쓰고, 키워드 검색 중이거나 없으면 바로 계산한다
+@st.cache_resource
+def load_results():
+    return open_results(os.environ.get("DASHBOARD_RESULTS", RESULTS_DIR))
 
-min_date, max_date = df['주문일자'].min(), df['주문일자'].max()
-date_range = st.sidebar.date_input("주문 기간", [min_date, max_date])
+def precomputed(check, window):
+    results = load_results()
+    if results is None or keywords:
+        return None
+    return results.get(check, window, version=data_version)
 
-# 필터링
-mask = (df['주문일자'] >= date_range[0]) & (df['주문일자'] <= date_range[1])
-filtered_df = df[mask]
+def seller_tables():
+    return memoize_section('sellers', filter_key, lambda: build_seller_profile(filtered_df))
+
+def check_tables(check):
+    tables = precomputed(check, date_range)
+    if tables is not None:
+        return tables
+    return memoize_section(('check', check), filter_key,
+                           lambda: run_check(check, filtered_df, seller_tables() if check in SELLER_CHECKS else None))
 
 # 메인 UI
 st.title("🍊 농산물 이커머스 상세 분석 대시보드")
 st.markdown("> **상품 구조 기반 구매 행동 EDA 보고서**의 실시간 데이터 버전입니다.")
 
-tabs = st.tabs(["� 전략 리포트", "�📈 트렌드", "📊 기초 EDA", "💡 가설 검증", "🧪 A/B 테스트", "📋 데이터"])
+TAB_NAMES = ["� 전략 리포트", "�📈 트렌드", "📊 기초 EDA", "💡 가설 검증", "🧪 A/B 테스트", "📋 데이터"]
+
+# st.tabs 는 숨겨진 탭도 모두 실행하므로, 기본은 선택된 탭 하나만 그리는 지연 모드로 동작한다
+# (DASHBOARD_LAZY_TABS=0 이면 기존처럼 모든 탭을 st.tabs 로 렌더링)
+LAZY_TABS = os.environ.get("DASHBOARD_LAZY_TABS", "1") != "0"
+
+# 지연 모드에서는 안 보이는 탭의 위젯 상태가 지워지지 않도록 매 실행마다 다시 기록해 둔다
+for widget_key in ("selected_h", "ab_case", "ab_stratify", "grid_sort", "grid_desc", "grid_page_size", "grid_page", "export_format"):
+    if widget_key in st.session_state:
+        st.session_state[widget_key] = st.session_state[widget_key]
+
+if LAZY_TABS:
+    active_tab = st.segmented_control("탭 선택", TAB_NAMES, default=TAB_NAMES[0], key="active_tab", label_visibility="collapsed") or TAB_NAMES[0]
+    tabs = [st.container() if name == active_tab else None for name in TAB_NAMES]
+else:
+    tabs = st.tabs(TAB_NAMES)
 
 # --- Tab 0: 전략 리포트 ---
-with tabs[0]:
+def render_strategy_tab():
     st.header("📄 상품 구조 기반 구매 행동 EDA 분석 보고서")
     st.markdown("""
     본 보고서는 농산물 이커머스 주문 데이터를 바탕으로 상품의 단가, 옵션, 키워드 구조가 고객의 구매 결정 및 취소 행태에 미치는 영향을 분석한 결과입니다.
@@ -159,106 +245,173 @@ with tabs[0]:
         st.success("**⚠️ 5. 고단가 상품 취소율 방어**: 5만원↑ 상품의 높은 심리적 저항(취소율 27%)을 낮추기 위한 배송 전 안심 서비스(검수 영상 등) 또는 3-5만원대 리패키징 권고")
 
 # --- Tab 1: 트렌드 ---
-with tabs[1]:
+def render_trend_tab():
     st.header("📈 상품 및 셀러 유형별 매출 트렌드 상세")
-    
-    # 상단 요약 지표
+
+    def build():
+        out = {}
+        trend_cube, hero_cube = trend_cubes()
+        # 상단 요약 지표 (롤업 큐브에서 재합산)
+        with prof.section("트렌드/요약 지표", rows=len(trend_cube)):
+            out['kpis'] = rollup_kpis(trend_cube)
+
+        # [그래프 1] 상품 유형별(감귤 세부) 누적 매출 추이
+        with prof.section("트렌드/그래프 1", rows=len(trend_cube)):
+            yearly_trend = trend_cube.groupby(['주문일자', '감귤 세부'], observed=True)['실결제 금액'].sum().reset_index()
+            out['fig1'] = px.area(yearly_trend, x='주문일자', y='실결제 금액', color='감귤 세부', 
+                            title="[그래프 1] 상품 유형별 일별 누적 매출 추이 (Stack Area)")
+
+        # [그래프 2] 셀러 유형(가격대 타겟)별 평균 결제 수준
+        # 셀러가 주로 파는 가격대 그룹을 셀러의 유형으로 정의
+        # (셀러 프로필의 주력 가격대를 주문 행마다 셀러 위치로 찾아 붙인다)
+        with prof.section("트렌드/그래프 2", rows=len(filtered_df)):
+            profile = seller_tables()['profile']
+            temp_df = pd.DataFrame({'주력_가격대': seller_lookup(filtered_df, profile, '주력_가격대'),
+                                    '실결제 금액': filtered_df['실결제 금액']}).dropna(subset=['주력_가격대'])
+            out['fig2'] = box_figure(temp_df, x='주력_가격대', y='실결제 금액',
+                           title="[그래프 2] 셀러 주력 가격대별 실결제 금액 분포", points="outliers", row_limit=CHART_ROWS)
+
+        # [그래프 3] 요일/시간대별 매출 열지도 (Heatmap)
+        with prof.section("트렌드/그래프 3", rows=len(trend_cube)):
+            heatmap_data = trend_cube.groupby(['요일', '시간대'], observed=True)['실결제 금액'].sum().reset_index()
+            # 요일 순서 정렬
+            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            heatmap_data['요일'] = pd.Categorical(heatmap_data['요일'], categories=day_order, ordered=True)
+            heatmap_pivot = heatmap_data.pivot(index='요일', columns='시간대', values='실결제 금액')
+            out['fig3'] = px.imshow(heatmap_pivot, title="[그래프 3] 요일/시간대별 총 매출 열지도",
+                             labels=dict(x="시간대", y="요일", color="매출액"),
+                             color_continuous_scale='Viridis')
+
+        # [그래프 4] 상품 품종별 매출 비중 추이 (100% Stacked Bar)
+        with prof.section("트렌드/그래프 4", rows=len(trend_cube)):
+            variety_trend = trend_cube.groupby(['주문일자', '품종'], observed=True)['실결제 금액'].sum().reset_index()
+            out['fig4'] = px.bar(variety_trend, x='주문일자', y='실결제 금액', color='품종', 
+                            title="[그래프 4] 일자별 상품 품종 구성비 추이", barmode='relative')
+
+        # [그래프 5] 상위 셀러별 매출 기여도 및 평균 단가 (Bubble Chart)
+        with prof.section("트렌드/그래프 5", rows=len(profile)):
+            seller_perf = profile[['총매출', '평균결제액', '주문건수']].reset_index()
+            out['fig5'] = px.scatter(seller_perf.head(20), x='주문건수', y='총매출', size='평균결제액', color='셀러명',
+                               hover_data=['셀러명'], title="[그래프 5] 상위 20개 셀러 매출-주문건수 (크기: 평균결제액)")
+
+        # [그래프 6] 이벤트 여부에 따른 시계열 매출 변화
+        with prof.section("트렌드/그래프 6", rows=len(trend_cube)):
+            event_trend = trend_cube.groupby(['주문일자', 'is_event_item'], observed=True)['실결제 금액'].sum().reset_index()
+            out['fig6'] = px.line(event_trend, x='주문일자', y='실결제 금액', color='is_event_item', 
+                            title="[그래프 6] 이벤트 여부별 일별 매출 트렌드 비교", markers=True)
+
+        out['hero_items'] = hero_cube.groupby('상품명', observed=True)['주문수'].sum().sort_values(ascending=False).head(5)
+        return out
+
+    trend = memoize_section('trend', filter_key, build)
+
+    kpis = trend['kpis']
     t_m1, t_m2, t_m3, t_m4 = st.columns(4)
     with t_m1:
-        st.metric("총 실결제 금액", f"{filtered_df['실결제 금액'].sum():,.0f}원")
+        st.metric("총 실결제 금액", f"{kpis['총 실결제 금액']:,.0f}원")
     with t_m2:
-        st.metric("평균 객단가(ARPU)", f"{filtered_df['실결제 금액'].mean():,.0f}원")
+        st.metric("평균 객단가(ARPU)", f"{kpis['평균 객단가']:,.0f}원")
     with t_m3:
-        st.metric("활발한 셀러 수", f"{filtered_df['셀러명'].nunique()}명")
+        st.metric("활발한 셀러 수", f"{kpis['활발한 셀러 수']}명")
     with t_m4:
-        st.metric("주문 건수", f"{filtered_df['주문번호'].nunique():,.0f}건")
+        st.metric("주문 건수", f"{kpis['주문 건수']:,.0f}건")
 
     st.divider()
     
     t_col1, t_col2 = st.columns([1, 1])
     with t_col1:
-        # [그래프 1] 상품 유형별(감귤 세부) 누적 매출 추이
-        yearly_trend = filtered_df.groupby(['주문일자', '감귤 세부'])['실결제 금액'].sum().reset_index()
-        fig1 = px.area(yearly_trend, x='주문일자', y='실결제 금액', color='감귤 세부', 
-                        title="[그래프 1] 상품 유형별 일별 누적 매출 추이 (Stack Area)")
-        st.plotly_chart(fig1, use_container_width=True)
-        
-        # [그래프 2] 셀러 유형(가격대 타겟)별 평균 결제 수준
-        # 셀러가 주로 파는 가격대 그룹을 셀러의 유형으로 정의
-        seller_type_df = filtered_df.groupby('셀러명')['단가_그룹'].agg(lambda x: x.value_counts().index[0]).reset_index()
-        seller_type_df.columns = ['셀러명', '주력_가격대']
-        temp_df = filtered_df.merge(seller_type_df, on='셀러명')
-        fig2 = px.box(temp_df, x='주력_가격대', y='실결제 금액', color='주력_가격대',
-                       title="[그래프 2] 셀러 주력 가격대별 실결제 금액 분포", points="outliers")
-        st.plotly_chart(fig2, use_container_width=True)
-
-        # [그래프 3] 요일/시간대별 매출 열지도 (Heatmap)
-        heatmap_data = filtered_df.groupby(['요일', '시간대'])['실결제 금액'].sum().reset_index()
-        # 요일 순서 정렬
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        heatmap_data['요일'] = pd.Categorical(heatmap_data['요일'], categories=day_order, ordered=True)
-        heatmap_pivot = heatmap_data.pivot(index='요일', columns='시간대', values='실결제 금액')
-        fig3 = px.imshow(heatmap_pivot, title="[그래프 3] 요일/시간대별 총 매출 열지도",
-                         labels=dict(x="시간대", y="요일", color="매출액"),
-                         color_continuous_scale='Viridis')
-        st.plotly_chart(fig3, use_container_width=True)
+        show_chart(trend['fig1'])
+        show_chart(trend['fig2'])
+        show_chart(trend['fig3'])
 
     with t_col2:
-        # [그래프 4] 상품 품종별 매출 비중 추이 (100% Stacked Bar)
-        variety_trend = filtered_df.groupby(['주문일자', '품종'])['실결제 금액'].sum().reset_index()
-        fig4 = px.bar(variety_trend, x='주문일자', y='실결제 금액', color='품종', 
-                        title="[그래프 4] 일자별 상품 품종 구성비 추이", barmode='relative')
-        st.plotly_chart(fig4, use_container_width=True)
-        
-        # [그래프 5] 상위 셀러별 매출 기여도 및 평균 단가 (Bubble Chart)
-        seller_perf = filtered_df.groupby('셀러명').agg({
-            '실결제 금액': ['sum', 'mean'],
-            '주문번호': 'nunique'
-        }).reset_index()
-        seller_perf.columns = ['셀러명', '총매출', '평균결제액', '주문건수']
-        fig5 = px.scatter(seller_perf.head(20), x='주문건수', y='총매출', size='평균결제액', color='셀러명',
-                           hover_data=['셀러명'], title="[그래프 5] 상위 20개 셀러 매출-주문건수 (크기: 평균결제액)")
-        st.plotly_chart(fig5, use_container_width=True)
-        
-        # [그래프 6] 이벤트 여부에 따른 시계열 매출 변화
-        event_trend = filtered_df.groupby(['주문일자', 'is_event_item'])['실결제 금액'].sum().reset_index()
-        fig6 = px.line(event_trend, x='주문일자', y='실결제 금액', color='is_event_item', 
-                        title="[그래프 6] 이벤트 여부별 일별 매출 트렌드 비교", markers=True)
-        st.plotly_chart(fig6, use_container_width=True)
+        show_chart(trend['fig4'])
+        show_chart(trend['fig5'])
+        show_chart(trend['fig6'])
 
     st.subheader("🌟 실시간 히어로 상품 (TOP 5)")
     st.divider()
     h_col1, h_col2, h_col3, h_col4, h_col5 = st.columns(5)
-    hero_items = filtered_df.groupby('상품명')['주문번호'].nunique().sort_values(ascending=False).head(5)
     cols = [h_col1, h_col2, h_col3, h_col4, h_col5]
-    for i, (name, count) in enumerate(hero_items.items()):
+    for i, (name, count) in enumerate(trend['hero_items'].items()):
         with cols[i]:
             st.info(f"**{i+1}위**\n\n{name}\n\n**{count}건**")
 
 # --- Tab 2: 기초 EDA ---
-with tabs[2]:
+def render_eda_tab():
     st.header("상품 및 취소 행태 분석")
-    col1, col2 = st.columns(2)
-    with col1:
+
+    def build():
+        out = {}
         # 가격대별 주문 볼륨 (보고서 1번 항목)
-        price_vol = filtered_df['단가_그룹'].value_counts().reindex(['1만원 미만', '1-3만원대', '3-5만원대', '5-10만원대', '10만원 이상']).reset_index()
-        fig1 = px.bar(price_vol, x='단가_그룹', y='count', title="가격대별 주문 볼륨 (3-5만원대 주력)", text_auto=True, color='count')
-        st.plotly_chart(fig1, use_container_width=True)
-        
+        with prof.section("EDA/가격대별 주문 볼륨", rows=len(filtered_df)):
+            price_vol = filtered_df['단가_그룹'].value_counts().reindex(['1만원 미만', '1-3만원대', '3-5만원대', '5-10만원대', '10만원 이상']).reset_index()
+            out['price_vol'] = px.bar(price_vol, x='단가_그룹', y='count', title="가격대별 주문 볼륨 (3-5만원대 주력)", text_auto=True, color='count')
+
         # 유입 경로 비중
-        inflow = filtered_df['주문경로'].value_counts().reset_index()
-        st.plotly_chart(px.pie(inflow, values='count', names='주문경로', title="주문 유입 경로 비중", hole=0.4), use_container_width=True)
+        with prof.section("EDA/유입 경로 비중", rows=len(filtered_df)):
+            inflow = value_counts(filtered_df['주문경로']).reset_index()
+            out['inflow'] = px.pie(inflow, values='count', names='주문경로', title="주문 유입 경로 비중", hole=0.4)
 
-    with col2:
         # 단가 그룹별 취소율 (보고서 3번 항목)
-        cancel_rate = filtered_df.groupby('단가_그룹')['is_cancelled'].mean().reset_index()
-        cancel_rate['취소율(%)'] = cancel_rate['is_cancelled'] * 100
-        fig2 = px.line(cancel_rate, x='단가_그룹', y='취소율(%)', title="가격대별 취소율 (5-10만원대 급증 확인)", markers=True)
-        st.plotly_chart(fig2, use_container_width=True)
-        
+        with prof.section("EDA/가격대별 취소율", rows=len(filtered_df)):
+            cancel_rate = filtered_df.groupby('단가_그룹', observed=True)['is_cancelled'].mean().reset_index()
+            cancel_rate['취소율(%)'] = cancel_rate['is_cancelled'] * 100
+            out['cancel_rate'] = px.line(cancel_rate, x='단가_그룹', y='취소율(%)', title="가격대별 취소율 (5-10만원대 급증 확인)", markers=True)
+
         # 인기 옵션 (소과 vs 대과 등)
-        fruit_size = filtered_df['과수 크기'].value_counts().head(5).reset_index()
-        st.plotly_chart(px.bar(fruit_size, x='과수 크기', y='count', title="과수 크기별 선호도 (소과/혼합 비중 높음)", color='과수 크기'), use_container_width=True)
+        with prof.section("EDA/과수 크기 선호도", rows=len(filtered_df)):
+            fruit_size = value_counts(filtered_df['과수 크기']).head(5).reset_index()
+            out['fruit_size'] = px.bar(fruit_size, x='과수 크기', y='count', title="과수 크기별 선호도 (소과/혼합 비중 높음)", color='과수 크기')
+
+        # [그래프 5] 상위 10 셀러별 주요 판매 품종 (Stacked Bar)
+        with prof.section("EDA/그래프 5", rows=len(filtered_df)):
+            sellers = seller_tables()
+            top_10_sellers = top_sellers(sellers['profile'], 10)
+            seller_variety_stats = crosstab_rows(sellers['variety'], top_10_sellers, '주문건수')
+            out['fig5'] = px.bar(seller_variety_stats, x='셀러명', y='주문건수', color='품종', 
+                          title="[그래프 5] 상위 10 셀러별 판매 품종 구성", barmode='stack')
+
+        # [그래프 6] 셀러별 주문 대비 취소 비중 (상위 15개 셀러)
+        with prof.section("EDA/그래프 6", rows=len(filtered_df)):
+            top_15_sellers = top_sellers(sellers['profile'], 15)
+            cancel_stats = crosstab_rows(sellers['cancel'], top_15_sellers, '건수')
+            out['fig6'] = px.bar(cancel_stats, x='셀러명', y='건수', color='취소여부', 
+                           title="[그래프 6] 상위 셀러별 주문-취소 비중 (N:정상, Y:취소)", barmode='group')
+
+        # [그래프 7] 결제 수단별 이용 빈도
+        with prof.section("EDA/그래프 7", rows=len(filtered_df)):
+            pay_counts = value_counts(filtered_df['결제방법']).reset_index()
+            out['fig7'] = px.bar(pay_counts, x='count', y='결제방법', orientation='h', 
+                          title="[그래프 7] 결제 수단별 이용 빈도", color='count')
+
+        # [그래프 8] 주문 경로별 평균 객단가
+        with prof.section("EDA/그래프 8", rows=len(filtered_df)):
+            out['fig8'] = box_figure(filtered_df, x='주문경로', y='실결제 금액',
+                          title="[그래프 8] 주문 경로별 결제금액 분포(객단가)", row_limit=CHART_ROWS)
+
+        # [그래프 9] 셀러별 평균 판매단가 비교 (상위 10 셀러)
+        with prof.section("EDA/그래프 9", rows=len(filtered_df)):
+            seller_price = sellers['profile'].loc[top_10_sellers, '평균판매단가'].rename('판매단가').reset_index()
+            out['fig9'] = px.bar(seller_price, x='셀러명', y='판매단가', title="[그래프 9] 상위 10 셀러별 평균 판매단가", text_auto=',.0f')
+
+        # [그래프 10] 판매단가와 주문수량의 상관관계
+        with prof.section("EDA/그래프 10", rows=len(filtered_df)):
+            out['fig10'] = scatter_figure(filtered_df, x='판매단가', y='주문수량', size='실결제 금액', color='감귤 세부',
+                                 hover_data=['상품명', '셀러명'], title="[그래프 10] 판매단가와 주문수량의 상관관계",
+                                 row_limit=CHART_ROWS, mode=SCATTER_MODE)
+        return out
+
+    eda = memoize_section('eda', filter_key, build)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        show_chart(eda['price_vol'])
+        show_chart(eda['inflow'])
+
+    with col2:
+        show_chart(eda['cancel_rate'])
+        show_chart(eda['fruit_size'])
 
     st.divider()
     st.subheader("🎯 셀러 및 유입경로 상세 분석 (심층 그래프)")
@@ -266,46 +419,17 @@ with tabs[2]:
     scol1, scol2 = st.columns(2)
     
     with scol1:
-        # [그래프 5] 상위 10 셀러별 주요 판매 품종 (Stacked Bar)
-        top_10_sellers = filtered_df['셀러명'].value_counts().head(10).index
-        seller_variety_df = filtered_df[filtered_df['셀러명'].isin(top_10_sellers)]
-        seller_variety_stats = seller_variety_df.groupby(['셀러명', '품종']).size().reset_index(name='주문건수')
-        fig5 = px.bar(seller_variety_stats, x='셀러명', y='주문건수', color='품종', 
-                      title="[그래프 5] 상위 10 셀러별 판매 품종 구성", barmode='stack')
-        st.plotly_chart(fig5, use_container_width=True)
-        
-        # [그래프 6] 셀러별 주문 대비 취소 비중 (상위 15개 셀러)
-        top_15_sellers = filtered_df['셀러명'].value_counts().head(15).index
-        cancel_df = filtered_df[filtered_df['셀러명'].isin(top_15_sellers)]
-        cancel_stats = cancel_df.groupby(['셀러명', '취소여부']).size().reset_index(name='건수')
-        fig6 = px.bar(cancel_stats, x='셀러명', y='건수', color='취소여부', 
-                       title="[그래프 6] 상위 셀러별 주문-취소 비중 (N:정상, Y:취소)", barmode='group')
-        st.plotly_chart(fig6, use_container_width=True)
-        
-        # [그래프 7] 결제 수단별 이용 빈도
-        pay_counts = filtered_df['결제방법'].value_counts().reset_index()
-        fig7 = px.bar(pay_counts, x='count', y='결제방법', orientation='h', 
-                      title="[그래프 7] 결제 수단별 이용 빈도", color='count')
-        st.plotly_chart(fig7, use_container_width=True)
+        show_chart(eda['fig5'])
+        show_chart(eda['fig6'])
+        show_chart(eda['fig7'])
 
     with scol2:
-        # [그래프 8] 주문 경로별 평균 객단가
-        fig8 = px.box(filtered_df, x='주문경로', y='실결제 금액', color='주문경로', 
-                      title="[그래프 8] 주문 경로별 결제금액 분포(객단가)")
-        st.plotly_chart(fig8, use_container_width=True)
-        
-        # [그래프 9] 셀러별 평균 판매단가 비교 (상위 10 셀러)
-        seller_price = filtered_df[filtered_df['셀러명'].isin(top_10_sellers)].groupby('셀러명')['판매단가'].mean().reset_index()
-        fig9 = px.bar(seller_price, x='셀러명', y='판매단가', title="[그래프 9] 상위 10 셀러별 평균 판매단가", text_auto=',.0f')
-        st.plotly_chart(fig9, use_container_width=True)
-        
-        # [그래프 10] 판매단가와 주문수량의 상관관계
-        fig10 = px.scatter(filtered_df, x='판매단가', y='주문수량', size='실결제 금액', color='감귤 세부',
-                             hover_data=['상품명', '셀러명'], title="[그래프 10] 판매단가와 주문수량의 상관관계")
-        st.plotly_chart(fig10, use_container_width=True)
+        show_chart(eda['fig8'])
+        show_chart(eda['fig9'])
+        show_chart(eda['fig10'])
 
 # --- Tab 3: 가설 검증 ---
-with tabs[3]:
+def render_hypothesis_tab():
     st.header("💡 심층 가설 검증 결과 (보고서 동기화)")
     
     selected_h = st.selectbox("리포트 가설을 선택하세요:", [
@@ -318,26 +442,28 @@ with tabs[3]:
         "[가설 7/8] 셀러 유입 및 이탈 관리 (채택)",
         "[가설 9] 시간대별 마케팅 성과 차이 분석 (신규)",
         "[가설 10] 첫 구매 고객 전용 이벤트 효율성 (신규)"
-    ])
+    ], key="selected_h")
     
     if "[가설 1]" in selected_h:
         st.subheader("지역별 셀러 점유율 편차 재검증 (의미성 분석)")
         
-        # 지역별 셀러 점유율의 표준편차 계산 (어느 지역이 특정 셀러에 더 편중되어 있는지)
-        seller_region_matrix = filtered_df.groupby(['광역지역(정식)', '셀러명'])['실결제 금액'].sum().unstack(fill_value=0)
-        seller_region_pct = seller_region_matrix.div(seller_region_matrix.sum(axis=1), axis=0) * 100
-        
         # 특정 셀러(예: 킹댕즈)의 지역별 점유율 추이
-        target_seller = "킹댕즈" # 보고서 핵심 셀러
-        if target_seller in seller_region_pct.columns:
-            ts_data = seller_region_pct[target_seller].sort_values(ascending=False).reset_index()
-            ts_data.columns = ['지역', '점유율(%)']
-            
+        target_seller = TARGET_SELLER # 보고서 핵심 셀러
+
+        def build():
+            # 지역별 셀러 점유율 (어느 지역이 특정 셀러에 더 편중되어 있는지)
+            ts_data = check_tables('h1')['share']
+            if ts_data.empty:
+                return None, None
+            fig = px.bar(ts_data, x='지역', y='점유율(%)', color='점유율(%)', 
+                         title=f"'{target_seller}' 셀러의 지역별 점유율 (경기도 편중성 확인)")
+            return ts_data, fig
+
+        ts_data, fig = memoize_section(selected_h, filter_key, build)
+        if ts_data is not None:
             c1, c2 = st.columns([2, 1])
             with c1:
-                fig = px.bar(ts_data, x='지역', y='점유율(%)', color='점유율(%)', 
-                             title=f"'{target_seller}' 셀러의 지역별 점유율 (경기도 편중성 확인)")
-                st.plotly_chart(fig, use_container_width=True)
+                show_chart(fig)
             with c2:
                 st.metric("경기도 내 점유율", f"{ts_data[ts_data['지역']=='경기도']['점유율(%)'].values[0]:.1f}%")
                 st.write("**재검증 결과**: 경기도는 타 지역 대비 특정 셀러의 점유율이 통계적으로 유의미하게 높습니다. 단순 매출 규모가 아닌 '브랜드 선호도'가 지역별로 다르게 형성되어 있음을 의미합니다.")
@@ -345,135 +471,245 @@ with tabs[3]:
             st.warning(f"데이터 내에 '{target_seller}' 셀러 정보가 부족합니다.")
 
     elif "[가설 2]" in selected_h:
-        ev_stats = filtered_df.groupby('is_event_item')['주문수량'].mean().reset_index()
+        def build():
+            ev_stats = check_tables('h2')['stats']
+            return px.bar(ev_stats, x='is_event_item', y='주문수량', color='is_event_item', text_auto='.2f')
+
         st.subheader("이벤트 여부에 따른 평균 주문수량 비교")
-        st.plotly_chart(px.bar(ev_stats, x='is_event_item', y='주문수량', color='is_event_item', text_auto='.2f'), use_container_width=True)
+        show_chart(memoize_section(selected_h, filter_key, build), selected_h)
         st.success("**보고서 결과**: 이벤트 상품 평균 주문수량(1.23개)이 일반 상품(1.08개)보다 약 14% 높음. 구매 결정 가속화 효과 증명.")
 
     elif "[가설 3]" in selected_h:
-        ev_profit = filtered_df.groupby('is_event_item')['순이익률'].mean().reset_index()
-        ev_profit['순이익률(%)'] = ev_profit['순이익률'] * 100
+        def build():
+            ev_profit = check_tables('h3')['stats']
+            return px.bar(ev_profit, x='is_event_item', y='순이익률(%)', color='is_event_item', text_auto='.1f')
         
         st.subheader("이벤트 여부에 따른 순이익률 반전 효과")
-        st.plotly_chart(px.bar(ev_profit, x='is_event_item', y='순이익률(%)', color='is_event_item', text_auto='.1f'), use_container_width=True)
+        show_chart(memoize_section(selected_h, filter_key, build), selected_h)
         st.success("**보고서 통찰**: 이벤트 상품(22.8%)이 일반 상품(15.1%)보다 오히려 수익성이 높음! 혜택이 공급가 절감이나 업셀링으로 이어짐.")
 
     elif "[가설 4]" in selected_h:
+        def build():
+            gift_compare = check_tables('h4')['stats']
+            return px.bar(gift_compare, x='is_gift_item', y='판매단가', color='is_gift_item', text_auto=',.0f')
+
         st.subheader("선물 vs 일반 주문 구매 특성 비교")
-        gift_compare = filtered_df.groupby('is_gift_item')['판매단가'].mean().reset_index()
-        st.plotly_chart(px.bar(gift_compare, x='is_gift_item', y='판매단가', color='is_gift_item', text_auto=',.0f'), use_container_width=True)
+        show_chart(memoize_section(selected_h, filter_key, build), selected_h)
         st.info("**보고서 결과**: 선물용 평균 단가 3.89만원(일반 3.07만원). 선물용은 '대과' 비중(53%)이 압도적임. 프리미엄화 전략 제언.")
 
     elif "[가설 5]" in selected_h:
+        def build():
+            top_r = check_tables('h5')['top']
+            return px.bar(top_r, x='재구매율(%)', y='셀러명', orientation='h', color='재구매율(%)', text_auto='.1f')
+
         st.subheader("셀러별 재구매율 (Fan-base)")
-        reorder_s = filtered_df.groupby('셀러명').agg({'UID':'count', 'is_reorder':'sum'}).reset_index()
-        reorder_s['재구매율(%)'] = (reorder_s['is_reorder'] / reorder_s['UID']) * 100
-        top_r = reorder_s[reorder_s['UID'] >= 50].sort_values('재구매율(%)', ascending=False).head(5)
-        
-        st.plotly_chart(px.bar(top_r, x='재구매율(%)', y='셀러명', orientation='h', color='재구매율(%)', text_auto='.1f'), use_container_width=True)
+        show_chart(memoize_section(selected_h, filter_key, build), selected_h)
         st.warning("**보고서 결과**: '제주농장'의 재구매율이 51.9%로 압도적임. 해당 셀러의 CS/배송 노하우 매뉴얼화 필요.")
 
     elif "[가설 6]" in selected_h:
+        def build():
+            seller_map = check_tables('h6')['map']
+            return px.scatter(seller_map, x='is_event_item', y='is_gift_item', size='주문번호', hover_data=['셀러명'], 
+                              title="셀러별 전략 분포 (이벤트 비중 vs 선물 비중)")
+
         st.subheader("셀러별 전략 포지셔닝 맵")
-        seller_map = filtered_df.groupby('셀러명').agg({
-            'is_event_item': 'mean',
-            'is_gift_item': 'mean',
-            '판매단가': 'mean',
-            '주문번호': 'nunique'
-        }).reset_index()
-        fig = px.scatter(seller_map, x='is_event_item', y='is_gift_item', size='주문번호', hover_data=['셀러명'], 
-                         title="셀러별 전략 분포 (이벤트 비중 vs 선물 비중)")
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(memoize_section(selected_h, filter_key, build), selected_h)
         st.info("**보고서 결과**: 'dapanda'(프리미엄), '천&천'(프로모션) 등 명확한 포지셔닝을 가진 셀러 그룹 식별됨.")
 
     elif "[가설 7/8]" in selected_h:
+        def build():
+            # 기간 필터와 무관하게 전체 이력 기준
+            tables = precomputed('h7_8', (min_date, max_date))
+            if tables is not None:
+                monthly_sellers = tables['monthly']
+            elif PARTITIONED:
+                # 전체 이력은 메모리에 올리지 않고 배치 단위로 (월, 셀러) 고유 조합만 모은다
+                monthly_sellers = store.aggregate([PARTITION_COL], {'셀러명': ('셀러명', 'nunique')})
+                monthly_sellers = monthly_sellers.rename(columns={PARTITION_COL: '월'})
+            else:
+                monthly_sellers = monthly_active_sellers(df)['monthly']
+            return px.line(monthly_sellers, x='월', y='셀러명', title="월별 활동 셀러 수 추이", markers=True)
+
         st.subheader("월별 셀러 활동성 추이")
-        df['월'] = df['주문일'].dt.to_period('M').astype(str)
-        monthly_sellers = df.groupby('월')['셀러명'].nunique().reset_index()
-        st.plotly_chart(px.line(monthly_sellers, x='월', y='셀러명', title="월별 활동 셀러 수 추이", markers=True), use_container_width=True)
+        # 전체 이력 기준이라 필터 상태와 무관하게 한 번만 만든다
+        show_chart(memoize_section(selected_h, (), build), selected_h)
         st.error("**보고서 결과**: 11월 이후 대규모 이탈 발생. 셀러 Retention 관리 및 신규 유입 프로모션 시급.")
 
     elif "[가설 9]" in selected_h:
+        def build():
+            tables = check_tables('h9')
+            time_stats, time_ev = tables['orders'], tables['events']
+            fig_orders = px.bar(time_stats, x='시간대', y='주문수', title="시간대별 주문 건수", color='시간대')
+            # 이벤트 반응도 분석
+            fig_event = px.bar(time_ev, x='시간대_구간', y='주문번호', color='is_event_item', barmode='group', title="시간대별 이벤트 상품 반응도")
+            return fig_orders, fig_event
+
         st.subheader("🕒 시간대별 마케팅 효율성 분석")
-        time_stats = filtered_df.groupby(['시간대_구간']).agg({
-            '주문번호': 'nunique',
-            '실결제 금액': 'sum',
-            '판매단가': 'mean'
-        }).reset_index()
-        time_stats.columns = ['시간대', '주문수', '총매출', '평균단가']
+        fig_orders, fig_event = memoize_section(selected_h, filter_key, build)
         
         c1, c2 = st.columns(2)
         with c1:
-            st.plotly_chart(px.bar(time_stats, x='시간대', y='주문수', title="시간대별 주문 건수", color='시간대'), use_container_width=True)
+            show_chart(fig_orders)
         with c2:
-            # 이벤트 반응도 분석
-            time_ev = filtered_df.groupby(['시간대_구간', 'is_event_item'])['주문번호'].nunique().reset_index()
-            st.plotly_chart(px.bar(time_ev, x='시간대_구간', y='주문번호', color='is_event_item', barmode='group', title="시간대별 이벤트 상품 반응도"), use_container_width=True)
+            show_chart(fig_event)
             
         st.info("**분석 결과**: 특정 시간대(예: 저녁/야간)에 이벤트 상품의 구매 전환이 집중되는지 확인하여 '타임 세일' 전략 수립이 가능합니다.")
 
     elif "[가설 10]" in selected_h:
+        def build():
+            tables = check_tables('h10')
+            first_vs_re, compare_stats = tables['share'], tables['compare']
+            fig_share = px.pie(first_vs_re, values='비중', names='유형', title="전체 주문 중 첫 구매 vs 재구매 비중")
+
+            fig_event = px.bar(compare_stats, x='is_first_purchase', y='is_event_item', title="고객 유형별 이벤트 상품 선택률")
+            return fig_share, fig_event
+
         st.subheader("🆕 첫 구매 고객 vs 재구매 고객 분석")
-        
-        first_vs_re = filtered_df['is_first_purchase'].value_counts(normalize=True).reset_index()
-        first_vs_re.columns = ['유형', '비중']
-        first_vs_re['유형'] = first_vs_re['유형'].map({True: '첫 구매', False: '재구매'})
+        fig_share, fig_event = memoize_section(selected_h, filter_key, build)
         
         c1, c2 = st.columns(2)
         with c1:
-            st.plotly_chart(px.pie(first_vs_re, values='비중', names='유형', title="전체 주문 중 첫 구매 vs 재구매 비중"), use_container_width=True)
+            show_chart(fig_share)
         with c2:
-            compare_stats = filtered_df.groupby('is_first_purchase').agg({
-                '실결제 금액': 'mean',
-                'is_event_item': 'mean'
-            }).reset_index()
-            compare_stats['is_first_purchase'] = compare_stats['is_first_purchase'].map({True: '첫 구매', False: '재구매'})
-            st.plotly_chart(px.bar(compare_stats, x='is_first_purchase', y='is_event_item', title="고객 유형별 이벤트 상품 선택률"), use_container_width=True)
+            show_chart(fig_event)
             
         st.success("**비즈니스 인사이트**: 첫 구매 고객의 비중이 압도적으로 높다면 '입구 상품' 최적화 및 첫 구매 허들을 낮추는 전용 이벤트 배치가 필수적입니다.")
 
 # --- Tab 4: A/B 테스트 실험실 ---
-with tabs[4]:
+AB_CASES = {
+    "A: 고단가(5만원↑) 취소율 방어 테스트": 'ab_a',
+    "B: '이벤트' 키워드의 신뢰도(취소율) 효과": 'ab_b',
+    "C: 가성비 규격(3-5kg)의 복수구매 전환율": 'ab_c',
+}
+
+# 실험군 vs 대조군 차이의 95% 부트스트랩 신뢰구간과 순열 검정 p-value, (케이스, 층화, 필터 상태) 단위로 메모이즈
+def render_ab_significance(check):
+    st.subheader("📐 통계적 유의성 (부트스트랩 / 순열 검정)")
+    stratify = st.toggle("셀러별 층화 (셀러 구성 차이 통제)", key="ab_stratify")
+    test = memoize_section(('ab_test', check, stratify), filter_key, lambda: ab_test(check, filtered_df, stratify))
+    if pd.isna(test['차이']):
+        st.warning("실험군 또는 대조군에 해당하는 주문이 없어 검정할 수 없습니다.")
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric(f"실험군 {test['지표']} ({test['실험군']})", f"{test['실험군 평균'] * 100:.2f}%", help=f"{test['실험군 수']:,}건")
+    c2.metric(f"대조군 {test['지표']} ({test['대조군']})", f"{test['대조군 평균'] * 100:.2f}%", help=f"{test['대조군 수']:,}건")
+    c3.metric("차이 (95% 신뢰구간)", f"{test['차이'] * 100:+.2f}%p",
+              f"{test['신뢰구간 하한'] * 100:+.2f} ~ {test['신뢰구간 상한'] * 100:+.2f}%p", delta_color="off")
+    c4.metric("p-value", f"{test['p-value']:.4f}")
+    verdict = "유의한 차이 (p < 0.05)" if test['p-value'] < 0.05 else "유의하지 않음 (p ≥ 0.05): 채택 근거로 보기 어려움"
+    st.caption(f"판정: **{verdict}** · 재표본 {test['재표본 수']:,}회"
+               + (f" · 셀러별 층화: 양쪽 그룹이 모두 있는 셀러 {test['층 수']:,}곳 안에서 비교한 차이의 가중 평균" if stratify else ""))
+
+def render_ab_tab():
     st.header("🧪 마케팅 A/B 테스트 전략 시뮬레이션")
     st.info("리포트 제언 사항을 기반으로 한 실험군(Test Group) vs 대조군(Control Group) 성과 분석")
     
-    ab_case = st.pills("실험 케이스 선택", [
-        "A: 고단가(5만원↑) 취소율 방어 테스트",
-        "B: '이벤트' 키워드의 신뢰도(취소율) 효과",
-        "C: 가성비 규격(3-5kg)의 복수구매 전환율"
-    ])
+    ab_case = st.pills("실험 케이스 선택", list(AB_CASES), key="ab_case")
     
     if ab_case == "A: 고단가(5만원↑) 취소율 방어 테스트":
+        def build():
+            high_price_df = check_tables('ab_a')['stats']
+            return px.bar(high_price_df, x='단가_그룹', y='취소율(%)', color='단가_그룹', 
+                          title="가격대별 취소 리스크 (보고서: 5만원 이상 27.7%↑)")
+
         st.subheader("고단가 상품의 심리적 저항 확인")
-        high_price_df = filtered_df.groupby('단가_그룹')['is_cancelled'].mean().reset_index()
-        high_price_df['취소율(%)'] = high_price_df['is_cancelled'] * 100
-        fig = px.bar(high_price_df, x='단가_그룹', y='취소율(%)', color='단가_그룹', 
-                     title="가격대별 취소 리스크 (보고서: 5만원 이상 27.7%↑)")
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(memoize_section(ab_case, filter_key, build))
         st.error("**액션 아이디어**: 5만원 이상 고가 상품은 결제 전 '심리적 저항'이 큼. 3-5만원대로 리패키징하거나 사은품을 강조하여 체감 가치를 증대시켜야 함.")
 
     elif ab_case == "B: '이벤트' 키워드의 신뢰도(취소율) 효과":
+        def build():
+            ev_cancel = check_tables('ab_b')['stats']
+            return px.bar(ev_cancel, x='is_event_item', y='취소율(%)', color='is_event_item', title="이벤트 키워드 유무별 취소율")
+
         st.subheader("이벤트 상품의 구매 확정성 분석")
-        ev_cancel = filtered_df.groupby('is_event_item')['is_cancelled'].mean().reset_index()
-        ev_cancel['취소율(%)'] = ev_cancel['is_cancelled'] * 100
-        fig = px.bar(ev_cancel, x='is_event_item', y='취소율(%)', color='is_event_item', title="이벤트 키워드 유무별 취소율")
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(memoize_section(ab_case, filter_key, build))
         st.success("**액션 아이디어**: 이벤트 상품은 취소율이 3.48%로 대조군 대비 매우 낮음. 단순 매출 증대용이 아닌 '구매 신뢰도' 확보 수단으로 활용 가능.")
 
     elif ab_case == "C: 가성비 규격(3-5kg)의 복수구매 전환율":
+        def build():
+            bulk_stats = check_tables('ab_c')['stats']
+            return px.bar(bulk_stats, x='무게 구분', y='복수구매비중(%)', color='복수구매비중(%)', title="상품 규격별 복수 구매 비중")
+
         st.subheader("3-5kg 실속형 규격의 대량 주문(Bulk) 성향")
-        filtered_df['is_bulk'] = filtered_df['주문수량'] >= 2
-        bulk_stats = filtered_df.groupby('무게 구분')['is_bulk'].mean().reset_index()
-        bulk_stats['복수구매비중(%)'] = bulk_stats['is_bulk'] * 100
-        fig = px.bar(bulk_stats, x='무게 구분', y='복수구매비중(%)', color='복수구매비중(%)', title="상품 규격별 복수 구매 비중")
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(memoize_section(ab_case, filter_key, build))
         st.info("**액션 아이디어**: 3-5kg 규격에서 복수 구매가 빈번함. 해당 규격 구매 고객대상으로 '2개 담으면 추가 할인' 쿠폰 발행 시 업셀링 효과 극대화 예상.")
 
+    if ab_case:
+        render_ab_significance(AB_CASES[ab_case])
+
 # --- Tab 5: 데이터 ---
-with tabs[5]:
+def render_data_tab():
     st.header("상세 데이터 조회")
-    st.dataframe(filtered_df, use_container_width=True)
-    st.download_button("📥 필터링된 데이터 CSV 다운로드", filtered_df.to_csv(index=False).encode('utf-8-sig'), "filtered.csv", "text/csv")
+    total = len(filtered_df)
+    c1, c2, c3, c4 = st.columns([3, 1, 1, 1])
+    sort_col = c1.selectbox("정렬 기준", [None] + list(filtered_df.columns), key="grid_sort",
+                            format_func=lambda col: "(기본 순서)" if col is None else col)
+    descending = c2.toggle("내림차순", key="grid_desc")
+    page_size = c3.selectbox("페이지당 행 수", PAGE_SIZES, key="grid_page_size")
+    pages = max(1, -(-total // page_size))
+    # 필터가 바뀌어 페이지 수가 줄면 마지막 페이지로 맞춘다
+    if st.session_state.get("grid_page", 1) > pages:
+        st.session_state["grid_page"] = pages
+    page = c4.number_input(f"페이지 (/{pages:,})", min_value=1, max_value=pages, step=1, key="grid_page")
+
+    # 정렬 순서(행 위치)만 필터 상태별로 메모이즈하고, 표에는 현재 페이지 행만 넘긴다
+    positions = memoize_section(('grid', sort_col, descending), filter_key,
+                                lambda: sort_positions(filtered_df, sort_col, ascending=not descending))
+    window = page_rows(filtered_df, positions, page - 1, page_size)
+    with prof.section("데이터 표", 'render', rows=len(window)):
+        st.dataframe(window, use_container_width=True)
+    start = (page - 1) * page_size
+    st.caption(f"총 {total:,}건 중 {min(start + 1, total):,}–{start + len(window):,}행")
+
+    # 내보내기 파일은 버튼을 누를 때만 만든다 (누른 시점이 아니라 지금의 필터 결과로 고정)
+    fmt = st.radio("내보내기 형식", list(EXPORT_FORMATS), key="export_format", horizontal=True,
+                   format_func=lambda key: EXPORT_FORMATS[key][0])
+    label, ext, mime = EXPORT_FORMATS[fmt]
+    st.download_button(f"📥 필터링된 데이터 {label} 다운로드", partial(export_file, filtered_df, fmt),
+                       f"filtered.{ext}", mime, on_click="ignore")
+
+# 선택된 탭(지연 모드) 또는 모든 탭을 렌더링
+TAB_RENDERERS = [render_strategy_tab, render_trend_tab, render_eda_tab, render_hypothesis_tab, render_ab_tab, render_data_tab]
+for tab, render in zip(tabs, TAB_RENDERERS):
+    if tab is not None:
+        with tab:
+            render()
+
+# --- 프로파일러 패널 (계측 모드) ---
+def render_profiler():
+    cache_stats = figure_cache.stats()
+    log_path = prof.write_log({
+        'backend': 'partitioned' if PARTITIONED else 'memory',
+        'data_version': data_version,
+        'reloads': watcher.reloads,
+        'date_range': [str(day) for day in date_range],
+        'keywords': keyword_input,
+        'tab': active_tab if LAZY_TABS else 'all',
+        'rows': len(filtered_df),
+        'figure_cache': cache_stats,
+    })
+    table = prof.table()
+    with st.expander("🔬 프로파일러 (이번 실행)", expanded=True):
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("전체 실행 시간", f"{prof.elapsed() * 1000:,.0f} ms")
+        c2.metric("계측 구간 수", f"{len(table)}개")
+        c3.metric("그래프 JSON 합계", f"{table['figure_kb'].sum():,.1f} KB")
+        hit_rate = cache_stats['hit_rate']
+        c4.metric("그래프 캐시 적중률", "-" if hit_rate is None else f"{hit_rate * 100:.1f}%",
+                  help=f"적중 {cache_stats['hits']:,} / 미적중 {cache_stats['misses']:,} / 밀려남 {cache_stats['evictions']:,} · "
+                       f"{cache_stats['entries']:,}개 항목, {cache_stats['bytes'] / 2**20:,.1f} / {cache_stats['max_bytes'] / 2**20:,.0f} MB")
+        st.dataframe(table[['section', 'phase', 'ms', 'rows', 'figure_kb', 'cached', 'parent']], hide_index=True,
+                     use_container_width=True, column_config={
+                         'section': "구간", 'phase': "단계", 'parent': "상위 구간", 'cached': "캐시 적중",
+                         'ms': st.column_config.NumberColumn("시간 (ms)", format="%.1f"),
+                         'rows': st.column_config.NumberColumn("행 수", format="%d"),
+                         'figure_kb': st.column_config.NumberColumn("그래프 JSON (KB)", format="%.1f"),
+                     })
+        st.caption(f"열 제목을 눌러 정렬할 수 있습니다. 실행 로그: {log_path}")
+
+if prof.enabled:
+    render_profiler()
 
 # 푸터
 st.markdown("---")
@@ -0,0 +1,344 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# 원본 주문 데이터 (스크립트 파일 위치 기준)
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(BASE_PATH, "preprocessed_data_20260131.csv")
+
+# 파생 컬럼 로직이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_VERSION = 5
+
+NUM_COLS = ['결제금액', '주문취소 금액', '실결제 금액', '판매단가', '공급단가', '주문수량', '취소수량', '주문-취소 수량']
+
+
+# --- 파생 컬럼 규칙 ---
+EVENT_KEYWORDS = '1\\+1|증정|추가발송|이벤트|특가|한정|폭탄'
+GIFT_KEYWORDS = '선물|포장|선물세트|선물용'
+
+# 구간은 [하한, 상한) 이며, 값이 없거나 범위를 벗어나면 마지막 구간으로 보낸다 (기존 if/elif 규칙과 동일)
+PRICE_BINS = [-np.inf, 10000, 30000, 50000, 100000, np.inf]
+PRICE_LABELS = ['1만원 미만', '1-3만원대', '3-5만원대', '5-10만원대', '10만원 이상']
+TIME_BINS = [0, 6, 12, 18, 21, 24]
+TIME_LABELS = ['새벽 (00-06)', '오전 (06-12)', '오후 (12-18)', '저녁 (18-21)', '야간 (21-24)']
+
+
+def bucketize(values, bins, labels):
+    codes = np.searchsorted(bins, values.to_numpy(dtype=float), side='right') - 1
+    codes[(codes < 0) | (codes >= len(labels))] = len(labels) - 1
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def match_keywords(values, pattern):
+    # 상품명은 반복이 많으므로 고유값에만 정규식을 돌리고 코드로 행에 다시 펼친다
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return np.zeros(len(values), dtype=bool)
+    hits = pd.Series(uniques).str.contains(pattern, na=False).to_numpy(dtype=bool)
+    return np.where(codes >= 0, hits[codes], False)
+
+
+# --- 메모리 절약형 스키마 ---
+# 반복이 많은 텍스트는 사전 인코딩(범주형), Y/N 플래그는 bool, 금액/수량은 손실 없을 때만 int32 로 줄인다.
+# 범주형 카테고리는 사전순이라 groupby 정렬 순서가 object 컬럼일 때와 같다.
+# 취소여부는 그래프에서 Y/N 라벨로 쓰이므로 bool 대신 범주형으로 둔다.
+CATEGORY_COLS = ['셀러명', '상품명', '품종', '감귤 세부', '주문경로', '결제방법', '광역지역(정식)',
+                 '과수 크기', '무게 구분', '요일', '취소여부', '선물세트_여부']
+LABEL_FLAG_COLS = ['취소여부']
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def _is_yn_flag(values):
+    return values.dtype == 'object' and values.notna().all() and set(values.unique()) <= {'Y', 'N'}
+
+
+def _int32_lossless(values):
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values) or values.isna().any():
+        return False
+    arr = values.to_numpy()
+    if len(arr) == 0:
+        return True
+    return bool((arr == np.round(arr)).all() and arr.min() >= INT32_MIN and arr.max() <= INT32_MAX)
+
+
+# 컬럼별 변환 방식: 'category' / 'flag' / 'int32'
+# 청크별 계획을 merge_compact_plan 으로 합치면 전체 테이블로 세운 계획과 같다.
+def compact_plan(df):
+    plan = {}
+    for col in df.columns:
+        values = df[col]
+        if col in CATEGORY_COLS and values.dtype == 'object':
+            plan[col] = 'category'
+        elif col not in LABEL_FLAG_COLS and _is_yn_flag(values):
+            plan[col] = 'flag'
+        elif col in NUM_COLS and values.dtype != np.int32 and _int32_lossless(values):
+            plan[col] = 'int32'
+    return plan
+
+
+def merge_compact_plan(a, b):
+    if a is None or b is None:
+        return a if b is None else b
+    # 범주형은 한쪽만 object 여도 유지, flag/int32 는 모든 청크에서 손실이 없을 때만 유지
+    return {col: kind for col, kind in {**b, **a}.items()
+            if kind == 'category' or (a.get(col) == kind and b.get(col) == kind)}
+
+
+def compact_orders(df, plan=None):
+    plan = compact_plan(df) if plan is None else plan
+    df = df.copy()
+    for col, kind in plan.items():
+        if col not in df.columns:
+            continue
+        if kind == 'category':
+            df[col] = df[col].astype('category')
+        elif kind == 'flag' and df[col].dtype == 'object':
+            df[col] = df[col] == 'Y'
+        elif kind == 'int32':
+            df[col] = df[col].astype(np.int32)
+    return df
+
+
+def memory_report(before, after):
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'bytes_before': before.memory_usage(index=False, deep=True),
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_after': after.memory_usage(index=False, deep=True),
+    })
+    report.loc['(합계)'] = ['', report['bytes_before'].sum(), '', report['bytes_after'].sum()]
+    report['절감률(%)'] = (1 - report['bytes_after'] / report['bytes_before']) * 100
+    return report
+
+
+# 범주형 컬럼에서도 object 컬럼의 value_counts 와 같은 결과를 돌려준다
+# (관측된 값만, 같은 빈도는 처음 등장한 순서를 기준으로 같은 방식으로 정렬)
+def value_counts(values):
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    index = pd.Index(np.asarray(uniques, dtype=object), name=values.name)
+    return pd.Series(counts, index=index, name='count').sort_values(ascending=False)
+
+
+# --- 전처리 (CSV -> 파생 컬럼이 모두 포함된 주문 테이블) ---
+# 행 단위로 계산되는 파생 컬럼 (청크 단위로 나눠 처리해도 결과가 같다)
+def derive_order_columns(df):
+    # 날짜 처리
+    df['주문일'] = pd.to_datetime(df['주문일'])
+    df['주문일자'] = df['주문일'].dt.date
+    df['요일'] = df['주문일'].dt.day_name()
+    df['시간대'] = df['주문일'].dt.hour
+
+    # 숫자 변환
+    for col in NUM_COLS:
+        if col in df.columns:
+            if df[col].dtype == 'object':
+                df[col] = df[col].str.replace(',', '').astype(float)
+            else:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # --- 보고서 기반 파생 변수 및 그룹화 ---
+    # 1. 이벤트/선물 키워드 (보고서 기준 정교화)
+    df['is_event_item'] = match_keywords(df['상품명'], EVENT_KEYWORDS) | (df['이벤트 여부'] == 'Y').to_numpy()
+    df['is_gift_item'] = match_keywords(df['상품명'], GIFT_KEYWORDS) | match_keywords(df['선물세트_여부'], '선물|세트')
+
+    # 2. 가격대 그룹 (보고서 기준: 1-3만원, 3-5만원, 5-10만원 등)
+    df['단가_그룹'] = bucketize(df['판매단가'], PRICE_BINS, PRICE_LABELS)
+
+    # 3. 순이익 계산 (수수료 10% 가정)
+    fee_rate = 0.1
+    df['순이익'] = df['실결제 금액'] - df['공급단가'].fillna(0) - (df['실결제 금액'] * fee_rate)
+    df['순이익률'] = (df['순이익'] / df['실결제 금액']).replace([np.inf, -np.inf], 0).fillna(0)
+
+    # 5. 시간대 구간화 (가설 9용)
+    df['시간대_구간'] = bucketize(df['시간대'], TIME_BINS, TIME_LABELS)
+
+    df['is_cancelled'] = df['취소여부'] == 'Y'
+    return df
+
+
+# 4. 재구매 및 첫 구매 정보는 전체 이력이 필요하므로 고객 상태 테이블로 따로 관리한다
+#   - first_dates : UID별 가장 빠른 주문일자
+#   - orders      : (셀러명, UID, 주문번호) 고유 조합 -> 셀러별 재구매 여부
+# 상태는 합칠 수 있어서 청크/일자별 데이터를 나눠 처리한 뒤 merge_customer_state 로 모으면 된다.
+# 재구매 여부는 주문번호가 2개 이상인지만 보므로 (셀러명, UID) 마다 주문번호를 REORDER_KEEP 개까지만 남긴다
+# (상태 크기가 주문 이력이 아니라 고객 수에 비례한다).
+CUSTOMER_KEYS = ['셀러명', 'UID', '주문번호']
+REORDER_KEEP = 2
+
+
+def _cap_orders(orders):
+    return orders[orders.groupby(['셀러명', 'UID']).cumcount() < REORDER_KEEP].reset_index(drop=True)
+
+
+def customer_state(df):
+    if 'UID' not in df.columns:
+        return None
+    first_dates = df.groupby('UID', observed=True)['주문일자'].min()
+    orders = df[CUSTOMER_KEYS].dropna().drop_duplicates(ignore_index=True)
+    for col in CUSTOMER_KEYS:
+        orders[col] = orders[col].astype(object)
+    return first_dates, _cap_orders(orders)
+
+
+def merge_customer_state(a, b):
+    if a is None or b is None:
+        return a if b is None else b
+    first_dates = pd.concat([a[0], b[0]]).groupby(level=0).min()
+    orders = pd.concat([a[1], b[1]], ignore_index=True).drop_duplicates(ignore_index=True)
+    return first_dates, _cap_orders(orders)
+
+
+def apply_customer_state(df, state):
+    if state is None:
+        df['is_reorder'] = False
+        df['is_first_purchase'] = True
+        return df
+    first_dates, orders = state
+    # 셀러별 재구매 여부 (가설 5용): 같은 셀러에서 서로 다른 주문번호가 2개 이상
+    order_counts = orders.groupby(['셀러명', 'UID']).size()
+    pair_keys = pd.MultiIndex.from_arrays([df['셀러명'].astype(object), df['UID'].astype(object)])
+    df['is_reorder'] = order_counts.reindex(pair_keys).to_numpy() > 1
+    # 고객사 전체 기준 첫 구매 여부 (가설 10용)
+    df['first_order_date'] = df['UID'].map(first_dates).astype(object)
+    df['is_first_purchase'] = df['주문일자'] == df['first_order_date']
+    return df
+
+
+def preprocess_orders(df, compact=True):
+    df = derive_order_columns(df)
+    apply_customer_state(df, customer_state(df))
+
+    if compact:
+        df = compact_orders(df)
+
+    # 날짜 범위 필터가 이진 탐색으로 구간을 자를 수 있도록 주문일 순으로 정렬해 둔다
+    return df.sort_values('주문일', kind='stable', ignore_index=True)
+
+
+def build_orders(file_path=DATA_FILE, compact=True):
+    return preprocess_orders(pd.read_csv(file_path), compact)
+
+
+# --- 컬럼형 스냅샷 (Parquet) ---
+# 전처리가 끝난 테이블을 CSV 옆에 Parquet로 한 번만 저장해 두고,
+# 원본 CSV의 mtime/크기/해시가 바뀌었을 때만 다시 만든다.
+def snapshot_path(file_path=DATA_FILE):
+    return os.path.splitext(file_path)[0] + ".parquet"
+
+
+def _meta_path(file_path):
+    return snapshot_path(file_path) + ".meta.json"
+
+
+def _file_hash(file_path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _read_meta(file_path):
+    try:
+        with open(_meta_path(file_path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(file_path, meta):
+    tmp = _meta_path(file_path) + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp, _meta_path(file_path))
+
+
+def snapshot_is_fresh(file_path=DATA_FILE):
+    meta = _read_meta(file_path)
+    if meta is None or meta.get('version') != SNAPSHOT_VERSION or not os.path.exists(snapshot_path(file_path)):
+        return False
+    st = os.stat(file_path)
+    if meta.get('mtime_ns') == st.st_mtime_ns and meta.get('size') == st.st_size:
+        return True
+    # mtime만 바뀌고 내용이 같으면(복사/touch) 해시로 확인 후 메타만 갱신
+    if meta.get('size') == st.st_size and meta.get('sha256') == _file_hash(file_path):
+        meta['mtime_ns'] = st.st_mtime_ns
+        _write_meta(file_path, meta)
+        return True
+    return False
+
+
+# 원본 CSV 의 지문 (mtime, 크기, 해시)
+# 스냅샷 메타에는 CSV를 읽기 전에 잰 지문을 남긴다. 읽는 동안 CSV가 바뀌면 메타가 새 파일과 맞지 않으므로
+# 다음 로드에서 다시 만든다 (읽고 나서 재면 옛 데이터에 새 파일의 지문이 붙어 계속 신선하다고 판단된다).
+def source_fingerprint(file_path=DATA_FILE):
+    st = os.stat(file_path)
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': _file_hash(file_path)}
+
+
+def write_snapshot(df, file_path=DATA_FILE, fingerprint=None):
+    fingerprint = fingerprint or source_fingerprint(file_path)
+    target = snapshot_path(file_path)
+    tmp = target + ".tmp"
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, tmp, compression='zstd')
+    os.replace(tmp, target)
+    _write_meta(file_path, {'version': SNAPSHOT_VERSION, **fingerprint, 'rows': len(df)})
+
+
+def read_snapshot(file_path=DATA_FILE):
+    table = pq.read_table(snapshot_path(file_path), memory_map=True)
+    # 컬럼마다 블록을 나눠 받으면 Arrow 버퍼를 가능한 한 복사 없이 넘겨받고, 변환 중 테이블 메모리를 바로 해제한다
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def load_orders(file_path=DATA_FILE, use_snapshot=True):
+    if use_snapshot and snapshot_is_fresh(file_path):
+        return read_snapshot(file_path)
+
+    fingerprint = source_fingerprint(file_path) if use_snapshot else None
+    df = build_orders(file_path)
+    if use_snapshot:
+        try:
+            write_snapshot(df, file_path, fingerprint)
+        except (OSError, pa.ArrowException):
+            # 혼합 타입 컬럼 등으로 저장이 안 되면 스냅샷 없이 진행
+            pass
+    return df
+
+
+# --- 세션 간 공유 데이터셋 ---
+# 모든 세션이 같은 DataFrame 을 참조하는 읽기 전용 핸들.
+# 화면별 파생 컬럼은 별도 결과로 만들고 df 자체에는 컬럼을 추가하거나 값을 바꾸지 않는다.
+class OrderDataset:
+    def __init__(self, df, version):
+        self.df = df
+        self.version = version
+
+
+def dataset_version(file_path=DATA_FILE):
+    st = os.stat(file_path)
+    meta = _read_meta(file_path)
+    if meta and meta.get('mtime_ns') == st.st_mtime_ns and meta.get('size') == st.st_size:
+        return f"{meta['version']}-{meta['sha256'][:12]}"
+    return f"{SNAPSHOT_VERSION}-{st.st_mtime_ns}-{st.st_size}"
+
+
+def load_dataset(file_path=DATA_FILE):
+    df = load_orders(file_path)
+    return OrderDataset(df, dataset_version(file_path))
+
+
+if __name__ == '__main__':
+    # 컬럼별 메모리 사용량 비교: python data_loader.py [CSV 경로]
+    import sys
+    source = sys.argv[1] if len(sys.argv) > 1 else DATA_FILE
+    raw = build_orders(source, compact=False)
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 200):
+        print(memory_report(raw, compact_orders(raw)))
@@ -0,0 +1,68 @@
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# --- 데이터 탭: 페이지 단위 표 + 요청 시 내보내기 ---
+# 표는 정렬된 행 위치만 한 번 계산해 두고 현재 페이지 구간만 잘라서 그린다.
+# 내보내기는 다운로드 버튼을 누를 때만 만든다. 청크 단위로 메모리 버퍼에 인코딩해 쓰므로
+# 전체 CSV 문자열을 따로 만들지 않지만, st.download_button 이 결과 바이트를 통째로 받으므로 완성된 파일은 메모리에 한 번 올라간다.
+PAGE_SIZES = [50, 100, 500, 1000]
+EXPORT_CHUNK_ROWS = 50_000
+
+# 형식 -> (라벨, 파일 확장자, MIME)
+EXPORT_FORMATS = {
+    'csv.gz': ('CSV (gzip)', 'csv.gz', 'application/gzip'),
+    'parquet': ('Parquet', 'parquet', 'application/vnd.apache.parquet'),
+    'csv': ('CSV', 'csv', 'text/csv'),
+}
+
+
+# 정렬 기준 컬럼에 대한 행 위치 (값이 없는 행은 맨 뒤, 같은 값은 원래 순서 유지)
+def sort_positions(df, col=None, ascending=True):
+    if col is None:
+        return None
+    values = df[col].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+
+def page_rows(df, positions, page, page_size):
+    start = page * page_size
+    if positions is None:
+        return df.iloc[start:start + page_size]
+    return df.iloc[positions[start:start + page_size]]
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    # 엑셀에서 한글이 깨지지 않도록 BOM 을 한 번만 붙인다 (기존 utf-8-sig 다운로드와 동일)
+    out.write('\ufeff'.encode('utf-8'))
+    if len(df) == 0:
+        out.write(df.to_csv(index=False).encode('utf-8'))
+    for start, chunk in _chunks(df, chunk_rows):
+        out.write(chunk.to_csv(index=False, header=start == 0).encode('utf-8'))
+
+
+def write_parquet(df, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(out, schema, compression='zstd') as writer:
+        for _, chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+# st.download_button 이 받는 형식(bytes)으로 돌려준다
+def export_file(df, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    out = io.BytesIO()
+    if fmt == 'parquet':
+        write_parquet(df, out, chunk_rows)
+    elif fmt == 'csv.gz':
+        with gzip.GzipFile(fileobj=out, mode='wb', mtime=0) as gz:
+            write_csv(df, gz, chunk_rows)
+    else:
+        write_csv(df, out, chunk_rows)
+    return out.getvalue()
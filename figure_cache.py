@@ -0,0 +1,115 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from plotly.basedatatypes import BaseFigure
+
+from profiler import figure_bytes
+
+# --- 완성된 그래프 캐시 (세션 간 공유) ---
+# 섹션 결과(그래프, 집계 표)를 (그래프 식별자, 정규화된 필터 상태, 데이터 버전) 키로 보관해
+# 같은 기간·검색어를 다시 보면 집계도 그래프 생성도 하지 않고 바로 그린다.
+# 항목 크기는 그래프는 브라우저로 보내는 JSON 바이트, 표는 deep 메모리 사용량으로 잰다.
+# 크기 합이 max_bytes 를 넘으면 가장 오래 쓰지 않은 항목부터 버린다.
+# 꺼낸 값은 여러 세션이 함께 쓰므로 읽기 전용으로 다룬다 (st.plotly_chart 는 그래프를 복사해서 보낸다).
+MAX_BYTES = 256 << 20
+
+
+# 같은 결과를 내는 필터 상태를 같은 키로 모은다
+#   기간 : 데이터 범위 밖은 잘라낸다 (전체 범위보다 넓게 고른 기간 = 전체 범위)
+#   검색어 : 묶음 안의 AND 단어와 OR 묶음의 순서·중복은 결과에 영향이 없으므로 정렬해 중복 제거
+def filter_state(date_range, keywords, bounds=None):
+    start, end = date_range[0], date_range[1]
+    if bounds is not None:
+        start, end = max(start, bounds[0]), min(end, bounds[1])
+    groups = sorted({tuple(sorted(set(terms))) for terms in keywords})
+    return (start, end, tuple(groups))
+
+
+# 캐시 키: 데이터 버전이 바뀌면 (핫 리로드로 새 세대가 들어오면) 같은 필터 상태라도 다시 만든다
+def section_key(section, state, version):
+    return (section, state, version)
+
+
+def estimate_bytes(value):
+    if isinstance(value, BaseFigure):
+        return figure_bytes(value)
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class FigureCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, value, size=None):
+        size = estimate_bytes(value) if size is None else size
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            # 캐시 전체보다 큰 결과는 보관하지 않는다 (다른 항목을 모두 밀어내지 않도록)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    # 캐시에 있으면 (값, True), 없으면 build() 결과를 넣고 (값, False)
+    # 같은 키를 두 세션이 동시에 처음 요청하면 둘 다 만들고 나중 결과가 남는다 (잠금은 사전 조작에만 건다)
+    def get_or_build(self, key, build):
+        entry = self.get(key)
+        if entry is not None:
+            return entry[0], True
+        value = build()
+        self.put(key, value)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else None,
+        }
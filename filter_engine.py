@@ -0,0 +1,128 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+
+# --- 상품명 키워드 질의 ---
+# "감귤, 한라봉 & 선물" -> [['감귤'], ['한라봉', '선물']]
+# 쉼표로 나눈 묶음끼리는 OR, 묶음 안의 & 는 AND (대소문자 무시)
+def parse_keywords(text):
+    groups = []
+    for part in text.split(','):
+        terms = [t.strip().lower() for t in part.split('&') if t.strip()]
+        if terms:
+            groups.append(terms)
+    return groups
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+# 고유 상품명에 대한 글자 n-gram 역색인 (1-gram, 2-gram)
+# 검색어의 n-gram 포스팅을 교집합해 후보 상품명을 줄인 뒤, 후보에만 부분 문자열 검사를 한다.
+class KeywordIndex:
+    def __init__(self, names):
+        self.names = list(names)
+        self._lower = [str(name).lower() for name in self.names]
+        postings = defaultdict(set)
+        for i, name in enumerate(self._lower):
+            for n in (1, 2):
+                for gram in _grams(name, n):
+                    postings[gram].add(i)
+        self._postings = dict(postings)
+
+    def match_term(self, term):
+        grams = _grams(term, 2) or _grams(term, 1)
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            hits = self._postings.get(gram)
+            if not hits:
+                return set()
+            candidates = set(hits) if candidates is None else candidates & hits
+        return {i for i in candidates if term in self._lower[i]}
+
+    # OR-of-AND 질의 -> 일치하는 상품명 목록
+    def match(self, groups):
+        matched = set()
+        for terms in groups:
+            ids = None
+            for term in terms:
+                ids = self.match_term(term) if ids is None else ids & self.match_term(term)
+                if not ids:
+                    break
+            matched |= ids or set()
+        return [self.names[i] for i in sorted(matched)]
+
+
+# --- 주문 테이블 필터 엔진 ---
+# 주문 테이블은 주문일 기준으로 정렬되어 있다고 보고(아니면 여기서 정렬),
+# 날짜 범위는 datetime64 키에 대한 이진 탐색으로 [lo, hi) 행 구간을 찾아 복사 없이 잘라낸다.
+# 셀러/지역/결제방법 같은 값 필터는 컬럼별로 "값 -> 정렬된 행 위치" 색인을 처음 쓸 때 한 번 만들어 재사용한다.
+class OrderFilter:
+    def __init__(self, df, date_col='주문일'):
+        if not df[date_col].is_monotonic_increasing:
+            df = df.sort_values(date_col, kind='stable', ignore_index=True)
+        self.df = df
+        self.date_col = date_col
+        self._dates = df[date_col].to_numpy(dtype='datetime64[ns]')
+        self._value_index = {}
+        self._keyword_index = {}
+
+    # 날짜 범위 (시작일, 종료일 포함) -> 행 구간
+    def date_bounds(self, date_range=None):
+        if date_range is None:
+            return 0, len(self.df)
+        start = np.datetime64(pd.Timestamp(date_range[0]).normalize())
+        end = np.datetime64(pd.Timestamp(date_range[1]).normalize()) + ONE_DAY
+        lo = int(np.searchsorted(self._dates, start, side='left'))
+        hi = int(np.searchsorted(self._dates, end, side='left'))
+        return lo, max(lo, hi)
+
+    # 컬럼 값별 행 위치 색인 (값마다 오름차순 정렬된 위치 배열)
+    def value_index(self, col):
+        if col not in self._value_index:
+            codes, uniques = pd.factorize(self.df[col])
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            order = order[(codes < 0).sum():]
+            self._value_index[col] = dict(zip(uniques, np.split(order, np.cumsum(counts)[:-1])))
+        return self._value_index[col]
+
+    def value_positions(self, col, values, bounds=None):
+        index = self.value_index(col)
+        parts = [index[v] for v in values if v in index]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        positions = parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+        if bounds is not None:
+            lo, hi = bounds
+            positions = positions[np.searchsorted(positions, lo):np.searchsorted(positions, hi)]
+        return positions
+
+    # 텍스트 컬럼의 키워드 역색인 (값 색인의 고유값 위에 만든다)
+    def keyword_index(self, col='상품명'):
+        if col not in self._keyword_index:
+            self._keyword_index[col] = KeywordIndex(self.value_index(col).keys())
+        return self._keyword_index[col]
+
+    def keyword_positions(self, groups, bounds=None, col='상품명'):
+        return self.value_positions(col, self.keyword_index(col).match(groups), bounds)
+
+    # 날짜 범위 + 컬럼별 값 필터 (같은 컬럼 안은 OR, 컬럼끼리는 AND) + 상품명 키워드
+    def select(self, date_range=None, filters=None, keywords=None):
+        lo, hi = self.date_bounds(date_range)
+        filters = {col: values for col, values in (filters or {}).items() if values}
+        if not filters and not keywords:
+            return self.df.iloc[lo:hi]
+
+        sources = [self.value_positions(col, values, (lo, hi)) for col, values in filters.items()]
+        if keywords:
+            sources.append(self.keyword_positions(keywords, (lo, hi)))
+        positions = sources[0]
+        for other in sources[1:]:
+            positions = np.intersect1d(positions, other, assume_unique=True)
+        return self.df.iloc[positions]
@@ -0,0 +1,151 @@
+import itertools
+import os
+import shutil
+import threading
+import weakref
+from datetime import datetime, timedelta
+
+from data_loader import DATA_FILE, load_dataset
+from filter_engine import OrderFilter
+from order_store import open_store, snapshot_store, snapshots_dir, store_path
+from rollup import build_daily_rollup, build_product_rollup
+
+# --- 데이터 자동 갱신 (핫 리로드) ---
+# 백그라운드 스레드가 원본 파일들의 (mtime, 크기) 서명을 주기적으로 확인하고, 바뀌면
+# 새 세대(데이터셋 + 롤업 큐브 + 필터 색인)를 만들고 warm 으로 기본 기간 집계까지 채운 뒤 current 참조 하나만 바꿔 끼운다.
+# 화면은 실행마다 current 를 한 번 읽어 끝까지 같은 세대를 쓰므로 반쯤 바뀐 데이터나 빈 캐시를 보지 않는다.
+# 세대는 자신을 만든 입력의 서명(signature)을 들고 있고, 감시 스레드는 그 서명과 지금 서명을 비교한다
+# (원본 서명은 읽기 전에 재므로, 만드는 동안 원본이 또 바뀌면 다음 확인에서 다시 만든다).
+# 파일을 쓰는 중일 수 있으므로 서명이 한 주기 동안 그대로일 때 다시 만들고,
+# 새 파일을 읽다 실패하면 기존 세대를 계속 쓰면서 last_error 에 남긴다 (같은 서명으로는 재시도하지 않는다).
+# poll_seconds 가 0 이하이거나 지켜볼 파일이 없으면 감시 스레드를 띄우지 않는다 (reload() 로 직접 갱신).
+POLL_SECONDS = 5.0
+STORE_META = "_meta.json"
+
+_generation_ids = itertools.count()
+
+
+def file_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+# 메모리 모드 한 세대: 공유 데이터셋 + 주문일 정렬/키워드 색인 필터 엔진 + 트렌드 탭 롤업 큐브
+class MemoryGeneration:
+    def __init__(self, file_path=DATA_FILE):
+        self.signature = file_signature(watched_paths(file_path))
+        self.dataset = load_dataset(file_path)
+        self.version = self.dataset.version
+        self.order_filter = OrderFilter(self.dataset.df)
+        self.order_filter.keyword_index('상품명')
+        self.daily_cube = build_daily_rollup(self.dataset.df)
+        self.product_cube = build_product_rollup(self.dataset.df)
+        dates = self.dataset.df['주문일자']
+        self.min_date, self.max_date = dates.min(), dates.max()
+        self.default_range = (self.min_date, self.max_date)
+        self.loaded_at = datetime.now()
+
+
+# 파티션 모드 한 세대: 저장소 (원본이 바뀌었으면 다시 만든다) 의 세대 전용 스냅샷 + 롤업 큐브 + 기본 기간 필터 엔진
+# 저장소를 다시 만들거나 일별 파일을 추가해도 이 세대는 자기 스냅샷만 읽으므로, 바꿔 끼운 뒤에도 이전 세대로
+# 그리던 실행은 끝까지 같은 데이터를 읽는다. 스냅샷은 세대 객체가 더 이상 참조되지 않을 때(또는 종료 시) 지운다.
+class StoreGeneration:
+    def __init__(self, file_path=DATA_FILE, root=None, default_days=90):
+        root = root or store_path(file_path)
+        source_signature = file_signature([file_path])
+        open_store(file_path, root)
+        self.path = os.path.join(snapshots_dir(root), f"{os.getpid()}-{next(_generation_ids)}")
+        weakref.finalize(self, shutil.rmtree, self.path, True)
+        self.store = snapshot_store(root, self.path)
+        # 저장소 메타는 만드는 동안 직접 다시 쓰므로, 스냅샷에 들어간 메타(하드 링크라 같은 파일)의 서명을 기준으로 삼는다
+        meta_signature = file_signature([os.path.join(self.path, STORE_META)])[0][1:]
+        self.signature = source_signature + ((os.path.join(root, STORE_META),) + meta_signature,)
+        self.version = self.store.version
+        self.daily_cube, self.product_cube = self.store.rollups()
+        self.min_date, self.max_date = self.store.date_bounds()
+        self.default_range = (max(self.min_date, self.max_date - timedelta(days=default_days - 1)), self.max_date)
+        self._default_filter = self.read_period(self.default_range)
+        self.loaded_at = datetime.now()
+
+    def read_period(self, date_range):
+        order_filter = OrderFilter(self.store.read(date_range))
+        order_filter.keyword_index('상품명')
+        return order_filter
+
+    # 기본 기간은 미리 읽어 둔 필터 엔진, 다른 기간은 None (호출하는 쪽이 read_period 결과를 캐시한다)
+    def period_filter(self, date_range):
+        if tuple(date_range) == self.default_range:
+            return self._default_filter
+        return None
+
+
+# 세대별로 지켜볼 파일: 원본 CSV (+ 파티션 모드는 일별 파일 추가 시 바뀌는 저장소 메타)
+def watched_paths(file_path=DATA_FILE, root=None, partitioned=False):
+    if partitioned:
+        return [file_path, os.path.join(root or store_path(file_path), STORE_META)]
+    return [file_path]
+
+
+class HotReloader:
+    def __init__(self, paths, build, warm=None, poll_seconds=POLL_SECONDS):
+        self.paths = list(paths)
+        self.poll_seconds = poll_seconds
+        self._build = build
+        self._warm = warm
+        self.reloads = 0
+        self.last_error = None
+        # 첫 세대는 바로 만든다 (서버가 뜬 뒤 첫 실행에서 한 번만)
+        self.current = self._load()
+        self.signature = self.current.signature
+        self._stop = threading.Event()
+        self._thread = None
+        if self.paths and poll_seconds > 0:
+            self._thread = threading.Thread(target=self._watch, name="data-hot-reload", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        generation = self._build()
+        if self._warm is not None:
+            try:
+                self._warm(generation)
+            except Exception as exc:
+                # 미리 채우기에 실패해도 데이터는 온전하므로 그대로 쓰고, 해당 집계는 처음 볼 때 만든다
+                self.last_error = f"warm: {type(exc).__name__}: {exc}"
+        return generation
+
+    def _watch(self):
+        pending = None
+        while not self._stop.wait(self.poll_seconds):
+            signature = file_signature(self.paths)
+            if signature == self.signature:
+                pending = None
+            elif signature != pending:
+                pending = signature
+            else:
+                pending = None
+                self.reload()
+
+    def reload(self):
+        self.last_error = None
+        attempted = file_signature(self.paths)
+        try:
+            generation = self._load()
+        except Exception as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            # 실패한 입력으로는 재시도하지 않는다 (만드는 동안 또 바뀌었으면 다음 확인에서 다시 만든다)
+            self.signature = attempted
+            return False
+        # 참조 대입 하나로 바꿔 끼운다 (이미 current 를 읽은 실행은 이전 세대로 끝까지 그린다)
+        self.current = generation
+        self.signature = generation.signature
+        self.reloads += 1
+        return True
+
+    def stop(self):
+        self._stop.set()
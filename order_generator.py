@@ -0,0 +1,180 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# --- 합성 주문 데이터 생성기 ---
+# 원본 CSV 와 같은 컬럼/형식(한글 컬럼명, Y/N 플래그, 천 단위 쉼표 금액)의 주문 데이터를 원하는 행 수만큼 만든다.
+# 성능 측정용이라 분포는 보고서 수치에 가깝게만 맞춘다.
+#   셀러   : 상위 셀러에 주문이 몰리는 멱법칙 분포, 일부 셀러는 11월 이후 이탈
+#   고객   : 소수 고객이 여러 번 주문하도록 치우친 UID, 고객마다 지역 고정
+#   상품   : 품종 × 규격 × 키워드(이벤트/선물) 카탈로그, 셀러마다 주로 파는 상품 구간이 다름
+#   주문   : 한 주문번호에 1~3개 상품 행, 저녁 시간대와 11~1월에 주문이 몰림
+#   취소   : 5만원 이상 고단가에서 취소율이 높고 이벤트 상품은 낮음
+# 카탈로그/셀러/고객 표는 시드로 고정하고 청크마다 (시드, 청크 번호) 난수로 행을 만들어서,
+# 1천만 행도 청크 단위로 이어 쓰면 하나의 일관된 데이터가 된다.
+GENERATOR_VERSION = 1  # 분포/형식을 바꾸면 올린다 (benchmark 가 같은 파일을 다시 쓰지 않도록)
+COLUMNS = ['주문번호', '주문일', 'UID', '셀러명', '상품명', '이벤트 여부', '선물세트_여부', '판매단가', '공급단가', '주문수량',
+           '결제금액', '주문취소 금액', '실결제 금액', '취소수량', '주문-취소 수량', '취소여부', '감귤 세부', '품종', '주문경로',
+           '결제방법', '광역지역(정식)', '과수 크기', '무게 구분']
+START_DATE = '2025-09-01'
+END_DATE = '2026-01-31'
+CHUNK_ROWS = 1_000_000
+N_SELLERS = 120
+N_PRODUCTS = 600
+SIZES = {'100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+NAMED_SELLERS = ['킹댕즈', '제주농장', 'dapanda', '천&천', '귤하르방', '한라상회']
+VARIETIES = {'감귤': 5000, '한라봉': 9000, '레드향': 11000, '천혜향': 10000, '황금향': 9500}  # kg당 기준 단가
+DETAILS = {'감귤': ['노지', '하우스'], '한라봉': ['만감류'], '레드향': ['만감류'], '천혜향': ['만감류'], '황금향': ['만감류']}
+WEIGHTS = [2, 2.5, 3, 4.5, 5, 10]
+FRUIT_SIZES = ['소과', '중과', '대과', '혼합', '로얄과']
+EVENT_TAGS = ['[1+1] ', '[증정] ', '[특가] ', '[한정] ', '[이벤트] ', '[추가발송] ']
+REGIONS = {'경기도': 26, '서울특별시': 18, '부산광역시': 6, '경상남도': 6, '인천광역시': 6, '경상북도': 5, '대구광역시': 5,
+           '충청남도': 4, '전라남도': 3, '전북특별자치도': 3, '충청북도': 3, '강원특별자치도': 3, '대전광역시': 3,
+           '광주광역시': 3, '울산광역시': 2, '제주특별자치도': 1, '세종특별자치시': 1}
+CHANNELS = {'모바일': 55, '앱': 30, 'PC': 15}
+PAYMENTS = {'카드': 45, '간편결제': 30, '계좌이체': 12, '포인트': 8, '무통장입금': 5}
+HOUR_WEIGHTS = [1, 1, 0.5, 0.3, 0.3, 0.5, 1, 2, 3, 4, 5, 5, 6, 5, 4, 4, 5, 6, 8, 9, 9, 8, 6, 3]
+
+
+def _probs(weights):
+    weights = np.asarray(list(weights), dtype=float)
+    return weights / weights.sum()
+
+
+def _catalog(rng):
+    varieties = rng.choice(list(VARIETIES), N_PRODUCTS, p=_probs([40, 20, 15, 15, 10]))
+    weights = rng.choice(WEIGHTS, N_PRODUCTS, p=_probs([10, 10, 30, 15, 25, 10]))
+    event = rng.random(N_PRODUCTS) < 0.3
+    gift = rng.random(N_PRODUCTS) < 0.2
+    tags = np.where(event, np.array(EVENT_TAGS)[rng.integers(0, len(EVENT_TAGS), N_PRODUCTS)], '')
+    gift_words = np.where(gift, rng.choice(['선물세트 ', '선물용 ', '고급 포장 '], N_PRODUCTS), '')
+    names = [f"{tag}{word}제주 {variety} {weight:g}kg" for tag, word, variety, weight in zip(tags, gift_words, varieties, weights)]
+    price_per_kg = np.array([VARIETIES[v] for v in varieties]) * np.where(gift, 1.35, 1.0)
+    return pd.DataFrame({
+        '상품명': names,
+        '품종': varieties,
+        '감귤 세부': [DETAILS[v][i % len(DETAILS[v])] for i, v in enumerate(varieties)],
+        '무게': weights,
+        '기준단가': price_per_kg * weights * rng.lognormal(0, 0.25, N_PRODUCTS),
+        'event': event,
+        '이벤트 여부': np.where(event | (rng.random(N_PRODUCTS) < 0.1), 'Y', 'N'),
+        '선물세트_여부': np.where(gift, '선물세트', np.where(rng.random(N_PRODUCTS) < 0.05, None, '일반')),
+        '과수 크기': rng.choice(FRUIT_SIZES, N_PRODUCTS, p=_probs([30, 25, 20, 20, 5])),
+    })
+
+
+def _sellers(rng):
+    names = NAMED_SELLERS + [f'셀러{i}' for i in range(N_SELLERS - len(NAMED_SELLERS))]
+    popularity = 1 / np.arange(1, N_SELLERS + 1) ** 0.9
+    # 소규모 셀러 일부는 11월 말 이후 주문이 끊긴다 (가설 7/8)
+    churn = (np.arange(N_SELLERS) >= 20) & (rng.random(N_SELLERS) < 0.35)
+    last_day = np.where(churn, pd.Timestamp('2025-12-01').value, np.iinfo(np.int64).max)
+    return names, _probs(popularity), last_day, rng.integers(0, N_PRODUCTS, N_SELLERS)
+
+
+def _customer_regions(rng, n_customers):
+    return rng.choice(list(REGIONS), n_customers, p=_probs(REGIONS.values()))
+
+
+def _format_won(values):
+    return [f"{v:,.0f}" for v in values]
+
+
+def generate_orders(n_rows, seed=0, chunk_index=0, order_offset=0, n_customers=None, tables=None):
+    tables = tables or make_tables(n_rows, seed, n_customers)
+    catalog, (sellers, seller_p, seller_last, seller_base), regions = tables
+    rng = np.random.default_rng([seed, chunk_index])
+
+    # 주문 단위: 날짜/시간, 고객, 셀러
+    n_orders = int(n_rows / 1.2) + 16  # 주문당 평균 1.25 행이므로 조금 넉넉히 만든 뒤 n_rows 에서 자른다
+    start, end = pd.Timestamp(START_DATE), pd.Timestamp(END_DATE) + pd.Timedelta(days=1)
+    days = np.arange((end - start).days)
+    season = 1 + 1.5 * np.exp(-((days - 100) / 35.0) ** 2)  # 12월 초를 정점으로 11~1월 성수기
+    day = rng.choice(days, n_orders, p=_probs(season))
+    seconds = (rng.choice(24, n_orders, p=_probs(HOUR_WEIGHTS)) * 3600 + rng.integers(0, 3600, n_orders))
+    ordered_at = start.value + day * 86_400_000_000_000 + seconds * 1_000_000_000
+    customer = (len(regions) * rng.random(n_orders) ** 2.5).astype(np.int64)
+    seller = rng.choice(len(sellers), n_orders, p=seller_p)
+    # 이탈한 셀러의 12월 이후 주문은 상위 셀러로 넘긴다
+    seller = np.where(ordered_at > seller_last[seller], rng.integers(0, 20, n_orders), seller)
+
+    # 주문 -> 상품 행 (1~3개)
+    lines = rng.choice([1, 2, 3], n_orders, p=[0.8, 0.15, 0.05])
+    order = np.repeat(np.arange(n_orders), lines)[:n_rows]
+    product = (seller_base[seller[order]] + (rng.pareto(1.2, len(order)) * 3).astype(np.int64)) % N_PRODUCTS
+    item = catalog.iloc[product].reset_index(drop=True)
+
+    price = np.round(item['기준단가'].to_numpy() * rng.lognormal(0, 0.1, len(order)), -1)
+    cost = np.round(price * rng.uniform(0.55, 0.8, len(order)))
+    bulk_rate = 0.12 + 0.2 * item['event'].to_numpy() + 0.15 * (item['무게'].between(3, 5).to_numpy())
+    quantity = 1 + rng.poisson(bulk_rate)
+    paid = price * quantity
+    cancel_rate = np.where(price >= 50_000, 0.25, 0.04) * np.where(item['event'].to_numpy(), 0.5, 1.0)
+    cancelled = rng.random(len(order)) < cancel_rate
+    cancel_qty = np.where(cancelled, quantity, 0)
+    cancel_amount = price * cancel_qty
+
+    weight = item['무게'].to_numpy()
+    return pd.DataFrame({
+        '주문번호': order_offset + order + 10_000,
+        '주문일': pd.to_datetime(ordered_at[order]).strftime('%Y-%m-%d %H:%M:%S'),
+        'UID': customer[order] + 1,
+        '셀러명': np.asarray(sellers, dtype=object)[seller[order]],
+        '상품명': item['상품명'],
+        '이벤트 여부': item['이벤트 여부'],
+        '선물세트_여부': item['선물세트_여부'],
+        '판매단가': _format_won(price),
+        '공급단가': cost,
+        '주문수량': quantity,
+        '결제금액': _format_won(paid),
+        '주문취소 금액': _format_won(cancel_amount),
+        '실결제 금액': _format_won(paid - cancel_amount),
+        '취소수량': cancel_qty,
+        '주문-취소 수량': quantity - cancel_qty,
+        '취소여부': np.where(cancelled, 'Y', 'N'),
+        '감귤 세부': item['감귤 세부'],
+        '품종': item['품종'],
+        '주문경로': rng.choice(list(CHANNELS), len(order), p=_probs(CHANNELS.values())),
+        '결제방법': rng.choice(list(PAYMENTS), len(order), p=_probs(PAYMENTS.values())),
+        '광역지역(정식)': regions[customer[order]],
+        '과수 크기': np.where(rng.random(len(order)) < 0.02, None, item['과수 크기']),
+        '무게 구분': np.where(weight < 3, '3kg 미만', np.where(weight <= 5, '3-5kg', '5kg 이상')),
+    }, columns=COLUMNS)
+
+
+# 시드로 고정되는 카탈로그 / 셀러 / 고객 지역 표 (청크가 달라도 같은 표를 쓴다)
+def make_tables(n_rows, seed=0, n_customers=None):
+    rng = np.random.default_rng([seed, 2**32 - 1])
+    n_customers = n_customers or max(1, n_rows // 3)
+    return _catalog(rng), _sellers(rng), _customer_regions(rng, n_customers)
+
+
+def write_orders(path, n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+    tables = make_tables(n_rows, seed)
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8', newline='') as out:
+        for chunk_index, start in enumerate(range(0, n_rows, chunk_rows)):
+            chunk = generate_orders(min(chunk_rows, n_rows - start), seed, chunk_index,
+                                    order_offset=chunk_index * chunk_rows, tables=tables)
+            chunk.to_csv(out, index=False, header=chunk_index == 0)
+    os.replace(tmp, path)
+    return path
+
+
+def parse_rows(text):
+    text = text.lower().replace('_', '')
+    if text in SIZES:
+        return SIZES[text]
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+if __name__ == '__main__':
+    # 합성 데이터 생성: python order_generator.py <행 수: 100k | 1m | 10m | 숫자> [출력 CSV] [시드]
+    rows = parse_rows(sys.argv[1] if len(sys.argv) > 1 else '100k')
+    path = sys.argv[2] if len(sys.argv) > 2 else f"synthetic_orders_{rows}.csv"
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    print(write_orders(path, rows, seed), rows, "rows")
@@ -0,0 +1,541 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from data_loader import (CATEGORY_COLS, DATA_FILE, PRICE_LABELS, SNAPSHOT_VERSION, TIME_LABELS, _file_hash,
+                         apply_customer_state, compact_orders, compact_plan, customer_state, derive_order_columns,
+                         merge_compact_plan, merge_customer_state)
+from rollup import DAILY_KEYS, PRODUCT_KEYS, build_daily_rollup, build_product_rollup
+
+# --- 월 단위 파티션 Parquet 저장소 ---
+# 전체 주문 이력을 메모리에 올리지 않기 위한 저장소.
+#   <저장소>/주문월=YYYY-MM/part-0.parquet  (주문일 순 정렬, 행 그룹마다 주문일 통계 포함)
+# 날짜 범위 조회는 주문월 파티션 가지치기 + 주문일 조건 푸시다운으로 필요한 행 그룹만 읽고,
+# 전체 이력 집계는 레코드 배치 단위로 흘려 보내며 부분 집계만 들고 있는다.
+#   <저장소>/_state/   : 고객 상태 테이블 (UID별 첫 주문일, (셀러명, UID, 주문번호) 고유 조합)
+#   <저장소>/_rollup/  : 트렌드 탭용 일별/상품별 롤업 큐브
+# 고객 상태와 압축 계획을 같이 보관하므로 새 일별 파일은 append_orders 로 영향받는 달/날짜만 다시 쓴다.
+# 메모리 한계: 주문 행은 청크 하나 + 한 달치만 올리지만, 다음 둘은 전체 이력 기준이라 통째로 메모리에 올린다.
+#   - 고객 상태 : UID 수 + (셀러명, UID) 조합 수에 비례 (조합마다 주문번호 최대 2개)
+#   - 롤업 큐브 : 일 수 × 큐브 키 조합 수에 비례 (만들 때 달마다 계산해 이어 붙이고, 추가할 때는 전체를 읽어 바꿔 끼운다)
+# 둘 다 주문 행 수보다 훨씬 작지만 파티션 크기로 묶이지는 않는다.
+PARTITION_COL = '주문월'
+UNKNOWN_MONTH = 'unknown'
+CHUNK_ROWS = 200_000
+ROW_GROUP_ROWS = 64 * 1024
+BATCH_ROWS = 64 * 1024
+ORDERED_LABELS = {'단가_그룹': PRICE_LABELS, '시간대_구간': TIME_LABELS}
+STATE_DIR = '_state'
+ROLLUP_DIR = '_rollup'
+ROLLUP_COLS = list(dict.fromkeys(DAILY_KEYS + PRODUCT_KEYS + ['주문번호', '실결제 금액']))
+
+
+def store_path(file_path=DATA_FILE):
+    return os.path.splitext(file_path)[0] + "_store"
+
+
+def _store_meta_path(root):
+    return os.path.join(root, "_meta.json")
+
+
+def _read_store_meta(root):
+    try:
+        with open(_store_meta_path(root), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_store_meta(root, meta):
+    tmp = _store_meta_path(root) + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp, _store_meta_path(root))
+
+
+def _write_parquet(table, path):
+    # 임시 파일에 쓴 뒤 교체해서 읽는 쪽이 쓰다 만 파일을 보지 않게 한다
+    tmp = path + ".tmp"
+    pq.write_table(table, tmp, compression='zstd', row_group_size=ROW_GROUP_ROWS)
+    os.replace(tmp, path)
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        if not os.path.exists(src):
+            raise
+        shutil.copy2(src, dst)
+
+
+# 저장소 교체: 다 만든 build_dir 를 root 자리로 옮긴다 (읽는 쪽이 만들다 만 저장소를 보지 않게 한다)
+# 두 번의 rename 사이에 멈추면 root 가 없고 .old(이전 저장소)와 build_dir(새 저장소)가 남으므로 _recover_swap 이 마무리한다.
+def _swap_in(build_dir, root):
+    old_dir = root + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(root):
+        os.replace(root, old_dir)
+    os.replace(build_dir, root)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _recover_swap(root):
+    old_dir = root + ".old"
+    if os.path.exists(root) or not os.path.exists(old_dir):
+        return
+    build_dir = root + ".tmp"
+    # 첫 rename 은 build_dir 를 다 만든 뒤에만 일어나므로, .old 가 남아 있을 때 build_dir 가 있으면 완성된 새 저장소다
+    if _read_store_meta(build_dir) is not None:
+        os.replace(build_dir, root)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    else:
+        os.replace(old_dir, root)
+
+
+def _source_info(file_path):
+    st = os.stat(file_path)
+    return {'path': os.path.abspath(file_path), 'mtime_ns': st.st_mtime_ns, 'size': st.st_size,
+            'sha256': _file_hash(file_path)}
+
+
+def store_is_fresh(file_path=DATA_FILE, root=None):
+    meta = _read_store_meta(root or store_path(file_path))
+    if meta is None or meta.get('version') != SNAPSHOT_VERSION:
+        return False
+    st = os.stat(file_path)
+    if meta.get('mtime_ns') == st.st_mtime_ns and meta.get('size') == st.st_size:
+        return True
+    return meta.get('size') == st.st_size and meta.get('sha256') == _file_hash(file_path)
+
+
+def _month_keys(dates):
+    return dates.dt.strftime('%Y-%m').fillna(UNKNOWN_MONTH)
+
+
+def _month_files(root):
+    months = sorted(name for name in os.listdir(root) if name.startswith(PARTITION_COL + '='))
+    return [os.path.join(root, name, 'part-0.parquet') for name in months]
+
+
+def _write_month(root, month, df):
+    month_dir = os.path.join(root, f"{PARTITION_COL}={month}")
+    os.makedirs(month_dir, exist_ok=True)
+    df = df.sort_values('주문일', kind='stable', ignore_index=True)
+    _write_parquet(pa.Table.from_pandas(df, preserve_index=False), os.path.join(month_dir, 'part-0.parquet'))
+    return len(df)
+
+
+# 달마다 전부 비어 있는 컬럼 등으로 타입이 어긋나면 공통 스키마로 맞춰 다시 쓴다
+def _unify_schema(root):
+    files = _month_files(root)
+    schemas = [pq.read_schema(path) for path in files]
+    if not schemas:
+        return
+    schema = pa.unify_schemas(schemas, promote_options='permissive')
+    for path, file_schema in zip(files, schemas):
+        if not file_schema.equals(schema):
+            _write_parquet(pq.ParquetFile(path).read().select(schema.names).cast(schema), path)
+
+
+def _save_state(root, state):
+    if state is None:
+        return
+    state_dir = os.path.join(root, STATE_DIR)
+    os.makedirs(state_dir, exist_ok=True)
+    first_dates, orders = state
+    first_dates = first_dates.rename('first_order_date').reset_index()
+    _write_parquet(pa.Table.from_pandas(first_dates, preserve_index=False), os.path.join(state_dir, 'first_dates.parquet'))
+    _write_parquet(pa.Table.from_pandas(orders, preserve_index=False), os.path.join(state_dir, 'orders.parquet'))
+
+
+def _load_state(root):
+    state_dir = os.path.join(root, STATE_DIR)
+    if not os.path.exists(os.path.join(state_dir, 'first_dates.parquet')):
+        return None
+    first_dates = pd.read_parquet(os.path.join(state_dir, 'first_dates.parquet'))
+    orders = pd.read_parquet(os.path.join(state_dir, 'orders.parquet'))
+    return first_dates.set_index('UID')['first_order_date'], orders
+
+
+def _write_rollups(root, daily, product):
+    rollup_dir = os.path.join(root, ROLLUP_DIR)
+    os.makedirs(rollup_dir, exist_ok=True)
+    for name, cube in (('daily', daily), ('product', product)):
+        cube = cube.sort_values('주문일자', kind='stable', ignore_index=True)
+        _write_parquet(pa.Table.from_pandas(cube, preserve_index=False), os.path.join(rollup_dir, f'{name}.parquet'))
+
+
+# 주어진 날짜들의 롤업 큐브 행만 다시 계산한다
+# (그날의 행 + 그날 주문들의 다른 날 행을 같이 넣어야 여러 날에 걸친 주문의 보정 행이 맞는다)
+def _rollup_for_dates(store, dates):
+    rows = store.rollup_rows(dates)
+    daily, product = build_daily_rollup(rows), build_product_rollup(rows)
+    return daily[daily['주문일자'].isin(dates)], product[product['주문일자'].isin(dates)]
+
+
+def _build_rollups(store):
+    daily, product = [], []
+    for path, month in zip(store.files, store.months):
+        if month == UNKNOWN_MONTH:
+            continue
+        dates = set(pq.read_table(path, columns=['주문일자'])['주문일자'].drop_null().to_pylist())
+        month_daily, month_product = _rollup_for_dates(store, dates)
+        daily.append(month_daily)
+        product.append(month_product)
+    if not daily:
+        return build_daily_rollup(store.read(columns=ROLLUP_COLS)), build_product_rollup(store.read(columns=ROLLUP_COLS))
+    return pd.concat(daily, ignore_index=True), pd.concat(product, ignore_index=True)
+
+
+# CSV -> 파티션 저장소 (두 단계, 주문 행은 청크 하나 + 한 달치만 메모리에 올린다)
+#   1단계: CSV를 청크로 읽어 행 단위 파생 컬럼을 만들고 월별 임시 파일로 나눠 쓰면서
+#          고객 상태(첫 구매일, 셀러별 주문번호)와 압축 스키마 계획을 누적한다.
+#   2단계: 한 달씩 임시 파일을 모아 고객 파생 컬럼을 붙이고, 압축/정렬 후 파티션으로 쓴다.
+# deltas 로 이미 추가했던 일별 파일을 넘기면 원본 뒤에 이어 붙여 처음부터 다시 만든다.
+def write_partitioned_store(file_path=DATA_FILE, root=None, chunk_rows=CHUNK_ROWS, deltas=()):
+    root = root or store_path(file_path)
+    build_dir = root + ".tmp"
+    staging_dir = os.path.join(build_dir, "_staging")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    base = _source_info(file_path)
+
+    state, plan, staged, i = None, None, {}, 0
+    for source in [file_path] + list(deltas):
+        for chunk in pd.read_csv(source, chunksize=chunk_rows):
+            chunk = derive_order_columns(chunk)
+            state = merge_customer_state(state, customer_state(chunk))
+            plan = merge_compact_plan(plan, compact_plan(chunk))
+            for month, part in chunk.groupby(_month_keys(chunk['주문일']), sort=False):
+                path = os.path.join(staging_dir, f"{month}-{i:05d}.parquet")
+                part.to_parquet(path, index=False)
+                staged.setdefault(month, []).append(path)
+            i += 1
+
+    rows = 0
+    for month in sorted(staged):
+        part = pd.concat([pd.read_parquet(path) for path in staged[month]], ignore_index=True)
+        apply_customer_state(part, state)
+        rows += _write_month(build_dir, month, compact_orders(part, plan))
+    shutil.rmtree(staging_dir)
+    _unify_schema(build_dir)
+    _save_state(build_dir, state)
+
+    _write_store_meta(build_dir, {
+        'version': SNAPSHOT_VERSION,
+        'mtime_ns': base['mtime_ns'],
+        'size': base['size'],
+        'sha256': base['sha256'],
+        'rows': rows,
+        'months': sorted(staged),
+        'plan': plan or {},
+        'deltas': [_source_info(path) for path in deltas],
+        'revision': 0,
+    })
+    _write_rollups(build_dir, *_build_rollups(PartitionedOrders(build_dir)))
+
+    _swap_in(build_dir, root)
+    return root
+
+
+# 범주형 카테고리를 메모리 모드와 같은 순서로 되돌린다
+# (파티션마다 사전이 달라 합쳐진 순서가 제각각이므로 사전순 / 구간 라벨 순으로 다시 정렬)
+def _restore_categories(df):
+    for col in df.columns:
+        if col in ORDERED_LABELS:
+            df[col] = df[col].astype(pd.CategoricalDtype(ORDERED_LABELS[col], ordered=True))
+        elif col in CATEGORY_COLS and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+
+class PartitionedOrders:
+    def __init__(self, root):
+        self.root = root
+        meta = _read_store_meta(root) or {}
+        self.version = f"{meta.get('version')}-{meta.get('sha256', '')[:12]}-r{meta.get('revision', 0)}"
+        self.months = meta.get('months', [])
+        self.files = _month_files(root)
+        self.dataset = ds.dataset(self.files, format='parquet', partitioning='hive', partition_base_dir=root)
+        self.columns = [name for name in self.dataset.schema.names if name != PARTITION_COL]
+
+    # 전체 주문일 범위 (첫/마지막 달 파일의 주문일 컬럼만 읽는다)
+    def date_bounds(self):
+        dated = [path for path, month in zip(self.files, self.months) if month != UNKNOWN_MONTH]
+        if not dated:
+            return None, None
+        first = pc.min_max(pq.read_table(dated[0], columns=['주문일'])['주문일'])
+        last = pc.min_max(pq.read_table(dated[-1], columns=['주문일'])['주문일'])
+        return first['min'].as_py().date(), last['max'].as_py().date()
+
+    # 날짜 범위 (시작일, 종료일 포함) -> 파티션 가지치기 + 주문일 푸시다운 조건
+    def _filter(self, date_range=None):
+        if date_range is None:
+            return None
+        start = pd.Timestamp(date_range[0]).normalize()
+        end = pd.Timestamp(date_range[1]).normalize() + pd.Timedelta(days=1)
+        month = ds.field(PARTITION_COL)
+        order_date = ds.field('주문일')
+        return ((month >= start.strftime('%Y-%m')) & (month <= pd.Timestamp(date_range[1]).strftime('%Y-%m'))
+                & (order_date >= start.to_pydatetime()) & (order_date < end.to_pydatetime()))
+
+    # 날짜 범위에 해당하는 행만 DataFrame 으로 읽는다 (주문일 순)
+    def read(self, date_range=None, columns=None):
+        table = self.dataset.to_table(columns=columns or self.columns, filter=self._filter(date_range))
+        return _restore_categories(table.to_pandas(split_blocks=True, self_destruct=True))
+
+    def read_month(self, month):
+        path = os.path.join(self.root, f"{PARTITION_COL}={month}", 'part-0.parquet')
+        return _restore_categories(pq.ParquetFile(path).read().to_pandas())
+
+    # 컬럼 값이 values 중 하나인 행이 있는 달 목록
+    def months_with(self, col, values):
+        if not values:
+            return set()
+        table = self.dataset.to_table(columns=[PARTITION_COL], filter=ds.field(col).isin(pa.array(list(values))))
+        return set(pc.unique(table[PARTITION_COL]).to_pylist())
+
+    # 롤업 재계산용 행: 주어진 날짜의 행 + 그 날짜에 나온 주문들의 다른 날 행
+    def rollup_rows(self, dates):
+        dates = pa.array(sorted(dates), pa.date32())
+        months = sorted({d.strftime('%Y-%m') for d in dates.to_pylist()})
+        on_dates = ds.field(PARTITION_COL).isin(months) & ds.field('주문일자').isin(dates)
+        rows = self.dataset.to_table(columns=ROLLUP_COLS, filter=on_dates)
+        orders = pc.unique(rows['주문번호'].drop_null())
+        linked = ((ds.field(PARTITION_COL) <= months[-1]) & ds.field('주문번호').isin(orders)
+                  & ~ds.field('주문일자').isin(dates))
+        rows = pa.concat_tables([rows, self.dataset.to_table(columns=ROLLUP_COLS, filter=linked)])
+        return _restore_categories(rows.to_pandas())
+
+    def rollups(self):
+        rollup_dir = os.path.join(self.root, ROLLUP_DIR)
+        return tuple(_restore_categories(pq.read_table(os.path.join(rollup_dir, f'{name}.parquet')).to_pandas())
+                     for name in ('daily', 'product'))
+
+    def batches(self, date_range=None, columns=None, batch_size=BATCH_ROWS):
+        return self.dataset.to_batches(columns=columns or self.columns, filter=self._filter(date_range),
+                                       batch_size=batch_size, batch_readahead=1, fragment_readahead=1)
+
+    # 배치 단위 스트리밍 groupby 집계
+    #   aggs = {출력 이름: (컬럼, 'sum' | 'mean' | 'count' | 'size' | 'nunique')}
+    # 배치마다 부분 집계(합계/개수, nunique 는 (키, 값) 고유 조합)를 만들어 누적하므로
+    # 메모리는 그룹 수(nunique 는 고유 조합 수)에만 비례한다. 키가 비어 있는 행은 pandas 처럼 제외한다.
+    def aggregate(self, by, aggs, date_range=None):
+        by = [by] if isinstance(by, str) else list(by)
+        additive, distinct = {}, {}
+        for name, (col, func) in aggs.items():
+            if func == 'nunique':
+                distinct[name] = col
+            else:
+                additive[name] = (col, func)
+        specs = []
+        for col, func in additive.values():
+            if func == 'size':
+                wanted = [([], 'count_all')]
+            else:
+                wanted = [(col, 'sum'), (col, 'count')] if func in ('sum', 'mean') else [(col, 'count')]
+            specs += [spec for spec in wanted if spec not in specs]
+        columns = list(dict.fromkeys(by + [col for col, _ in aggs.values()]))
+        partial, seen = None, {name: None for name in distinct}
+
+        for batch in self.batches(date_range, columns=columns):
+            table = pa.Table.from_batches([batch])
+            if specs:
+                part = _as_object_keys(table.group_by(by).aggregate(specs).to_pandas(), by)
+                partial = part if partial is None else pd.concat([partial, part], ignore_index=True)
+                partial = partial.groupby(by, dropna=False, sort=False).sum(min_count=1).reset_index()
+            for name, col in distinct.items():
+                pairs = table.select(by + [col]).filter(pc.is_valid(table[col])).group_by(by + [col]).aggregate([])
+                pairs = _as_object_keys(pairs.to_pandas(), by + [col])
+                seen[name] = pairs if seen[name] is None else pd.concat([seen[name], pairs]).drop_duplicates()
+
+        result = None
+        if additive:
+            partial = partial if partial is not None else pd.DataFrame(columns=by)
+            out = partial[by].copy()
+            for name, (col, func) in additive.items():
+                if func == 'size':
+                    out[name] = partial.get('count_all', 0)
+                elif func == 'count':
+                    out[name] = partial[f'{col}_count']
+                elif func == 'sum':
+                    out[name] = partial[f'{col}_sum'].fillna(0)
+                else:
+                    out[name] = partial[f'{col}_sum'] / partial[f'{col}_count']
+            result = out
+        for name, col in distinct.items():
+            pairs = seen[name] if seen[name] is not None else pd.DataFrame(columns=by + [col])
+            counts = pairs.groupby(by, dropna=False).size().rename(name).reset_index()
+            result = counts if result is None else result.merge(counts, on=by, how='outer')
+        result = result.dropna(subset=by)
+        for name in distinct:
+            result[name] = result[name].fillna(0).astype(int)
+        return result.sort_values(by, ignore_index=True)
+
+    def value_counts(self, col, date_range=None):
+        counts = self.aggregate([col], {'count': (col, 'size')}, date_range)
+        return counts.set_index(col)['count'].sort_values(ascending=False)
+
+
+# 배치마다 사전이 달라지는 범주형 키는 object 로 풀어서 부분 집계를 합친다
+def _as_object_keys(df, keys):
+    for col in keys:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
+
+
+# --- 일별 파일 증분 적재 ---
+# 압축 계획에서 빠진 컬럼(flag/int32)은 기존 파티션도 원래 타입으로 되돌려야 새 행과 합칠 수 있다
+def _relax(df, demoted):
+    for col, kind in demoted.items():
+        if col not in df.columns:
+            continue
+        if kind == 'flag':
+            df[col] = df[col].map({True: 'Y', False: 'N'})
+        elif kind == 'int32':
+            df[col] = df[col].astype(float)
+    return df
+
+
+# 새 파일 때문에 기존 행의 파생 값이 바뀌는 고객
+#   - 첫 주문일이 앞당겨진 UID (first_order_date / is_first_purchase)
+#   - 셀러별 주문번호가 1개 -> 2개 이상이 된 (셀러명, UID) (is_reorder)
+def _changed_customers(old_state, new_state):
+    if old_state is None or new_state is None:
+        return set()
+    old_first, old_orders = old_state
+    new_first, new_orders = new_state
+    moved = old_first.index[(new_first.reindex(old_first.index) != old_first).to_numpy()]
+    old_counts = old_orders.groupby(['셀러명', 'UID']).size()
+    new_counts = new_orders.groupby(['셀러명', 'UID']).size().reindex(old_counts.index)
+    flipped = old_counts.index[((old_counts <= 1) & (new_counts > 1)).to_numpy()]
+    return set(moved) | set(flipped.get_level_values('UID'))
+
+
+# 새 일별 주문 파일을 저장소에 추가한다. 전체를 다시 만들지 않고
+#   - 새 행이 들어가는 달 + 파생 값이 바뀐 고객의 행이 있는 달만 다시 쓰고
+#   - 롤업 큐브는 새 행의 날짜와 그 주문들의 다른 날짜만 다시 계산한다.
+# 이미 추가한 파일(같은 해시)은 건너뛴다. 추가한 행 수를 돌려준다.
+def append_orders(delta_path, root=None):
+    root = root or store_path(DATA_FILE)
+    _recover_swap(root)
+    meta = _read_store_meta(root)
+    info = _source_info(delta_path)
+    if any(d['sha256'] == info['sha256'] for d in meta.get('deltas', [])):
+        return 0
+
+    delta = derive_order_columns(pd.read_csv(delta_path))
+    old_state = _load_state(root)
+    state = merge_customer_state(old_state, customer_state(delta))
+    plan = merge_compact_plan(meta['plan'], compact_plan(delta))
+    demoted = {col: kind for col, kind in meta['plan'].items() if plan.get(col) != kind}
+    apply_customer_state(delta, state)
+    delta_months = _month_keys(delta['주문일'])
+
+    # 기존 저장소를 하드 링크로 뜬 build_dir 에 바뀐 달/상태/롤업/메타를 쓰고 마지막에 통째로 바꿔 끼운다.
+    # 중간에 멈추면 root 는 그대로라(일별 파일도 기록되지 않았으므로) 다시 실행하면 처음부터 한 번만 반영된다.
+    # 파일은 임시 파일 + 교체로 쓰므로 링크된 원래 파일은 바뀌지 않는다.
+    build_dir = root + ".tmp"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    shutil.copytree(root, build_dir, copy_function=_link_or_copy, ignore=shutil.ignore_patterns('*.tmp'))
+
+    store = PartitionedOrders(root)
+    months = set(delta_months)
+    if demoted:
+        months |= set(store.months)
+    else:
+        months |= store.months_with('UID', _changed_customers(old_state, state))
+    for month in sorted(months):
+        parts = [compact_orders(delta[delta_months == month], plan)]
+        if month in store.months:
+            parts = [_relax(store.read_month(month), demoted)] + [part for part in parts if len(part)]
+        part = apply_customer_state(pd.concat(parts, ignore_index=True), state)
+        _write_month(build_dir, month, compact_orders(part, plan))
+    _unify_schema(build_dir)
+    _save_state(build_dir, state)
+
+    # 새 행의 날짜 + 새 주문들이 원래 있던 날짜의 큐브 행만 바꿔 끼운다
+    store = PartitionedOrders(build_dir)
+    dates = set(delta['주문일자'].dropna())
+    orders = list(delta['주문번호'].dropna().unique())
+    if orders:
+        linked = store.dataset.to_table(columns=['주문일자'], filter=ds.field('주문번호').isin(pa.array(orders)))
+        dates |= set(linked['주문일자'].drop_null().to_pylist())
+    if dates:
+        daily, product = store.rollups()
+        new_daily, new_product = _rollup_for_dates(store, dates)
+        _write_rollups(build_dir,
+                       pd.concat([daily[~daily['주문일자'].isin(dates)], new_daily], ignore_index=True),
+                       pd.concat([product[~product['주문일자'].isin(dates)], new_product], ignore_index=True))
+
+    # 메타는 마지막에 쓴다 (메타가 있는 build_dir 만 완성된 저장소로 본다)
+    meta.update({
+        'rows': meta['rows'] + len(delta),
+        'months': sorted(set(meta['months']) | months),
+        'plan': plan,
+        'deltas': meta.get('deltas', []) + [info],
+        'revision': meta.get('revision', 0) + 1,
+    })
+    _write_store_meta(build_dir, meta)
+    _swap_in(build_dir, root)
+    return len(delta)
+
+
+# --- 읽기 전용 저장소 스냅샷 ---
+# 저장소 파일은 모두 임시 파일에 쓴 뒤 교체하므로(재생성은 디렉터리째 교체), 파일을 하드 링크로 떠 둔 사본은
+# 이후 재생성이나 일별 파일 추가와 상관없이 뜬 시점의 내용 그대로 남는다 (하드 링크가 안 되면 복사).
+# 대시보드는 데이터 세대마다 스냅샷 하나를 읽고, 그 세대를 아무도 참조하지 않게 되면 지운다.
+SNAPSHOTS_SUFFIX = ".generations"
+SNAPSHOT_ATTEMPTS = 3
+
+
+def snapshots_dir(root):
+    return root + SNAPSHOTS_SUFFIX
+
+
+# 뜨는 도중에 저장소가 바뀌면(메타가 달라지면) 다시 뜬다
+def snapshot_store(root, target):
+    for _ in range(SNAPSHOT_ATTEMPTS):
+        meta = _read_store_meta(root)
+        shutil.rmtree(target, ignore_errors=True)
+        try:
+            shutil.copytree(root, target, copy_function=_link_or_copy, ignore=shutil.ignore_patterns('*.tmp'))
+        except OSError:
+            continue
+        if meta is not None and _read_store_meta(target) == meta == _read_store_meta(root):
+            return PartitionedOrders(target)
+    shutil.rmtree(target, ignore_errors=True)
+    raise RuntimeError(f"저장소가 계속 바뀌고 있어 스냅샷을 뜨지 못했습니다: {root}")
+
+
+def open_store(file_path=DATA_FILE, root=None):
+    root = root or store_path(file_path)
+    _recover_swap(root)
+    if not store_is_fresh(file_path, root):
+        # 원본이 바뀌면 그동안 추가한 일별 파일까지 이어 붙여 다시 만든다
+        meta = _read_store_meta(root) or {}
+        deltas = [d['path'] for d in meta.get('deltas', []) if os.path.exists(d['path'])]
+        write_partitioned_store(file_path, root, deltas=deltas)
+    return PartitionedOrders(root)
+
+
+if __name__ == '__main__':
+    # 저장소 생성: python order_store.py [CSV 경로] [저장소 경로]
+    # 일별 파일 추가: python order_store.py append <저장소 경로> <일별 CSV> [...]
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == 'append':
+        for delta_path in sys.argv[3:]:
+            print(delta_path, append_orders(delta_path, sys.argv[2]), "rows")
+    else:
+        source = sys.argv[1] if len(sys.argv) > 1 else DATA_FILE
+        target = sys.argv[2] if len(sys.argv) > 2 else None
+        store = open_store(source, target)
+        print(store.root, len(store.files), "partitions", store.date_bounds())
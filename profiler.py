@@ -0,0 +1,79 @@
+import contextlib
+import json
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+import plotly.io as pio
+
+from data_loader import BASE_PATH
+
+# --- 실행 단위 프로파일러 (대시보드 계측) ---
+# 켜져 있을 때만 구간(section)별로 걸린 시간, 다룬 행 수, 그래프 JSON 크기를 기록한다.
+#   phase : load(데이터 로드) / filter(필터) / section(메모이즈된 섹션, cached=캐시 적중) / build(그래프 집계·생성) / render(화면 전송)
+# 구간은 중첩될 수 있고 바로 바깥 구간을 parent 로 남긴다.
+# 꺼져 있으면 section() 이 공유된 빈 컨텍스트를 돌려주므로 측정 비용이 거의 없다.
+# 그래프 JSON 크기는 브라우저로 보내는 것과 같은 직렬화로 재되, 걸린 시간에는 넣지 않는다.
+PROFILE_ENV = "DASHBOARD_PROFILE"
+LOG_DIR = os.environ.get("DASHBOARD_PROFILE_DIR", os.path.join(BASE_PATH, "profile_logs"))
+_DISABLED = contextlib.nullcontext()
+
+
+def profiling_default():
+    return os.environ.get(PROFILE_ENV, "0") == "1"
+
+
+def figure_bytes(fig):
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
+
+
+class RunProfile:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.created = datetime.now()
+        self.started = time.perf_counter()
+        self.records = []
+        self._stack = []
+
+    def section(self, name, phase='build', rows=None, figure=None):
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name, phase, rows, figure)
+
+    @contextlib.contextmanager
+    def _measure(self, name, phase, rows, figure):
+        record = {'section': name, 'phase': phase, 'parent': self._stack[-1] if self._stack else None,
+                  'rows': rows, 'seconds': None, 'figure_bytes': None}
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._stack.pop()
+            if figure is not None:
+                record['figure_bytes'] = figure_bytes(figure)
+            self.records.append(record)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def table(self):
+        table = pd.DataFrame(self.records, columns=['section', 'phase', 'parent', 'rows', 'seconds', 'figure_bytes', 'cached'])
+        table['ms'] = table['seconds'] * 1000
+        table['figure_kb'] = table['figure_bytes'] / 1024
+        return table.sort_values('ms', ascending=False, ignore_index=True)
+
+    # 이번 실행의 기록을 JSON 파일 하나로 남긴다
+    def write_log(self, context=None, log_dir=LOG_DIR):
+        os.makedirs(log_dir, exist_ok=True)
+        path = os.path.join(log_dir, f"profile-{self.created:%Y%m%d-%H%M%S-%f}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': self.created.isoformat(timespec='milliseconds'),
+                'total_seconds': self.elapsed(),
+                'context': context or {},
+                'records': self.records,
+            }, f, ensure_ascii=False, indent=1, default=str)
+        return path
@@ -0,0 +1,85 @@
+import pandas as pd
+
+# --- 일별 롤업 큐브 (트렌드 탭용) ---
+# 일자 × 시간대 × 셀러 × 품종 × 감귤 세부 × 이벤트/선물 단위로 한 번만 집계해 두고,
+# 날짜 범위를 바꿀 때는 원본 행 대신 이 큐브를 잘라서 다시 합산한다.
+# 요일은 주문일자에 종속이라 그레인을 늘리지 않으므로 키에 같이 둔다.
+DAILY_KEYS = ['주문일자', '요일', '시간대', '셀러명', '품종', '감귤 세부', 'is_event_item', 'is_gift_item']
+PRODUCT_KEYS = ['주문일자', '상품명']
+LINK_KEY = '이전주문일자'
+
+# 합산 가능한 측정값
+#   실결제 금액 : 합계
+#   결제건수     : 실결제 금액이 있는 행 수 (평균 = 합계 / 결제건수)
+#   주문수       : 주문번호 nunique 용 카운트
+#   셀러주문수   : 셀러별 주문번호 nunique 용 카운트
+#
+# 주문번호 nunique 는 그대로 더할 수 없으므로 다음처럼 합산 가능한 형태로 바꾼다.
+#   - (주문일자, 주문번호) 마다 대표 행 하나에 +1
+#   - 같은 주문이 여러 날에 걸쳐 있으면 연속한 두 날 (이전일, 당일) 마다 -1 보정 행을 둔다
+# 날짜 범위 [a, b] 안에 들어오는 한 주문의 날짜들은 항상 연속 구간이므로
+# (범위 안의 날 수) - (범위 안에 양끝이 모두 들어온 연결 수) = 1 이 되어 nunique 와 정확히 같다.
+# 보정 행은 이전주문일자 >= a 일 때만 살아남도록 slice_rollup 에서 거른다.
+
+
+def _first_order_flags(df, keys):
+    return df['주문번호'].notna() & ~df.duplicated(subset=keys + ['주문번호'])
+
+
+def _order_links(df, group_keys, measure, keys):
+    # 주문(그룹별)이 여러 날에 걸친 경우 연속한 날짜 쌍마다 -1 보정 행을 만든다
+    order_keys = ['주문번호'] + group_keys
+    days = df[df['주문번호'].notna() & df['주문일자'].notna()]
+    days = days.drop_duplicates(subset=order_keys + ['주문일자']).sort_values(order_keys + ['주문일자'])
+    prev = days.groupby(order_keys, dropna=False, observed=True)['주문일자'].shift()
+    links = days.loc[prev.notna(), keys].copy()
+    links[LINK_KEY] = pd.to_datetime(prev[prev.notna()])
+    links[measure] = -1
+    return links
+
+
+def _rollup(df, keys, measures, link_groups):
+    work = df[keys].copy()
+    for name, values in measures.items():
+        work[name] = values
+    work[LINK_KEY] = pd.NaT
+    parts = [work]
+    for measure, group_keys in link_groups.items():
+        parts.append(_order_links(df, group_keys, measure, keys))
+    work = pd.concat(parts, ignore_index=True)
+    for name, values in measures.items():
+        work[name] = work[name].fillna(0).astype(values.dtype)
+    cube = work.groupby(keys + [LINK_KEY], dropna=False, observed=True).sum().reset_index()
+    return cube.sort_values('주문일자', kind='stable', ignore_index=True)
+
+
+def build_daily_rollup(df):
+    measures = {
+        '실결제 금액': df['실결제 금액'],
+        '결제건수': df['실결제 금액'].notna().astype(int),
+        '주문수': _first_order_flags(df, ['주문일자']).astype(int),
+        '셀러주문수': _first_order_flags(df, ['주문일자', '셀러명']).astype(int),
+    }
+    return _rollup(df, DAILY_KEYS, measures, {'주문수': [], '셀러주문수': ['셀러명']})
+
+
+def build_product_rollup(df):
+    measures = {'주문수': _first_order_flags(df, PRODUCT_KEYS).astype(int)}
+    return _rollup(df, PRODUCT_KEYS, measures, {'주문수': ['상품명']})
+
+
+def slice_rollup(cube, date_range):
+    mask = (cube['주문일자'] >= date_range[0]) & (cube['주문일자'] <= date_range[1])
+    mask &= ~(cube[LINK_KEY] < pd.Timestamp(date_range[0]))
+    return cube[mask]
+
+
+def rollup_kpis(cube):
+    total = cube['실결제 금액'].sum()
+    paid = cube['결제건수'].sum()
+    return {
+        '총 실결제 금액': total,
+        '평균 객단가': total / paid if paid else float('nan'),
+        '활발한 셀러 수': cube['셀러명'].nunique(),
+        '주문 건수': cube['주문수'].sum(),
+    }
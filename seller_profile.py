@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+# --- 셀러 프로필 (필터 상태당 한 번) ---
+# 셀러 단위 지표를 그래프마다 원본 행에서 따로 groupby 하지 않도록,
+# 걸러진 주문에서 셀러별 지표 표 하나와 셀러 × 범주 건수 표들을 한 번에 만든다.
+#   profile : 셀러별 주문행수/매출/주문 수/평균 단가/이벤트·선물 비중/재구매/주력 가격대
+#   variety, cancel : 셀러 × 품종 / 취소여부 건수 (셀러 코드 × 값 코드 bincount)
+#   region  : 지역 × 셀러 매출과 지역 내 점유율, 실제로 주문이 있는 조합만 담은 희소 (long) 표
+#   region_total : 지역별 전체 매출 (점유율 분모)
+# 셀러 순서는 groupby(셀러명) 과 같다 (범주 순서 또는 정렬 순서, 관측된 셀러만).
+SELLER_COL = '셀러명'
+REGION_COL = '광역지역(정식)'
+
+
+def _cells(seller_codes, values):
+    codes, uniques = pd.factorize(values, sort=True)
+    keep = (seller_codes >= 0) & (codes >= 0)
+    return seller_codes[keep] * len(uniques) + codes[keep], uniques
+
+
+def _crosstab(seller_codes, sellers, values):
+    cells, uniques = _cells(seller_codes, values)
+    counts = np.bincount(cells, minlength=len(sellers) * len(uniques))
+    return pd.DataFrame(counts.reshape(len(sellers), len(uniques)), index=sellers,
+                        columns=pd.Index(uniques, name=values.name))
+
+
+# 셀러별 최빈값: 같은 빈도면 그 셀러 주문에서 먼저 나온 값, 값이 없으면 NaN
+# (예전 value_counts(...).index[0] 은 같은 빈도의 순서를 정하지 않으므로, 최빈값이 하나일 때만 결과가 같다)
+def _seller_mode(seller_codes, sellers, values):
+    cells, uniques = _cells(seller_codes, values)
+    if not len(uniques):
+        return np.full(len(sellers), np.nan, dtype=object)
+    size = len(sellers) * len(uniques)
+    counts = np.bincount(cells, minlength=size)
+    first = np.full(size, len(cells), dtype=np.int64)
+    firsts = pd.Series(cells).drop_duplicates()
+    first[firsts.to_numpy()] = firsts.index
+    score = (counts * (len(cells) + 1) - first).reshape(len(sellers), len(uniques))
+    mode = np.asarray(uniques, dtype=object)[score.argmax(axis=1)]
+    return np.where(counts.reshape(len(sellers), len(uniques)).sum(axis=1) > 0, mode, np.nan)
+
+
+# 셀러 × 지역 희소 표: (지역, 셀러) 코드 조합 중 주문이 있는 것만 남긴다
+def _region_share(df, seller_codes, sellers):
+    region_codes, regions = pd.factorize(df[REGION_COL], sort=True)
+    keep = (seller_codes >= 0) & (region_codes >= 0)
+    cells = region_codes[keep] * len(sellers) + seller_codes[keep]
+    size = len(regions) * len(sellers)
+    counts = np.bincount(cells, minlength=size)
+    amounts = np.bincount(cells, weights=np.nan_to_num(df['실결제 금액'].to_numpy(dtype=float)[keep]), minlength=size)
+    observed = np.flatnonzero(counts)
+    region_of = observed // len(sellers)
+    totals = amounts.reshape(len(regions), len(sellers)).sum(axis=1)
+    share = pd.DataFrame({
+        REGION_COL: regions.take(region_of),
+        SELLER_COL: sellers.take(observed % len(sellers)),
+        '실결제 금액': amounts[observed],
+        '점유율(%)': amounts[observed] / totals[region_of] * 100,
+    })
+    active = counts.reshape(len(regions), len(sellers)).sum(axis=1) > 0
+    return share, pd.Series(totals[active], index=pd.Index(regions[active], name=REGION_COL), name='지역매출')
+
+
+def build_seller_profile(df):
+    seller_codes, sellers = pd.factorize(df[SELLER_COL], sort=True)
+    sellers = pd.Index(sellers, name=SELLER_COL)
+
+    agg = {
+        '주문행수': (SELLER_COL, 'size'),
+        '총매출': ('실결제 금액', 'sum'),
+        '결제건수': ('실결제 금액', 'count'),
+        '주문건수': ('주문번호', 'nunique'),
+        '평균판매단가': ('판매단가', 'mean'),
+        '이벤트비중': ('is_event_item', 'mean'),
+        '선물비중': ('is_gift_item', 'mean'),
+    }
+    if 'UID' in df.columns:
+        agg.update({'고객행수': ('UID', 'count'), '재구매수': ('is_reorder', 'sum')})
+    # 아래 코드 기반 표들과 같은 셀러 순서로 맞춘다 (groupby 결과 순서에 기대지 않고 라벨로 찾는다)
+    profile = df.groupby(SELLER_COL, observed=True).agg(**agg).reindex(sellers)
+    profile['평균결제액'] = profile['총매출'] / profile['결제건수']
+
+    # 주력 가격대 = 셀러가 가장 많이 판 단가_그룹
+    profile['주력_가격대'] = _seller_mode(seller_codes, sellers, df['단가_그룹'])
+
+    region, region_total = _region_share(df, seller_codes, sellers)
+    return {
+        'profile': profile,
+        'variety': _crosstab(seller_codes, sellers, df['품종']),
+        'cancel': _crosstab(seller_codes, sellers, df['취소여부']),
+        'region': region,
+        'region_total': region_total,
+    }
+
+
+# 주문 행마다 그 셀러의 프로필 값 (merge 대신 셀러 인덱스 위치로 찾는다, 프로필에 없는 셀러는 NaN)
+def seller_lookup(df, profile, col):
+    positions = profile.index.get_indexer(df[SELLER_COL])
+    values = profile[col].to_numpy(dtype=object)[positions]
+    return pd.Series(np.where(positions >= 0, values, np.nan), index=df.index, name=col)
+
+
+# 주문 행 수 기준 상위 셀러 (셀러 순서 그대로 돌려준다)
+# 경계에서 행 수가 같으면 셀러명 순으로 자른다. 예전 value_counts().head(n) 은 같은 빈도를 표의 행 순서
+# (처음 나온 셀러 먼저) 로 잘랐기 때문에 주문일 정렬 이후로는 결과가 행 순서에 따라 달라졌다.
+def top_sellers(profile, n):
+    ranking = pd.DataFrame({'rows': profile['주문행수'].to_numpy(), 'name': profile.index.astype(str)})
+    top = ranking.sort_values(['rows', 'name'], ascending=[False, True], kind='stable').index[:n]
+    return profile.index[np.sort(top)]
+
+
+# 셀러 × 범주 건수 표를 (셀러, 범주, 건수) long 형태로, 건수가 0 인 조합은 뺀다
+def crosstab_rows(table, sellers, name):
+    counts = table.loc[sellers]
+    rows = counts.stack().rename(name).reset_index()
+    return rows[rows[name] > 0].reset_index(drop=True)
+
+
+# 한 셀러의 지역별 점유율 (그 셀러 주문이 없는 지역은 0%), 어느 지역에도 주문이 없으면 None
+def region_share_of(sellers, seller):
+    region = sellers['region']
+    rows = region[region[SELLER_COL] == seller]
+    if rows.empty:
+        return None
+    totals = sellers['region_total']
+    return rows.set_index(REGION_COL)['실결제 금액'].reindex(totals.index, fill_value=0) / totals * 100
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# --- 부트스트랩 / 순열 검정 ---
+# 실험군과 대조군의 평균 차이(예: 취소율 차이)에 대한 신뢰구간과 p-value.
+# 지표가 0/1 처럼 값 종류가 적은 이산형이면 행 단위로 다시 뽑을 필요 없이 값별 개수만으로 재표본을 만든다.
+#   부트스트랩 : 층(셀러)×그룹 칸마다 다항분포로 값별 개수를 뽑는다 (칸 크기 유지)
+#   순열 검정  : 층마다 그룹 라벨을 섞는 것은 다변량 초기하분포로 실험군 값별 개수를 뽑는 것과 같다
+# 층화하면 전체 평균 차이 대신 층별 차이의 Mantel-Haenszel 가중 평균을 쓰므로 셀러 구성 차이가 빠진다
+# (실험군/대조군 평균도 같은 가중치로 표준화한 값).
+# 재표본 수 B 만큼을 한 번에 (B × 값 종류) 행렬로 뽑으므로 행 수가 늘어도 계산량은 거의 그대로다.
+N_RESAMPLES = 2000
+CONFIDENCE = 0.95
+MAX_LEVELS = 1000
+
+
+def _cell_counts(values, treat, strata):
+    codes, levels = pd.factorize(values, sort=True)
+    if len(levels) > MAX_LEVELS:
+        raise ValueError(f"값 종류가 너무 많습니다 ({len(levels)}개): 이산형 지표만 지원합니다")
+    if strata is None:
+        strata_codes, n_strata = np.zeros(len(values), dtype=np.intp), 1
+    else:
+        strata_codes, uniques = pd.factorize(strata, use_na_sentinel=False)
+        n_strata = len(uniques)
+    cells = (strata_codes * 2 + treat) * len(levels) + codes
+    counts = np.bincount(cells, minlength=n_strata * 2 * len(levels)).reshape(n_strata, 2, len(levels))
+    # counts[층, 0=대조군/1=실험군, 값]
+    return levels.astype(float), counts
+
+
+def _resampled_sums(rng, counts, levels, n_resamples):
+    # counts[층, 값] -> (재표본, 층) 별 값 합계
+    sums = np.zeros((n_resamples, len(counts)))
+    for i, cell in enumerate(counts):
+        n = cell.sum()
+        if n:
+            sums[:, i] = rng.multinomial(n, cell / n, size=n_resamples) @ levels
+    return sums
+
+
+# 층별 평균의 Mantel-Haenszel 가중 평균 (가중치 n1·n0/(n1+n0), 양쪽 그룹이 모두 있는 층만 넘어온다)
+# 층이 하나면 그대로 실험군/대조군 평균이다.
+def _weighted_means(treat_sums, control_sums, n_treat, n_control):
+    weights = n_treat * n_control / (n_treat + n_control)
+    weights = weights / weights.sum()
+    return (treat_sums / n_treat) @ weights, (control_sums / n_control) @ weights
+
+
+def two_sample_test(values, treat, strata=None, n_resamples=N_RESAMPLES, confidence=CONFIDENCE, seed=0):
+    values = np.asarray(values, dtype=float)
+    treat = np.asarray(treat, dtype=bool)
+    valid = ~np.isnan(values)
+    if not valid.all():
+        values, treat = values[valid], treat[valid]
+        strata = None if strata is None else np.asarray(strata, dtype=object)[valid]
+    levels, counts = _cell_counts(values, treat.astype(np.intp), strata)
+    # 한쪽 그룹만 있는 층은 층 안에서 비교할 수 없으므로 뺀다 (층화하지 않으면 층은 하나)
+    counts = counts[(counts[:, 0].sum(axis=1) > 0) & (counts[:, 1].sum(axis=1) > 0)]
+    cell_control, cell_treat = counts[:, 0].sum(axis=1), counts[:, 1].sum(axis=1)
+    n_control, n_treat = int(cell_control.sum()), int(cell_treat.sum())
+    result = {'실험군 평균': np.nan, '대조군 평균': np.nan, '차이': np.nan, '신뢰구간 하한': np.nan,
+              '신뢰구간 상한': np.nan, 'p-value': np.nan, '실험군 수': n_treat, '대조군 수': n_control,
+              '재표본 수': n_resamples, '층화': strata is not None, '층 수': len(counts)}
+    if n_treat == 0 or n_control == 0:
+        return result
+
+    # 관측값, 부트스트랩, 순열 분포 모두 같은 통계량(층별 차이의 가중 평균)으로 계산한다
+    rng = np.random.default_rng(seed)
+    treat_mean, control_mean = _weighted_means(counts[:, 1] @ levels, counts[:, 0] @ levels, cell_treat, cell_control)
+    observed = treat_mean - control_mean
+
+    # 부트스트랩: 칸(층 × 그룹)별로 크기를 유지하며 다시 뽑는다
+    boot_treat, boot_control = _weighted_means(_resampled_sums(rng, counts[:, 1], levels, n_resamples),
+                                               _resampled_sums(rng, counts[:, 0], levels, n_resamples),
+                                               cell_treat, cell_control)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(boot_treat - boot_control, [tail, 100 - tail])
+
+    # 순열 검정: 층 안에서 라벨을 섞었을 때 실험군에 들어가는 값별 개수 (귀무가설 아래 통계량은 0 을 중심으로 분포)
+    perm_treat = np.zeros((n_resamples, len(counts)))
+    for i, cell in enumerate(counts):
+        perm_treat[:, i] = rng.multivariate_hypergeometric(cell.sum(axis=0), cell_treat[i], size=n_resamples) @ levels
+    perm_treat_mean, perm_control_mean = _weighted_means(perm_treat, counts.sum(axis=1) @ levels - perm_treat,
+                                                         cell_treat, cell_control)
+    perm = perm_treat_mean - perm_control_mean
+    p_value = (1 + np.sum(np.abs(perm) >= abs(observed) - 1e-12)) / (n_resamples + 1)
+
+    result.update({'실험군 평균': treat_mean, '대조군 평균': control_mean, '차이': observed,
+                   '신뢰구간 하한': low, '신뢰구간 상한': high, 'p-value': p_value})
+    return result
@@ -0,0 +1,9 @@
+import pytest
+
+from order_generator import write_orders
+
+
+# 합성 주문 CSV (원본 스키마, 작은 행 수)
+@pytest.fixture
+def orders_csv(tmp_path):
+    return write_orders(str(tmp_path / "orders.csv"), 3000, seed=1)
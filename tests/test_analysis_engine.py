@@ -0,0 +1,71 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import analysis_engine
+from analysis_engine import CHECKS, SEGMENT_ALL, month_windows, open_results, run_batch, run_check
+from data_loader import dataset_version, load_orders
+from filter_engine import OrderFilter
+
+
+@pytest.fixture
+def batch(orders_csv, tmp_path, monkeypatch):
+    # 워커가 물려받는 모듈 전역 데이터 소스를 테스트마다 새로 연다
+    monkeypatch.setattr(analysis_engine, '_source', None)
+    analysis_engine._read_window.cache_clear()
+    orders = OrderFilter(load_orders(orders_csv))
+    first, last = orders.df['주문일자'].min(), orders.df['주문일자'].max()
+    windows = [(first, last)] + month_windows(first, last)[:2]
+    seller = orders.df['셀러명'].value_counts().index[0]
+    root = run_batch(windows, [SEGMENT_ALL, seller], tuple(CHECKS), orders_csv, out=str(tmp_path / "results"), workers=2)
+    return orders, windows, seller, root
+
+
+def _comparable(table):
+    table = table.reset_index(drop=True)
+    for col in table.columns:
+        if isinstance(table[col].dtype, pd.CategoricalDtype):
+            table[col] = table[col].astype(object)
+    return table
+
+
+def test_precomputed_checks_equal_live_results(batch, orders_csv):
+    orders, windows, seller, root = batch
+    results = open_results(root)
+    assert results.version == dataset_version(orders_csv)
+    for window in windows:
+        for segment in (SEGMENT_ALL, seller):
+            filters = None if segment == SEGMENT_ALL else {'셀러명': [segment]}
+            df = orders.select(window, filters=filters)
+            for check in CHECKS:
+                stored = results.get(check, window, segment, version=results.version)
+                live = run_check(check, df)
+                assert set(stored) == set(live), check
+                for name, table in live.items():
+                    if not len(table):
+                        assert not len(stored[name]), (check, name)
+                        continue
+                    pd.testing.assert_frame_equal(_comparable(stored[name]), _comparable(table),
+                                                  check_dtype=False, obj=f"{check}/{name}")
+
+
+def test_other_data_version_falls_back_to_live_computation(batch):
+    _, windows, _, root = batch
+    results = open_results(root)
+    assert results.get('h2', windows[0], version=results.version) is not None
+    assert results.get('h2', windows[0], version='other') is None
+    # 계산하지 않은 기간/검증도 None
+    assert results.get('h2', (pd.Timestamp('2000-01-01'), pd.Timestamp('2000-01-31'))) is None
+
+    manifest_path = os.path.join(root, "manifest.json")
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({**manifest, 'version': 'stale'}, f)
+    assert open_results(root).get('h2', windows[0], version=results.version) is None
+
+
+def test_missing_result_store_opens_as_none(tmp_path):
+    assert open_results(str(tmp_path / "missing")) is None
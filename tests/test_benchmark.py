@@ -0,0 +1,25 @@
+import json
+
+from benchmark import compare_results, run_benchmark
+
+
+def test_small_benchmark_run(tmp_path):
+    path = run_benchmark([2000], repeat=1, memory=False, out=str(tmp_path / "results"), data_dir=str(tmp_path / "data"))
+    with open(path, encoding='utf-8') as f:
+        result = json.load(f)
+    stages = {record['stage'] for record in result['results']}
+    assert {'load.preprocess', 'filter.date_all', 'rollup.build', 'tab.trend', 'tab.eda', 'tab.hypothesis',
+            'tab.ab', 'tab.data', 'export.parquet', 'store.build', 'store.aggregate'} <= stages
+    assert all(record['rows'] == 2000 and record['seconds'] >= 0 for record in result['results'])
+
+    table = compare_results(path, path)
+    assert not table['회귀'].any()
+
+
+def test_stage_selection_and_memory(tmp_path):
+    path = run_benchmark([1000], stages=['load', 'filter'], out=str(tmp_path / "results"),
+                         data_dir=str(tmp_path / "data"))
+    with open(path, encoding='utf-8') as f:
+        records = json.load(f)['results']
+    assert records and all(record['stage'].split('.')[0] in ('load', 'filter') for record in records)
+    assert all(record['peak_mb'] > 0 for record in records)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import box_figure, box_stats, scatter_figure
+
+
+def _frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    group = rng.choice(['1-3만원대', '3-5만원대', '10만원 이상'], n, p=[0.5, 0.3, 0.2])
+    amount = rng.lognormal(10, 0.6, n)
+    amount[rng.random(n) < 0.02] = np.nan
+    return pd.DataFrame({'그룹': group, '금액': amount})
+
+
+def test_summarized_box_matches_raw_quartiles():
+    df = _frame()
+    fig = box_figure(df, '그룹', '금액', row_limit=100)
+    boxes = [trace for trace in fig.data if trace.type == 'box']
+    assert [trace.x[0] for trace in boxes] == list(pd.unique(df['그룹']))
+    for trace in boxes:
+        values = df.loc[df['그룹'] == trace.x[0], '금액'].dropna().to_numpy()
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        assert trace.y is None
+        np.testing.assert_allclose([trace.q1[0], trace.median[0], trace.q3[0]], [q1, median, q3])
+        inside = values[(values >= q1 - 1.5 * (q3 - q1)) & (values <= q3 + 1.5 * (q3 - q1))]
+        assert (trace.lowerfence[0], trace.upperfence[0]) == (inside.min(), inside.max())
+
+
+def test_box_outliers_are_thinned_but_keep_extremes():
+    df = _frame(20000, seed=1)
+    stats = box_stats(df, '그룹', '금액', max_outliers=50).set_index('그룹')
+    for key, row in stats.iterrows():
+        values = df.loc[df['그룹'] == key, '금액'].dropna().to_numpy()
+        outside = np.sort(values[(values < row['lowerfence']) | (values > row['upperfence'])])
+        assert len(row['outliers']) == min(len(outside), 50)
+        assert set(row['outliers']) <= set(outside)
+        assert (row['outliers'][0], row['outliers'][-1]) == (outside[0], outside[-1])
+
+
+def test_small_inputs_keep_raw_figures():
+    df = _frame(200)
+    box = box_figure(df, '그룹', '금액', row_limit=500)
+    assert sum(len(trace.y) for trace in box.data) == len(df)
+    scatter = scatter_figure(df.dropna(), '금액', '금액', row_limit=500)
+    assert len(scatter.data[0].x) == len(df.dropna())
+
+
+def test_scatter_sample_is_fixed_and_capped():
+    df = _frame().dropna()
+    first = scatter_figure(df, '금액', '금액', row_limit=300)
+    second = scatter_figure(df, '금액', '금액', row_limit=300)
+    assert len(first.data[0].x) == 300
+    assert list(first.data[0].x) == list(second.data[0].x)
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+from data_loader import (EVENT_KEYWORDS, GIFT_KEYWORDS, NUM_COLS, PRICE_BINS, PRICE_LABELS, REORDER_KEEP, TIME_BINS,
+                         TIME_LABELS, apply_customer_state, bucketize, build_orders, compact_orders, customer_state,
+                         derive_order_columns, load_orders, match_keywords, merge_customer_state, snapshot_is_fresh)
+from order_generator import write_orders
+
+
+def test_snapshot_is_reused(orders_csv):
+    first = load_orders(orders_csv)
+    assert snapshot_is_fresh(orders_csv)
+    assert len(load_orders(orders_csv)) == len(first)
+
+
+def test_csv_replaced_while_parsing_is_not_marked_fresh(orders_csv, monkeypatch):
+    build_orders = data_loader.build_orders
+
+    def build_then_replace(file_path, compact=True):
+        df = build_orders(file_path, compact)
+        # 파싱이 끝난 뒤 스냅샷을 쓰기 전에 원본이 바뀐 경우
+        write_orders(file_path, 1000, seed=5)
+        return df
+
+    monkeypatch.setattr(data_loader, 'build_orders', build_then_replace)
+    stale = load_orders(orders_csv)
+    monkeypatch.setattr(data_loader, 'build_orders', build_orders)
+
+    assert len(stale) == 3000
+    assert not snapshot_is_fresh(orders_csv)
+    assert len(load_orders(orders_csv)) == 1000
+    assert snapshot_is_fresh(orders_csv)
+
+
+# --- 벡터화 구간/키워드 플래그 vs 기존 행 단위 구현 (apply + if/elif, str.contains 의 NaN -> False) ---
+def _old_price_group(price):
+    if price < 10000: return '1만원 미만'
+    elif price < 30000: return '1-3만원대'
+    elif price < 50000: return '3-5만원대'
+    elif price < 100000: return '5-10만원대'
+    else: return '10만원 이상'
+
+
+def _old_time_group(hour):
+    if 0 <= hour < 6: return '새벽 (00-06)'
+    elif 6 <= hour < 12: return '오전 (06-12)'
+    elif 12 <= hour < 18: return '오후 (12-18)'
+    elif 18 <= hour < 21: return '저녁 (18-21)'
+    else: return '야간 (21-24)'
+
+
+def test_price_buckets_match_row_wise_rules():
+    prices = pd.Series([-5000, 0, 9999.99, 10000, 10000.01, 29999, 30000, 49999.5, 50000, 99999, 100000,
+                        1e9, np.nan, np.inf, -np.inf])
+    new = bucketize(prices, PRICE_BINS, PRICE_LABELS)
+    assert list(new.astype(str)) == list(prices.apply(_old_price_group))
+
+
+def test_time_buckets_match_row_wise_rules():
+    hours = pd.Series(list(range(24)) + [24, 30, -1, np.nan], dtype=float)
+    new = bucketize(hours, TIME_BINS, TIME_LABELS)
+    assert list(new.astype(str)) == list(hours.apply(_old_time_group))
+
+
+def test_keyword_flags_match_str_contains():
+    names = pd.Series(['[1+1] 감귤', '감귤 11kg', '1+1', '증정 이벤트', '폭탄세일 한라봉', '특가', '한정판',
+                       '추가발송', '선물용 레드향', '포장 없음', '선물세트', '', np.nan, '일반 감귤', '1 + 1', '이벤'],
+                      dtype=object)
+    for pattern in (EVENT_KEYWORDS, GIFT_KEYWORDS):
+        old = names.str.contains(pattern, na=False).astype(bool).to_numpy()
+        assert (match_keywords(names, pattern) == old).all()
+
+    gift_flags = pd.Series(['Y', 'N', '세트', '선물', np.nan, '', '선물세트'], dtype=object)
+    old = gift_flags.str.contains('선물|세트', na=False).astype(bool).to_numpy()
+    assert (match_keywords(gift_flags, '선물|세트') == old).all()
+
+
+def test_keyword_flags_on_empty_and_all_missing_columns():
+    assert len(match_keywords(pd.Series([], dtype=object), EVENT_KEYWORDS)) == 0
+    assert not match_keywords(pd.Series([np.nan, np.nan], dtype=object), EVENT_KEYWORDS).any()
+
+
+def test_derived_flags_match_row_wise_loader(orders_csv):
+    raw = pd.read_csv(orders_csv)
+    df = derive_order_columns(raw.copy())
+    event = (df['상품명'].str.contains(EVENT_KEYWORDS, na=False) | (df['이벤트 여부'] == 'Y')).astype(bool)
+    gift = (df['상품명'].str.contains(GIFT_KEYWORDS, na=False)
+            | df['선물세트_여부'].str.contains('선물|세트', na=False)).astype(bool)
+    assert (df['is_event_item'].to_numpy() == event.to_numpy()).all()
+    assert (df['is_gift_item'].to_numpy() == gift.to_numpy()).all()
+    assert list(df['단가_그룹'].astype(str)) == list(df['판매단가'].apply(_old_price_group))
+    assert list(df['시간대_구간'].astype(str)) == list(df['시간대'].apply(_old_time_group))
+
+
+def _as_plain(series):
+    return series.astype(object) if isinstance(series.dtype, pd.CategoricalDtype) else series
+
+
+def test_compacted_groupby_sums_and_means_match_uncompacted(orders_csv):
+    plain, compact = build_orders(orders_csv, compact=False), build_orders(orders_csv, compact=True)
+    assert (compact.dtypes == np.int32).any()
+    # 일부 범주가 관측되지 않는 부분집합에서도 같아야 한다 (관측된 그룹만)
+    subset = plain['주문일자'] <= plain['주문일자'].quantile(0.1)
+    for key in ['셀러명', '품종', '무게 구분', '광역지역(정식)', '취소여부']:
+        for rows in (slice(None), subset):
+            expected = plain[rows].groupby(key)[NUM_COLS].agg(['sum', 'mean'])
+            result = compact[rows].groupby(key, observed=True)[NUM_COLS].agg(['sum', 'mean'])
+            result.index = _as_plain(result.index.to_series())
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False)
+
+
+def test_int32_columns_do_not_overflow_when_summed():
+    # 합계가 int32 범위를 넘는 경우 (pandas 는 int64 로 더한 뒤 범위 안일 때만 int32 로 돌려준다)
+    df = pd.DataFrame({'셀러명': ['가', '나'] * 1000, '실결제 금액': [2_000_000_000.0, 1.0] * 1000})
+    compact = compact_orders(df)
+    assert compact['실결제 금액'].dtype == np.int32
+    total = compact.groupby('셀러명', observed=True)['실결제 금액'].sum()
+    assert total['가'] == 2_000_000_000 * 1000
+    assert compact['실결제 금액'].sum() == 2_000_000_000 * 1000 + 1000
+    assert compact.groupby('셀러명', observed=True)['실결제 금액'].mean()['가'] == 2_000_000_000
+
+
+def test_customer_state_keeps_two_orders_per_seller_customer(orders_csv):
+    df = derive_order_columns(pd.read_csv(orders_csv))
+    chunks = [df.iloc[start:start + 400] for start in range(0, len(df), 400)]
+    state = None
+    for chunk in chunks:
+        state = merge_customer_state(state, customer_state(chunk))
+    first_dates, orders = state
+    assert orders.groupby(['셀러명', 'UID']).size().max() <= REORDER_KEEP
+    # 청크로 나눠 줄인 상태로도 전체를 한 번에 본 결과와 같다
+    expected = apply_customer_state(df.copy(), customer_state(df))
+    result = apply_customer_state(df.copy(), state)
+    assert expected['is_reorder'].any()
+    pd.testing.assert_series_equal(result['is_reorder'], expected['is_reorder'])
+    pd.testing.assert_series_equal(result['is_first_purchase'], expected['is_first_purchase'])
@@ -0,0 +1,72 @@
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_view import EXPORT_FORMATS, export_file, page_rows, sort_positions
+
+
+def _frame(n=23):
+    rng = np.random.default_rng(0)
+    price = rng.integers(0, 5, n).astype(float)
+    price[::7] = np.nan
+    return pd.DataFrame({'주문번호': np.arange(n), '가격': price, '상품명': [f'상품{i % 4}' for i in range(n)]},
+                        index=np.arange(n) * 10)
+
+
+def test_page_rows_last_partial_page_and_past_end():
+    df = _frame(23)
+    assert list(page_rows(df, None, 2, 10)['주문번호']) == [20, 21, 22]
+    assert page_rows(df, None, 3, 10).empty
+    positions = sort_positions(df, '주문번호', ascending=False)
+    assert list(page_rows(df, positions, 2, 10)['주문번호']) == [2, 1, 0]
+
+
+def test_page_rows_empty_frame():
+    df = _frame(0)
+    assert page_rows(df, None, 0, 50).empty
+    assert page_rows(df, sort_positions(df, '가격'), 0, 50).empty
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+@pytest.mark.parametrize('col', ['가격', '상품명'])
+def test_sort_positions_matches_sort_values(col, ascending):
+    df = _frame()
+    positions = sort_positions(df, col, ascending=ascending)
+    expected = df.sort_values(col, ascending=ascending, kind='stable', na_position='last')
+    pd.testing.assert_frame_equal(page_rows(df, positions, 0, len(df)), expected)
+
+
+def test_sort_positions_without_column_keeps_order():
+    df = _frame()
+    assert sort_positions(df) is None
+    pd.testing.assert_frame_equal(page_rows(df, None, 0, len(df)), df)
+
+
+def _read_export(data, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(io.BytesIO(data))
+    if fmt == 'csv.gz':
+        data = gzip.decompress(data)
+    assert data.startswith(b'\xef\xbb\xbf')
+    return pd.read_csv(io.BytesIO(data), encoding='utf-8-sig')
+
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS))
+@pytest.mark.parametrize('n', [0, 23])
+def test_export_file_round_trips(fmt, n):
+    df = _frame(n)
+    # 여러 청크로 나뉘어도 헤더는 한 번만
+    data = export_file(df, fmt, chunk_rows=5)
+    # st.download_button 이 받는 형식
+    assert isinstance(data, bytes)
+    back = _read_export(data, fmt)
+    assert list(back.columns) == list(df.columns)
+    assert len(back) == n
+    if n:
+        expected = df.reset_index(drop=True)
+        pd.testing.assert_series_equal(back['주문번호'], expected['주문번호'], check_dtype=False)
+        pd.testing.assert_series_equal(back['가격'], expected['가격'], check_dtype=False)
+        assert list(back['상품명']) == list(expected['상품명'])
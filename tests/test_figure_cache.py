@@ -0,0 +1,58 @@
+from datetime import date
+
+import pandas as pd
+import plotly.express as px
+
+from figure_cache import FigureCache, estimate_bytes, filter_state, section_key
+
+BOUNDS = (date(2025, 9, 1), date(2026, 1, 31))
+
+
+def test_equivalent_filter_states_share_a_key():
+    default = filter_state(BOUNDS, [], BOUNDS)
+    assert filter_state((date(2025, 1, 1), date(2026, 12, 31)), [], BOUNDS) == default
+    assert (filter_state(BOUNDS, [['선물', '감귤'], ['한라봉'], ['감귤', '선물', '감귤']], BOUNDS)
+            == filter_state(BOUNDS, [['한라봉'], ['감귤', '선물']], BOUNDS))
+    assert filter_state((date(2025, 10, 1), BOUNDS[1]), [], BOUNDS) != default
+
+
+def test_key_includes_data_version():
+    state = filter_state(BOUNDS, [], BOUNDS)
+    cache = FigureCache()
+    built = []
+    value, cached = cache.get_or_build(section_key('sellers', state, 'v1'), lambda: built.append(1) or 'v1 표')
+    assert (value, cached) == ('v1 표', False)
+    assert cache.get_or_build(section_key('sellers', state, 'v1'), lambda: built.append(1) or 'x') == ('v1 표', True)
+    # 새 데이터 버전은 같은 섹션·필터 상태라도 다시 만든다
+    value, cached = cache.get_or_build(section_key('sellers', state, 'v2'), lambda: built.append(1) or 'v2 표')
+    assert (value, cached) == ('v2 표', False)
+    assert len(built) == 2
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_least_recently_used_entries_are_evicted_at_the_limit():
+    cache = FigureCache(max_bytes=300)
+    for name in 'abc':
+        cache.put(name, name, size=100)
+    assert cache.get('a') == ('a', 100)
+    cache.put('d', 'd', size=100)
+    # 'b' 가 가장 오래 쓰이지 않았다
+    assert cache.get('b') is None
+    assert [cache.get(name)[0] for name in 'acd'] == list('acd')
+    assert (cache.size, cache.evictions) == (300, 1)
+
+    # 같은 키를 다시 넣으면 크기를 바꿔 센다
+    cache.put('a', 'a', size=250)
+    assert cache.size <= 300 and cache.get('a') == ('a', 250)
+
+    # 캐시보다 큰 결과는 넣지 않고 다른 항목도 밀어내지 않는다
+    before = len(cache)
+    cache.put('huge', 'huge', size=301)
+    assert cache.get('huge') is None and len(cache) == before
+
+
+def test_estimated_sizes():
+    frame = pd.DataFrame({'셀러명': ['가', '나'] * 500, '매출': range(1000)})
+    assert estimate_bytes(frame) == frame.memory_usage(deep=True).sum()
+    assert estimate_bytes({'표': frame}) > estimate_bytes(frame)
+    assert estimate_bytes(px.bar(x=[1, 2], y=[3, 4])) > 0
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_engine import KeywordIndex, OrderFilter, parse_keywords
+
+NAMES = ['제주 감귤 5kg', '한라봉 선물세트', '레드향 [특가]', '감귤 선물용 3kg', 'A급 천혜향', '황금향', 'a급 귤', '귤']
+
+
+def _orders(seed=0, n=2000):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 20 * 24 * 60, n), unit='min')
+    names = rng.choice(NAMES + [None], n)
+    return pd.DataFrame({'주문일': dates, '상품명': names, '셀러명': rng.choice(['가', '나', '다'], n)})
+
+
+# 기존 방식: 날짜 비교 마스크 + 묶음별 str.contains
+def _baseline(df, date_range=None, groups=None):
+    mask = pd.Series(True, index=df.index)
+    if date_range is not None:
+        days = df['주문일'].dt.normalize()
+        start, end = (pd.Timestamp(d).normalize() for d in date_range)
+        mask &= (days >= start) & (days <= end)
+    if groups:
+        names = df['상품명'].str.lower()
+        matched = pd.Series(False, index=df.index)
+        for terms in groups:
+            both = pd.Series(True, index=df.index)
+            for term in terms:
+                both &= names.str.contains(term, regex=False, na=False)
+            matched |= both
+        mask &= matched
+    return df[mask]
+
+
+@pytest.fixture
+def engine():
+    df = _orders()
+    # 정렬되지 않은 입력도 주문일 순으로 정렬해 쓴다
+    return OrderFilter(df.sample(frac=1, random_state=0))
+
+
+def _date_ranges(df):
+    first, last = df['주문일'].min().normalize(), df['주문일'].max().normalize()
+    return [
+        (first, last),
+        (first, first),
+        (last, last),
+        (first + pd.Timedelta(days=3), first + pd.Timedelta(days=9)),
+        # 시각이 붙은 경계는 그 날 전체로 본다
+        (first + pd.Timedelta(days=3, hours=15), first + pd.Timedelta(days=9, hours=1)),
+        # 데이터가 없는 범위
+        (first - pd.Timedelta(days=10), first - pd.Timedelta(days=1)),
+        (last + pd.Timedelta(days=1), last + pd.Timedelta(days=5)),
+        (first - pd.Timedelta(days=10), last + pd.Timedelta(days=10)),
+    ]
+
+
+def test_date_slicing_matches_mask(engine):
+    assert engine.df['주문일'].is_monotonic_increasing
+    for date_range in _date_ranges(engine.df):
+        result = engine.select(date_range)
+        pd.testing.assert_frame_equal(result, _baseline(engine.df, date_range))
+    pd.testing.assert_frame_equal(engine.select(), engine.df)
+
+
+@pytest.mark.parametrize('text', [
+    '귤',                   # n-gram 길이보다 짧은 검색어
+    'A',                    # 대소문자 무시
+    '감귤',
+    '감귤, 한라봉',          # OR
+    '감귤 & 선물',           # AND
+    '감귤 & 선물, 레드향',    # AND + OR
+    '[특가]',
+    '선물 & 황금향',          # AND 결과 없음
+    '망고',                  # 일치하는 상품명 없음
+    '귤, 망고 & 귤',
+])
+def test_keyword_filter_matches_str_contains(engine, text):
+    groups = parse_keywords(text)
+    for date_range in [None] + _date_ranges(engine.df):
+        result = engine.select(date_range, keywords=groups)
+        pd.testing.assert_frame_equal(result, _baseline(engine.df, date_range, groups))
+
+
+def test_keyword_and_value_filters_combine(engine):
+    groups = parse_keywords('감귤, 천혜향')
+    date_range = _date_ranges(engine.df)[3]
+    result = engine.select(date_range, filters={'셀러명': ['가', '다']}, keywords=groups)
+    expected = _baseline(engine.df, date_range, groups)
+    pd.testing.assert_frame_equal(result, expected[expected['셀러명'].isin(['가', '다'])])
+
+
+def test_keyword_index_matches_substring_scan():
+    index = KeywordIndex(NAMES)
+    for term in ['귤', '감귤', 'a급', '5kg', ' ', '선물세트', '향', '없는말']:
+        assert index.match([[term]]) == [name for name in NAMES if term in name.lower()]
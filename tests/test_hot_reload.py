@@ -0,0 +1,73 @@
+import os
+
+from hot_reload import HotReloader, MemoryGeneration, StoreGeneration, file_signature, watched_paths
+from order_generator import write_orders
+
+
+def _replace_csv(path, seed):
+    # 다른 내용으로 바꾸고 mtime 도 확실히 달라지게 한다
+    write_orders(path, 2000, seed=seed)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_old_store_generation_survives_rebuild(orders_csv, tmp_path):
+    root = str(tmp_path / "store")
+    old = StoreGeneration(orders_csv, root)
+    whole = (old.min_date, old.max_date)
+    expected = len(old.store.read(whole))
+
+    _replace_csv(orders_csv, seed=2)
+    new = StoreGeneration(orders_csv, root)
+    assert new.version != old.version
+    assert new.path != old.path
+
+    # 저장소가 다시 만들어진 뒤에도 이전 세대는 자기 스냅샷을 끝까지 읽는다
+    assert len(old.store.read(whole)) == expected
+    assert len(old.read_period(whole).df) == expected
+    assert old.store.aggregate(['주문월'], {'셀러명': ('셀러명', 'nunique')})['셀러명'].gt(0).all()
+    assert len(new.store.read((new.min_date, new.max_date))) == 2000
+
+
+def test_store_snapshot_removed_when_generation_released(orders_csv, tmp_path):
+    generation = StoreGeneration(orders_csv, str(tmp_path / "store"))
+    path = generation.path
+    assert os.path.isdir(path)
+    del generation
+    assert not os.path.exists(path)
+
+
+def test_store_generation_signature_matches_watched_files(orders_csv, tmp_path):
+    root = str(tmp_path / "store")
+    generation = StoreGeneration(orders_csv, root)
+    assert generation.signature == file_signature(watched_paths(orders_csv, root, partitioned=True))
+
+
+def test_change_during_build_is_reloaded(orders_csv):
+    changed = []
+
+    def build():
+        generation = MemoryGeneration(orders_csv)
+        # 첫 세대를 만드는 도중에 원본이 바뀐 경우
+        if not changed:
+            _replace_csv(orders_csv, seed=3)
+            changed.append(True)
+        return generation
+
+    reloader = HotReloader(watched_paths(orders_csv), build, poll_seconds=0)
+    first = reloader.current
+    assert reloader.signature != file_signature(reloader.paths)
+    assert reloader.reload()
+    assert reloader.current.version != first.version
+    assert reloader.signature == file_signature(reloader.paths)
+
+
+def test_failed_reload_keeps_current_generation(orders_csv):
+    reloader = HotReloader(watched_paths(orders_csv), lambda: MemoryGeneration(orders_csv), poll_seconds=0)
+    current = reloader.current
+    with open(orders_csv, 'w', encoding='utf-8') as f:
+        f.write("not,an,order,file\n1,2,3,4\n")
+    assert not reloader.reload()
+    assert reloader.current is current
+    assert reloader.last_error
+    assert reloader.signature == file_signature(reloader.paths)
@@ -0,0 +1,58 @@
+import pandas as pd
+
+from data_loader import build_orders
+from order_generator import COLUMNS, generate_orders, parse_rows, write_orders
+
+N_ROWS = 20_000
+
+
+def test_same_seed_is_deterministic():
+    pd.testing.assert_frame_equal(generate_orders(N_ROWS, seed=3), generate_orders(N_ROWS, seed=3))
+    assert not generate_orders(N_ROWS, seed=3).equals(generate_orders(N_ROWS, seed=4))
+
+
+def test_written_file_is_deterministic(tmp_path):
+    a = write_orders(str(tmp_path / "a.csv"), 5000, seed=2, chunk_rows=2000)
+    b = write_orders(str(tmp_path / "b.csv"), 5000, seed=2, chunk_rows=2000)
+    with open(a, 'rb') as fa, open(b, 'rb') as fb:
+        assert fa.read() == fb.read()
+
+
+def test_chunks_form_one_dataset(tmp_path):
+    df = pd.read_csv(write_orders(str(tmp_path / "orders.csv"), 5000, seed=2, chunk_rows=2000))
+    assert list(df.columns) == COLUMNS
+    assert len(df) == 5000
+    # 청크가 달라도 주문번호가 겹치지 않는다
+    ranges = df.groupby(df.index // 2000)['주문번호'].agg(['min', 'max'])
+    assert (ranges['max'].to_numpy()[:-1] < ranges['min'].to_numpy()[1:]).all()
+
+
+def test_raw_format_matches_loader_schema():
+    df = generate_orders(N_ROWS, seed=0)
+    assert list(df.columns) == COLUMNS
+    assert len(df) == N_ROWS
+    for col in ('이벤트 여부', '취소여부'):
+        assert set(df[col].unique()) <= {'Y', 'N'}
+    assert df['판매단가'].str.contains(',').any()
+
+
+def test_distribution_shape(tmp_path):
+    df = build_orders(write_orders(str(tmp_path / "orders.csv"), N_ROWS, seed=0))
+    # 상위 셀러 쏠림
+    share = df['셀러명'].value_counts(normalize=True)
+    assert share.head(10).sum() > 0.4
+    # 고단가 취소율이 높고 이벤트 상품은 낮다
+    high = df['판매단가'] >= 50_000
+    assert df.loc[high, 'is_cancelled'].mean() > 2 * df.loc[~high, 'is_cancelled'].mean()
+    assert df.loc[df['is_event_item'], 'is_cancelled'].mean() < df.loc[~df['is_event_item'], 'is_cancelled'].mean()
+    # 저녁 시간대가 새벽보다 많고, 여러 행으로 된 주문이 있다
+    hours = df['시간대_구간'].value_counts()
+    assert hours['저녁 (18-21)'] > hours['새벽 (00-06)']
+    assert df['주문번호'].duplicated().any()
+
+
+def test_parse_rows():
+    assert parse_rows('100k') == 100_000
+    assert parse_rows('1m') == 1_000_000
+    assert parse_rows('2.5k') == 2_500
+    assert parse_rows('1234') == 1234
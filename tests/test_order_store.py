@@ -0,0 +1,78 @@
+import pytest
+
+import order_store
+from order_generator import write_orders
+from order_store import append_orders, open_store, snapshot_store
+
+
+@pytest.fixture
+def store_root(orders_csv, tmp_path):
+    root = str(tmp_path / "store")
+    open_store(orders_csv, root)
+    return root
+
+
+@pytest.fixture
+def delta_csv(tmp_path):
+    return write_orders(str(tmp_path / "delta.csv"), 500, seed=7)
+
+
+def _rows(root):
+    return order_store.PartitionedOrders(root).dataset.count_rows()
+
+
+def test_append_adds_rows_once(store_root, delta_csv):
+    assert append_orders(delta_csv, store_root) == 500
+    assert _rows(store_root) == 3500
+    assert append_orders(delta_csv, store_root) == 0
+    assert _rows(store_root) == 3500
+
+
+def test_interrupted_append_leaves_store_untouched(orders_csv, store_root, delta_csv, monkeypatch):
+    before = order_store._read_store_meta(store_root)
+    write_meta = order_store._write_store_meta
+
+    def crash(root, meta):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(order_store, '_write_store_meta', crash)
+    with pytest.raises(KeyboardInterrupt):
+        append_orders(delta_csv, store_root)
+    monkeypatch.setattr(order_store, '_write_store_meta', write_meta)
+
+    assert order_store._read_store_meta(store_root) == before
+    assert _rows(store_root) == 3000
+
+    # 다시 실행하면 한 번만 반영되고 고객 상태도 한 번만 합쳐진다
+    assert append_orders(delta_csv, store_root) == 500
+    assert _rows(store_root) == 3500
+    first_dates, orders = order_store._load_state(store_root)
+    assert not orders.duplicated().any()
+
+
+def test_interrupted_swap_is_recovered(orders_csv, store_root, delta_csv, monkeypatch):
+    replace = order_store.os.replace
+    calls = []
+
+    # 저장소 교체의 두 rename 사이에서 멈춘 경우
+    def crash_second_rename(src, dst):
+        if dst == store_root:
+            calls.append(src)
+            raise KeyboardInterrupt
+        replace(src, dst)
+
+    monkeypatch.setattr(order_store.os, 'replace', crash_second_rename)
+    with pytest.raises(KeyboardInterrupt):
+        append_orders(delta_csv, store_root)
+    monkeypatch.setattr(order_store.os, 'replace', replace)
+
+    assert calls
+    assert open_store(orders_csv, store_root).version.endswith('-r1')
+    assert _rows(store_root) == 3500
+
+
+def test_snapshot_keeps_contents_after_append(store_root, delta_csv, tmp_path):
+    snapshot = snapshot_store(store_root, str(tmp_path / "snapshot"))
+    append_orders(delta_csv, store_root)
+    assert len(snapshot.read()) == 3000
+    assert _rows(store_root) == 3500
@@ -0,0 +1,52 @@
+import json
+
+import plotly.express as px
+import pytest
+
+from profiler import RunProfile, figure_bytes
+
+
+def test_disabled_profile_records_nothing():
+    prof = RunProfile(enabled=False)
+    with prof.section("a", rows=10) as record:
+        assert record is None
+    assert prof.section("a") is prof.section("b")
+    assert prof.records == []
+    assert prof.table().empty
+
+
+def test_nested_sections_record_parent_rows_and_figure_size():
+    prof = RunProfile(enabled=True)
+    fig = px.bar(x=['가', '나'], y=[1, 2])
+    with prof.section("탭", 'section', rows=100) as outer:
+        outer['cached'] = False
+        with prof.section("그래프", 'render', figure=fig):
+            pass
+    inner, outer = prof.records
+    assert (inner['section'], inner['phase'], inner['parent']) == ("그래프", 'render', "탭")
+    assert inner['figure_bytes'] == figure_bytes(fig) > 0
+    assert (outer['parent'], outer['rows'], outer['cached']) == (None, 100, False)
+    assert outer['seconds'] >= inner['seconds'] >= 0
+    assert list(prof.table()['section']) == ["탭", "그래프"]
+
+
+def test_failed_section_is_still_recorded():
+    prof = RunProfile(enabled=True)
+    with pytest.raises(ValueError):
+        with prof.section("실패"):
+            raise ValueError("x")
+    assert prof.records[0]['seconds'] is not None
+    with prof.section("다음"):
+        pass
+    assert prof.records[1]['parent'] is None
+
+
+def test_write_log(tmp_path):
+    prof = RunProfile(enabled=True)
+    with prof.section("필터", 'filter', rows=5):
+        pass
+    path = prof.write_log({'backend': 'memory'}, log_dir=str(tmp_path))
+    with open(path, encoding='utf-8') as f:
+        log = json.load(f)
+    assert log['context'] == {'backend': 'memory'}
+    assert [record['section'] for record in log['records']] == ["필터"]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollup import build_daily_rollup, build_product_rollup, rollup_kpis, slice_rollup
+
+
+# 한 주문이 여러 날·여러 셀러·여러 상품에 걸치는 행이 섞인 주문 표 (보정 행이 많이 생기도록)
+def _orders(seed=0, n=3000):
+    rng = np.random.default_rng(seed)
+    first_day = pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 30, n), unit='D')
+    order_no = rng.integers(0, 600, n).astype(float)
+    order_no[rng.random(n) < 0.02] = np.nan
+    # 같은 주문번호는 시작일 근처 며칠에 흩어진다
+    start = pd.Series(first_day).groupby(order_no).transform('min').fillna(pd.Series(first_day))
+    dates = start + pd.to_timedelta(rng.integers(0, 4, n), unit='D')
+    price = rng.integers(1, 100, n) * 1000.0
+    price[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        '주문번호': order_no,
+        '주문일자': dates.to_numpy(),
+        '요일': dates.dt.day_name().to_numpy(),
+        '시간대': rng.choice(['오전', '오후', '저녁'], n),
+        '셀러명': rng.choice([f'셀러{i}' for i in range(8)], n),
+        '품종': rng.choice(['감귤', '한라봉'], n),
+        '감귤 세부': rng.choice(['노지', '만감류'], n),
+        'is_event_item': rng.random(n) < 0.3,
+        'is_gift_item': rng.random(n) < 0.2,
+        '상품명': rng.choice([f'상품{i}' for i in range(12)], n),
+        '실결제 금액': price,
+    })
+
+
+def _ranges(df, seed, count=12):
+    rng = np.random.default_rng(seed)
+    days = np.sort(df['주문일자'].unique())
+    picks = [np.sort(rng.choice(days, 2)) for _ in range(count)]
+    # 전체 범위, 하루짜리, 데이터 밖 범위도 함께 본다
+    picks += [(days[0], days[-1]), (days[5], days[5]), (days[-1] + np.timedelta64(1, 'D'),) * 2]
+    return [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in picks]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_sliced_cube_distinct_counts_match_raw_groupby(seed):
+    df = _orders(seed)
+    daily, product = build_daily_rollup(df), build_product_rollup(df)
+    for date_range in _ranges(df, seed):
+        raw = df[df['주문일자'].between(*date_range)]
+        day_cube, product_cube = slice_rollup(daily, date_range), slice_rollup(product, date_range)
+
+        kpis = rollup_kpis(day_cube)
+        assert kpis['주문 건수'] == raw['주문번호'].nunique()
+        assert kpis['활발한 셀러 수'] == raw['셀러명'].nunique()
+        assert kpis['총 실결제 금액'] == raw['실결제 금액'].sum()
+
+        by_seller = day_cube.groupby('셀러명')['셀러주문수'].sum()
+        expected = raw.groupby('셀러명')['주문번호'].nunique()
+        pd.testing.assert_series_equal(by_seller[by_seller.index.isin(expected.index)].sort_index(),
+                                       expected.sort_index(), check_names=False, check_dtype=False)
+        assert (by_seller[~by_seller.index.isin(expected.index)] == 0).all()
+
+        by_product = product_cube.groupby('상품명')['주문수'].sum()
+        expected = raw.groupby('상품명')['주문번호'].nunique()
+        pd.testing.assert_series_equal(by_product[by_product.index.isin(expected.index)].sort_index(),
+                                       expected.sort_index(), check_names=False, check_dtype=False)
+        assert (by_product[~by_product.index.isin(expected.index)] == 0).all()
+
+
+def test_cube_distinct_counts_per_day_match_raw_groupby():
+    df = _orders(3)
+    daily = build_daily_rollup(df)
+    days = df['주문일자'].drop_duplicates().sort_values()
+    for day in days:
+        cube = slice_rollup(daily, (day, day))
+        assert cube['주문수'].sum() == df.loc[df['주문일자'] == day, '주문번호'].nunique()
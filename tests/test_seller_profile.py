@@ -0,0 +1,62 @@
+import pandas as pd
+
+from data_loader import build_orders
+from seller_profile import _seller_mode, build_seller_profile, top_sellers
+
+
+def _profile(counts):
+    return pd.DataFrame({'주문행수': list(counts.values())}, index=pd.Index(list(counts), name='셀러명'))
+
+
+def test_top_sellers_breaks_ties_by_seller_name():
+    profile = _profile({'셀러59': 796, '셀러3': 900, '셀러16': 796, '셀러7': 796, '셀러2': 796, '셀러1': 10})
+    # 796 건 4곳 중 2곳만 들어가며, 이름 순 (셀러16, 셀러2) 으로 고른다
+    assert list(top_sellers(profile, 3)) == ['셀러3', '셀러16', '셀러2']
+
+
+def test_top_sellers_does_not_depend_on_row_order():
+    counts = {'가': 5, '나': 7, '다': 5, '라': 5, '마': 1}
+    forward = _profile(counts)
+    backward = forward.iloc[::-1]
+    assert set(top_sellers(forward, 3)) == set(top_sellers(backward, 3)) == {'나', '가', '다'}
+
+
+def test_top_sellers_on_built_profile(orders_csv):
+    df = build_orders(orders_csv)
+    profile = build_seller_profile(df)['profile']
+    top = top_sellers(profile, 15)
+    expected = (df['셀러명'].value_counts().rename('n').reset_index()
+                .assign(name=lambda t: t['셀러명'].astype(str))
+                .sort_values(['n', 'name'], ascending=[False, True]).head(15)['셀러명'])
+    assert set(top) == set(expected)
+    assert list(top) == [name for name in profile.index if name in set(expected)]
+
+
+def _check_profile_labels(df):
+    profile = build_seller_profile(df)['profile']
+    expected = df.groupby('셀러명', observed=True).agg(주문행수=('셀러명', 'size'), 총매출=('실결제 금액', 'sum'),
+                                                     주문건수=('주문번호', 'nunique'))
+    assert set(profile.index) == set(expected.index)
+    pd.testing.assert_frame_equal(profile[expected.columns].sort_index(), expected.sort_index(), check_index_type=False)
+
+
+def test_profile_rows_carry_their_own_seller_labels(orders_csv):
+    df = build_orders(orders_csv)
+    _check_profile_labels(df)
+    # 셀러명이 비어 있는 행
+    missing = df.copy()
+    missing.loc[missing.index[::7], '셀러명'] = None
+    _check_profile_labels(missing)
+    # 범주 순서가 이름 순이 아니고, 관측되지 않은 범주가 있는 경우
+    shuffled = df.copy()
+    categories = list(shuffled['셀러명'].astype(str).unique())[::-1] + ['없는셀러']
+    shuffled['셀러명'] = pd.Categorical(shuffled['셀러명'].astype(str), categories=categories)
+    _check_profile_labels(shuffled)
+
+
+def test_main_price_group_breaks_ties_by_first_order():
+    df = pd.DataFrame({
+        '셀러명': ['가', '가', '가', '가', '나', '나', '나'],
+        '단가_그룹': ['3-5만원대', '1-3만원대', '1-3만원대', '3-5만원대', '5-10만원대', '1-3만원대', '1-3만원대'],
+    })
+    assert list(_seller_mode(*pd.factorize(df['셀러명'], sort=True), df['단가_그룹'])) == ['3-5만원대', '1-3만원대']
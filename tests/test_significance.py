@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from analysis_engine import ab_test
+from significance import two_sample_test
+
+
+def _rows(cells):
+    # (셀러, 실험군 여부, 행 수, 양성 비율) -> 셀러/실험군/값 배열
+    strata, treat, values = [], [], []
+    for seller, is_treat, n, rate in cells:
+        k = int(round(n * rate))
+        strata += [seller] * n
+        treat += [is_treat] * n
+        values += [1.0] * k + [0.0] * (n - k)
+    return np.array(strata, dtype=object), np.array(treat), np.array(values)
+
+
+# 셀러 안에서는 실험군이 10%p 낮지만, 기본 비율이 높은 셀러에 실험군이 몰려 전체로는 실험군이 높아 보인다
+SIMPSON = [('A', True, 9000, 0.50), ('A', False, 1000, 0.60),
+           ('B', True, 1000, 0.10), ('B', False, 9000, 0.20)]
+
+
+def test_pooled_difference_is_confounded():
+    strata, treat, values = _rows(SIMPSON)
+    result = two_sample_test(values, treat, n_resamples=500)
+    assert result['차이'] > 0.2
+    assert not result['층화']
+
+
+def test_stratified_difference_recovers_within_seller_effect():
+    strata, treat, values = _rows(SIMPSON)
+    result = two_sample_test(values, treat, strata=strata, n_resamples=500)
+    assert np.isclose(result['차이'], -0.10)
+    assert result['신뢰구간 하한'] < -0.10 < result['신뢰구간 상한'] < 0
+    assert result['p-value'] < 0.01
+    assert result['층 수'] == 2
+
+
+def test_stratified_null_effect_is_not_significant():
+    cells = [('A', True, 9000, 0.50), ('A', False, 1000, 0.50),
+             ('B', True, 1000, 0.20), ('B', False, 9000, 0.20)]
+    strata, treat, values = _rows(cells)
+    result = two_sample_test(values, treat, strata=strata, n_resamples=500)
+    assert np.isclose(result['차이'], 0)
+    assert result['p-value'] > 0.5
+
+
+def test_single_group_strata_are_dropped():
+    cells = SIMPSON + [('C', True, 5000, 0.90)]
+    strata, treat, values = _rows(cells)
+    result = two_sample_test(values, treat, strata=strata, n_resamples=200)
+    assert np.isclose(result['차이'], -0.10)
+    assert result['실험군 수'] == 10000
+    assert result['층 수'] == 2
+
+
+def test_one_stratum_matches_pooled():
+    strata, treat, values = _rows(SIMPSON)
+    pooled = two_sample_test(values, treat, n_resamples=300)
+    single = two_sample_test(values, treat, strata=np.zeros(len(values)), n_resamples=300)
+    assert np.isclose(pooled['차이'], single['차이'])
+    assert np.isclose(pooled['실험군 평균'], single['실험군 평균'])
+
+
+def test_missing_group_returns_nan():
+    result = two_sample_test([0.0, 1.0], [True, True])
+    assert np.isnan(result['차이'])
+    assert result['대조군 수'] == 0
+
+
+def test_ab_test_stratify_uses_sellers():
+    strata, treat, values = _rows(SIMPSON)
+    df = pd.DataFrame({'셀러명': strata, 'is_event_item': treat, 'is_cancelled': values.astype(bool)})
+    assert ab_test('ab_b', df, n_resamples=200)['차이'] > 0
+    assert np.isclose(ab_test('ab_b', df, stratify=True, n_resamples=200)['차이'], -0.10)